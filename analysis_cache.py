@@ -0,0 +1,80 @@
+"""
+Analysis Result Cache - serialized /api/analyze responses keyed by content hash
+Keys cover only the profile fields an analysis depends on, so editing a profile
+changes its keys and stale results are never served
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from linkedin_agent import JobMatcher
+
+
+def analysis_key(matcher: JobMatcher, job: Dict[str, Any]) -> str:
+    """
+    Content hash of a normalized profile plus a job
+
+    The profile is reduced to what rule-based analyses read: its normalized
+    skill IDs (so skill order and aliases do not matter), experience and
+    roles. Name, education and certifications do not affect the result.
+    """
+    profile = matcher.user_profile
+    normalized = [
+        sorted(matcher.user_skills),
+        profile.years_experience,
+        profile.current_role,
+        profile.previous_roles,
+    ]
+    return hashlib.sha256(
+        json.dumps([normalized, job], sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+class AnalysisCache:
+    """Thread-safe LRU of serialized analysis responses and their ETags"""
+
+    def __init__(self, max_entries: int = 4096):
+        """
+        Args:
+            max_entries: Responses kept before the least recently used is dropped
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_etag(body: bytes) -> str:
+        return hashlib.sha256(body).hexdigest()[:32]
+
+    def get(self, key: str) -> Optional[Tuple[bytes, str]]:
+        """(body, etag) for a key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, body: bytes) -> str:
+        """Store a serialized response and return its ETag"""
+        etag = self.make_etag(body)
+        with self._lock:
+            self._entries[key] = (body, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return etag
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
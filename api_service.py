@@ -0,0 +1,149 @@
+"""
+API Service - request handling shared by the Flask (app.py) and ASGI (asgi_app.py) web services
+Both apps decode requests and build responses through these functions, so they
+serve the same payloads from one profile store and one result cache; errors
+raise web_codec.APIError, which each app turns into its JSON error response
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from analysis_cache import AnalysisCache, analysis_key
+from linkedin_agent import ANALYSIS_FIELDS, JobMatcher, JobPosting, LinkedInAgent, UserProfile
+from linkedin_utils import InterviewSimulator
+from llm_demo import EnhancedLinkedInAgent
+from llm_integration import get_llm_analyzer
+from profile_store import ProfileStore, StoredProfile
+from web_codec import (
+    APIError, LLMOptions, decode_interview, decode_job, decode_jobs, decode_llm_options, decode_profile, dumps_bytes
+)
+
+
+# Longest ?wait= an enrichment long-poll may hold a request for
+MAX_LONG_POLL_WAIT = 30.0
+
+# Store user profiles in memory (in production, use a database)
+user_profiles = ProfileStore()
+
+# Serialized rule-based analyses, keyed by a hash of the normalized profile and job
+analysis_results = AnalysisCache()
+
+
+def profile_response(stored: StoredProfile) -> Dict[str, Any]:
+    """Response body for a stored profile"""
+    return {'profile_id': stored.id, 'version': stored.version, 'profile': asdict(stored.profile)}
+
+
+def stored_profile(profile_id: str) -> StoredProfile:
+    """A stored profile, or 404"""
+    stored = user_profiles.get(profile_id)
+    if stored is None:
+        raise APIError(404, 'Unknown profile ID')
+    return stored
+
+
+def resolve_profile(data: Dict[str, Any]) -> Tuple[UserProfile, Optional[JobMatcher]]:
+    """
+    The request's profile and a prebuilt matcher for it
+
+    Requests name a stored profile with "profile_id" or send one inline as
+    "profile" (no cached matcher).
+    """
+    if 'profile_id' in data:
+        if not isinstance(data['profile_id'], str):
+            raise APIError(400, '"profile_id" must be a string')
+        stored = stored_profile(data['profile_id'])
+        return stored.profile, user_profiles.matcher(stored.id)
+    return decode_profile(data.get('profile')), None
+
+
+@dataclass
+class AnalysisRequest:
+    """A decoded /api/analyze or /api/analyze/stream body"""
+    profile: UserProfile
+    matcher: Optional[JobMatcher]
+    job: JobPosting
+    options: LLMOptions
+    background: bool = False
+
+
+def decode_analysis_request(data: Dict[str, Any]) -> AnalysisRequest:
+    """Validate an analysis body: profile or profile_id, job, LLM options and "llm" mode"""
+    profile, matcher = resolve_profile(data)
+    job = decode_job(data.get('job'))
+    options = decode_llm_options(data)
+    return AnalysisRequest(profile, matcher, job, options, background=data.get('llm') == 'background')
+
+
+def cached_analysis(profile: UserProfile, matcher: Optional[JobMatcher], job: JobPosting) -> Tuple[bytes, str]:
+    """Serialized rule-based analysis and its ETag, from analysis_results when possible"""
+    matcher = matcher or JobMatcher(profile)
+    key = analysis_key(matcher, asdict(job))
+    cached = analysis_results.get(key)
+    if cached is None:
+        body = dumps_bytes(LinkedInAgent(profile, matcher=matcher).analyze_job_posting(job))
+        cached = body, analysis_results.put(key, body)
+    return cached
+
+
+def rank_batch(data: Dict[str, Any], max_jobs: int) -> Dict[str, Any]:
+    """Validate a batch request of at most max_jobs jobs and rank them (CPU-bound)"""
+    profile, matcher = resolve_profile(data)
+
+    jobs = data.get('jobs')
+    if not isinstance(jobs, list):
+        raise APIError(400, '"jobs" must be a list')
+    if len(jobs) > max_jobs:
+        raise APIError(413, f"At most {max_jobs} jobs per batch")
+
+    fields = data.get('fields')
+    if fields is not None:
+        if not isinstance(fields, list) or not all(isinstance(f, str) for f in fields):
+            raise APIError(400, '"fields" must be a list of strings', valid_fields=list(ANALYSIS_FIELDS))
+        if not set(fields) <= set(ANALYSIS_FIELDS):
+            raise APIError(400, 'Unknown fields', valid_fields=list(ANALYSIS_FIELDS))
+
+    # type() rather than isinstance(): JSON true/false must not pass as 1/0
+    offset = data.get('offset', 0)
+    limit = data.get('limit')
+    if type(offset) is not int or offset < 0 or not (limit is None or type(limit) is int and limit >= 0):
+        raise APIError(400, '"offset" and "limit" must be non-negative integers')
+
+    postings = decode_jobs(jobs)
+
+    agent = LinkedInAgent(profile, matcher=matcher)
+    return agent.rank_job_postings(postings, offset=offset, limit=limit, fields=fields)
+
+
+def llm_agent(profile: UserProfile, matcher: Optional[JobMatcher],
+              settings: Mapping[str, Any]) -> EnhancedLinkedInAgent:
+    """LLM-enhanced agent configured from an app's LLM_ANALYZER and LLM_DEADLINE settings"""
+    return EnhancedLinkedInAgent(
+        profile,
+        llm_analyzer=settings.get('LLM_ANALYZER') or get_llm_analyzer(),
+        llm_deadline=settings.get('LLM_DEADLINE'),
+        matcher=matcher
+    )
+
+
+def sse_event(event: str, payload: Any) -> bytes:
+    """One Server-Sent Events message"""
+    return b"event: " + event.encode() + b"\ndata: " + dumps_bytes(payload) + b"\n\n"
+
+
+def long_poll_wait(value: Optional[str]) -> float:
+    """Seconds from an enrichment poll's ?wait= (0 if absent or malformed, capped at MAX_LONG_POLL_WAIT)"""
+    try:
+        wait = float(value) if value is not None else 0.0
+    except ValueError:
+        return 0.0
+    return min(wait, MAX_LONG_POLL_WAIT) if wait > 0 else 0.0
+
+
+def interview_questions(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Technical questions for the request's skills plus the behavioral set"""
+    skills = decode_interview(data).skills
+    return {
+        'technical': InterviewSimulator.generate_technical_questions(skills),
+        'behavioral': InterviewSimulator.generate_behavioral_questions()
+    }
@@ -3,15 +3,22 @@ Flask Web Interface for LinkedIn Job Application Assistant
 Provides a user-friendly web dashboard
 """
 
-from flask import Flask, render_template, request, jsonify
-import json
-from linkedin_agent import LinkedInAgent, UserProfile, JobPosting
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 from linkedin_utils import ProfileValidator, InterviewSimulator
+from llm_enrichment import get_enricher
+from llm_metrics import get_metrics_registry
+import web_codec
+from web_codec import APIError, decode_profile, json_body
+from api_service import (
+    user_profiles, analysis_results, cached_analysis, decode_analysis_request, interview_questions, llm_agent,
+    long_poll_wait, profile_response, rank_batch, sse_event, stored_profile
+)
 
 app = Flask(__name__)
+app.config.setdefault('MAX_BATCH_JOBS', 5000)
 
-# Store user profiles in memory (in production, use a database)
-user_profiles = {}
+# orjson/msgspec JSON, gzip/brotli above COMPRESS_MIN_SIZE bytes, 400 on malformed bodies
+web_codec.install(app)
 
 
 @app.route('/')
@@ -150,7 +157,7 @@ def index():
         </div>
         
         <script>
-            let currentProfile = null;
+            let currentProfileId = null;
             
             function showSection(sectionId) {
                 document.querySelectorAll('.section').forEach(s => s.style.display = 'none');
@@ -168,12 +175,20 @@ def index():
                     certifications: document.getElementById('certifications').value.split(',').map(s => s.trim()).filter(s => s)
                 };
                 
-                currentProfile = profile;
-                document.getElementById('profile-status').innerHTML = '✓ Profile saved: ' + profile.name;
+                fetch(currentProfileId ? '/api/profiles/' + currentProfileId : '/api/profiles', {
+                    method: currentProfileId ? 'PUT' : 'POST',
+                    headers: {'Content-Type': 'application/json'},
+                    body: JSON.stringify(profile)
+                })
+                .then(r => r.json())
+                .then(data => {
+                    currentProfileId = data.profile_id;
+                    document.getElementById('profile-status').innerHTML = '✓ Profile saved: ' + profile.name;
+                });
             }
             
             function analyzeJob() {
-                if (!currentProfile) {
+                if (!currentProfileId) {
                     alert('Please create a profile first!');
                     showSection('create-profile');
                     return;
@@ -192,7 +207,7 @@ def index():
                 fetch('/api/analyze', {
                     method: 'POST',
                     headers: {'Content-Type': 'application/json'},
-                    body: JSON.stringify({profile: currentProfile, job: job})
+                    body: JSON.stringify({profile_id: currentProfileId, job: job})
                 })
                 .then(r => r.json())
                 .then(data => displayAnalysis(data));
@@ -247,50 +262,123 @@ def index():
     '''
 
 
+@app.route('/api/profiles', methods=['POST'])
+def api_create_profile():
+    """Store a profile; later requests can send its "profile_id" instead of the profile"""
+    profile = decode_profile(json_body(), path='body')
+    return jsonify(profile_response(user_profiles.create(profile))), 201
+
+
+@app.route('/api/profiles/<profile_id>', methods=['GET', 'PUT'])
+def api_profile(profile_id):
+    """Fetch (GET) or replace (PUT) a stored profile"""
+    if request.method == 'PUT':
+        profile = decode_profile(json_body(), path='body')
+        stored = user_profiles.update(profile_id, profile) or stored_profile(profile_id)
+    else:
+        stored = stored_profile(profile_id)
+    return jsonify(profile_response(stored))
+
+
+def _conditional_json(body: bytes, etag: str):
+    """Serialized JSON with its ETag, or 304 if the client's If-None-Match has it"""
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response
+
+
 @app.route('/api/analyze', methods=['POST'])
 def api_analyze():
-    """API endpoint for job analysis"""
-    data = request.json
+    """
+    API endpoint for job analysis
     
-    # Create profile object
-    profile = UserProfile(
-        name=data['profile']['name'],
-        current_role=data['profile']['current_role'],
-        years_experience=data['profile']['years_experience'],
-        skills=data['profile']['skills'],
-        previous_roles=data['profile']['previous_roles'],
-        education=data['profile']['education'],
-        certifications=data['profile']['certifications']
-    )
+    Rule-based results are cached server-side and carry an ETag; a repeat
+    request sending it in If-None-Match gets 304 Not Modified. Analysis is
+    a pure function of the body, so this is safe despite being a POST.
+    """
+    analysis = decode_analysis_request(json_body())
     
-    # Create job object
-    job = JobPosting(
-        title=data['job']['title'],
-        company=data['job']['company'],
-        description=data['job']['description'],
-        required_skills=data['job']['required_skills'],
-        preferred_skills=data['job']['preferred_skills'],
-        experience_years=data['job']['experience_years'],
-        seniority_level=data['job']['seniority_level']
-    )
+    # Analyze - with "llm": "background" the LLM sections are filled in
+    # asynchronously; poll /api/enrichment/<id> for them
+    if analysis.background:
+        agent = llm_agent(analysis.profile, analysis.matcher, app.config)
+        return jsonify(agent.analyze_job_posting(
+            analysis.job, background=True, latency_budget=analysis.options.latency_budget
+        ))
     
-    # Analyze
-    agent = LinkedInAgent(profile)
-    analysis = agent.analyze_job_posting(job)
+    return _conditional_json(*cached_analysis(analysis.profile, analysis.matcher, analysis.job))
+
+
+@app.route('/api/analyze/batch', methods=['POST'])
+def api_analyze_batch():
+    """
+    Rank many jobs against one profile in a single request
+    
+    Takes "profile" or "profile_id" plus "jobs" (at most MAX_BATCH_JOBS).
+    Optional "offset" and "limit" page through the ranked results, and
+    "fields" (e.g. ["job_title", "match_score"]) limits each result to
+    those analysis keys, skipping the advisor sections not asked for.
+    """
+    return jsonify(rank_batch(json_body(), app.config['MAX_BATCH_JOBS']))
+
+
+@app.route('/api/enrichment/<enrichment_id>', methods=['GET'])
+def api_enrichment(enrichment_id):
+    """
+    Poll a background LLM enrichment
     
-    return jsonify(analysis)
+    With ?wait=<seconds> (capped at 30) the request blocks until the
+    enrichment finishes or the wait runs out, for long-polling clients.
+    """
+    wait = long_poll_wait(request.args.get('wait'))
+    enricher = get_enricher()
+    job = enricher.wait(enrichment_id, wait) if wait > 0 else enricher.get(enrichment_id)
+    if job is None:
+        raise APIError(404, 'Unknown or expired enrichment ID')
+    return jsonify(job.to_dict())
+
+
+@app.route('/api/analyze/stream', methods=['POST'])
+def api_analyze_stream():
+    """
+    Job analysis over Server-Sent Events
+    
+    Sends the rule-based analysis as an "analysis" event immediately, then
+    "delta" events with LLM text as it generates, a "section" event with
+    each LLM section's final value and a closing "done" event. Takes the
+    same body as /api/analyze plus optional "include_llm" and
+    "latency_budget" (seconds for the LLM sections) fields.
+    """
+    analysis = decode_analysis_request(json_body())
+    options = analysis.options
+    agent = llm_agent(analysis.profile, analysis.matcher, app.config)
+    
+    def events():
+        for event, payload in agent.stream_job_analysis(
+            analysis.job, include_llm=options.include_llm, latency_budget=options.latency_budget
+        ):
+            yield sse_event(event, payload)
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 
 @app.route('/api/interview', methods=['POST'])
 def api_interview():
     """API endpoint for interview preparation"""
-    data = request.json
-    skills = data['skills']
-    
-    return jsonify({
-        'technical': InterviewSimulator.generate_technical_questions(skills),
-        'behavioral': InterviewSimulator.generate_behavioral_questions()
-    })
+    return jsonify(interview_questions(json_body()))
+
+
+@app.route('/api/metrics', methods=['GET'])
+def api_metrics():
+    """LLM metrics: per-method latency histograms, tokens, cost, fallback and cache rates"""
+    return jsonify(get_metrics_registry().snapshot())
 
 
 if __name__ == '__main__':
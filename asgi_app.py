@@ -0,0 +1,270 @@
+"""
+ASGI Web Service - async variant of the Flask API in app.py
+Same routes, payloads, profile store and result cache; LLM calls are awaited
+instead of blocking a worker, and batch scoring runs in a thread pool
+Run with any ASGI server, e.g.: uvicorn asgi_app:app --port 5000
+"""
+
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from werkzeug.http import parse_accept_header, parse_etags, quote_etag
+
+import app as flask_api
+from api_service import (
+    user_profiles, cached_analysis, decode_analysis_request, interview_questions, llm_agent, long_poll_wait,
+    profile_response, rank_batch, sse_event, stored_profile
+)
+from llm_enrichment import get_enricher
+from llm_integration import relay_async, run_coroutine_async
+from llm_metrics import get_metrics_registry
+from web_codec import (
+    COMPRESSIBLE_MIMETYPES, APIError, compress_body, decode_body, decode_profile, dumps_bytes, negotiate_encoding
+)
+
+
+# Shares settings (LLM_ANALYZER, LLM_DEADLINE, MAX_BATCH_JOBS, COMPRESS_*) with the Flask app
+config = flask_api.app.config
+
+# CPU-bound batch ranking runs here so the event loop keeps serving other requests
+batch_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="batch-scoring")
+
+
+class Request:
+    """An HTTP request received over ASGI"""
+
+    def __init__(self, scope: Dict[str, Any], body: bytes, params: Dict[str, str]):
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.query = {k: v[-1] for k, v in parse_qs(scope.get("query_string", b"").decode("latin-1")).items()}
+        self.headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        self.body = body
+        self.params = params
+
+    def json(self) -> Dict[str, Any]:
+        return decode_body(self.body)
+
+
+class Response:
+    """A buffered HTTP response"""
+
+    def __init__(self, body: bytes = b"", status: int = 200, content_type: str = "application/json",
+                 headers: Optional[Dict[str, str]] = None, etag: Optional[str] = None):
+        self.body = body
+        self.status = status
+        self.content_type = content_type
+        self.headers = dict(headers or {})
+        self.etag = etag
+
+
+class StreamingResponse:
+    """A response whose body chunks come from an async iterator"""
+
+    def __init__(self, chunks, content_type: str, headers: Optional[Dict[str, str]] = None):
+        self.chunks = chunks
+        self.content_type = content_type
+        self.headers = dict(headers or {})
+
+
+def json_response(payload: Any, status: int = 200) -> Response:
+    return Response(dumps_bytes(payload), status)
+
+
+def conditional_json(request: Request, body: bytes, etag: str) -> Response:
+    """Serialized JSON with its ETag, or 304 if the client's If-None-Match has it"""
+    if parse_etags(request.headers.get("if-none-match")).contains_weak(etag):
+        return Response(status=304, etag=etag)
+    return Response(body, etag=etag)
+
+
+# Handlers - shared request handling is in api_service; app.py documents each route
+
+async def index(request: Request) -> Response:
+    return Response(flask_api.index().encode("utf-8"), content_type="text/html; charset=utf-8")
+
+
+async def create_profile(request: Request) -> Response:
+    profile = decode_profile(request.json(), path="body")
+    return json_response(profile_response(user_profiles.create(profile)), 201)
+
+
+async def profile_detail(request: Request) -> Response:
+    profile_id = request.params["profile_id"]
+    if request.method == "PUT":
+        profile = decode_profile(request.json(), path="body")
+        stored = user_profiles.update(profile_id, profile) or stored_profile(profile_id)
+    else:
+        stored = stored_profile(profile_id)
+    return json_response(profile_response(stored))
+
+
+async def analyze(request: Request) -> Response:
+    analysis = decode_analysis_request(request.json())
+
+    if analysis.background:
+        # The enrichment runs as a task on the LLM event loop; nothing here waits for it
+        agent = llm_agent(analysis.profile, analysis.matcher, config)
+        return json_response(await run_coroutine_async(agent.analyze_job_posting_async(
+            analysis.job, background=True, latency_budget=analysis.options.latency_budget
+        )))
+
+    return conditional_json(request, *cached_analysis(analysis.profile, analysis.matcher, analysis.job))
+
+
+async def analyze_batch(request: Request) -> Response:
+    def rank() -> bytes:
+        return dumps_bytes(rank_batch(request.json(), config["MAX_BATCH_JOBS"]))
+
+    return Response(await asyncio.get_running_loop().run_in_executor(batch_executor, rank))
+
+
+async def analyze_stream(request: Request) -> StreamingResponse:
+    analysis = decode_analysis_request(request.json())
+    options = analysis.options
+    agent = llm_agent(analysis.profile, analysis.matcher, config)
+
+    async def events():
+        # The stream runs on the LLM event loop, where the shared provider's async client lives
+        relay = relay_async(agent.stream_job_analysis_async(
+            analysis.job, include_llm=options.include_llm, latency_budget=options.latency_budget
+        ))
+        try:
+            async for event, payload in relay:
+                yield sse_event(event, payload)
+        finally:
+            await relay.aclose()
+
+    return StreamingResponse(events(), "text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+async def enrichment(request: Request) -> Response:
+    wait = long_poll_wait(request.query.get("wait"))
+    # Long-poll without holding a thread: the enricher wakes this coroutine when the job finishes
+    enricher = get_enricher()
+    job_id = request.params["enrichment_id"]
+    job = await enricher.wait_async(job_id, wait) if wait > 0 else enricher.get(job_id)
+    if job is None:
+        raise APIError(404, "Unknown or expired enrichment ID")
+    return json_response(job.to_dict())
+
+
+async def interview(request: Request) -> Response:
+    return json_response(interview_questions(request.json()))
+
+
+async def metrics(request: Request) -> Response:
+    return json_response(get_metrics_registry().snapshot())
+
+
+Handler = Callable[[Request], Awaitable[Any]]
+
+ROUTES: List[Tuple[str, "re.Pattern", Handler]] = [
+    ("GET", re.compile(r"^/$"), index),
+    ("POST", re.compile(r"^/api/profiles$"), create_profile),
+    ("GET", re.compile(r"^/api/profiles/(?P<profile_id>[^/]+)$"), profile_detail),
+    ("PUT", re.compile(r"^/api/profiles/(?P<profile_id>[^/]+)$"), profile_detail),
+    ("POST", re.compile(r"^/api/analyze$"), analyze),
+    ("POST", re.compile(r"^/api/analyze/batch$"), analyze_batch),
+    ("POST", re.compile(r"^/api/analyze/stream$"), analyze_stream),
+    ("GET", re.compile(r"^/api/enrichment/(?P<enrichment_id>[^/]+)$"), enrichment),
+    ("POST", re.compile(r"^/api/interview$"), interview),
+    ("GET", re.compile(r"^/api/metrics$"), metrics),
+]
+
+
+def _route(method: str, path: str) -> Tuple[Optional[Handler], Dict[str, str], bool]:
+    """(handler, path params, whether the path exists under another method)"""
+    path_matched = False
+    for route_method, pattern, handler in ROUTES:
+        match = pattern.match(path)
+        if match:
+            if route_method == method or (method == "HEAD" and route_method == "GET"):
+                return handler, match.groupdict(), True
+            path_matched = True
+    return None, {}, path_matched
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    return b"".join(chunks)
+
+
+def _encode_headers(headers: Dict[str, str]) -> List[Tuple[bytes, bytes]]:
+    return [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()]
+
+
+async def _send(send, request: Request, response: Response):
+    """Send a buffered response, compressed if the client accepts it (as web_codec.install does for Flask)"""
+    headers = {"content-type": response.content_type, "vary": "Accept-Encoding", **response.headers}
+    body = response.body
+    weak = False
+    if (response.status == 200 and response.content_type.split(";")[0] in COMPRESSIBLE_MIMETYPES
+            and len(body) >= config["COMPRESS_MIN_SIZE"]):
+        encoding = negotiate_encoding(parse_accept_header(request.headers.get("accept-encoding")))
+        if encoding is not None:
+            body = compress_body(body, encoding, config["COMPRESS_LEVEL"])
+            headers["content-encoding"] = encoding
+            weak = True
+    if response.etag:
+        headers["etag"] = quote_etag(response.etag, weak)
+    headers["content-length"] = str(len(body))
+
+    await send({"type": "http.response.start", "status": response.status, "headers": _encode_headers(headers)})
+    await send({"type": "http.response.body", "body": b"" if request.method == "HEAD" else body})
+
+
+async def _send_stream(send, response: StreamingResponse):
+    headers = {"content-type": response.content_type, **response.headers}
+    await send({"type": "http.response.start", "status": 200, "headers": _encode_headers(headers)})
+    try:
+        async for chunk in response.chunks:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        # Stops relaying if the client went away; shared LLM calls finish and fill the cache
+        await response.chunks.aclose()
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            batch_executor.shutdown(wait=False)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """The ASGI application"""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    handler, params, path_matched = _route(scope["method"], scope["path"])
+    request = Request(scope, await _read_body(receive), params)
+    try:
+        if handler is None:
+            raise APIError(405, "Method not allowed") if path_matched else APIError(404, "Not found")
+        response = await handler(request)
+    except APIError as e:
+        response = json_response(e.to_dict(), e.status)
+
+    if isinstance(response, StreamingResponse):
+        await _send_stream(send, response)
+    else:
+        await _send(send, request, response)
@@ -0,0 +1,426 @@
+"""
+Performance Benchmarks for LinkedIn Job Application Assistant
+Run with: python benchmark.py
+"""
+
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from linkedin_agent import LinkedInAgent, JobMatcher, UserProfile, JobPosting
+from linkedin_vectorized import NUMPY_AVAILABLE, VectorizedMatcher
+from linkedin_index import SkillIndex
+from parallel_scoring import ParallelScorer
+from llm_integration import LLMEnhancedAnalyzer, OpenAIProvider, get_llm_analyzer
+from llm_fakes import FakeLLMProvider, FakeOpenAIServer
+from llm_demo import EnhancedLinkedInAgent
+from skill_taxonomy import compile_skill_pattern, get_default_taxonomy
+from examples import get_all_profiles, get_all_jobs
+
+
+def _time_per_call(func: Callable[[], object], repeat: int) -> float:
+    """Return average microseconds per call"""
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def _legacy_match_skills(profile: UserProfile, job: JobPosting) -> Dict[str, List[str]]:
+    """Skill match as computed before MatchResult (lowercased list, linear scans)"""
+    user_skills_lower = [s.lower() for s in profile.skills]
+    matched = {"matched_required": [], "matched_preferred": [],
+               "missing_required": [], "missing_preferred": []}
+    for skill in job.required_skills:
+        key = "matched_required" if skill.lower() in user_skills_lower else "missing_required"
+        matched[key].append(skill)
+    for skill in job.preferred_skills:
+        key = "matched_preferred" if skill.lower() in user_skills_lower else "missing_preferred"
+        matched[key].append(skill)
+    return matched
+
+
+def bench_single_analysis(repeat: int = 200):
+    """Benchmark 1: per-analysis cost of computing the skill match once vs six times"""
+    print("\n" + "=" * 70)
+    print("BENCHMARK 1: Skill match computed once per analysis")
+    print("=" * 70)
+
+    profiles = list(get_all_profiles().values())
+    jobs = list(get_all_jobs().values())
+    pairs = [(p, j) for p in profiles for j in jobs]
+
+    def legacy_matches():
+        for profile, job in pairs:
+            for _ in range(6):
+                _legacy_match_skills(profile, job)
+
+    def shared_match():
+        for profile, job in pairs:
+            JobMatcher(profile).match(job)
+
+    def full_analysis():
+        for profile, job in pairs:
+            LinkedInAgent(profile).analyze_job_posting(job)
+
+    legacy = _time_per_call(legacy_matches, repeat) / len(pairs)
+    shared = _time_per_call(shared_match, repeat) / len(pairs)
+    analysis = _time_per_call(full_analysis, repeat) / len(pairs)
+
+    print(f"  Skill matching, 6x per analysis (before): {legacy:8.2f} µs")
+    print(f"  Skill matching, 1x per analysis (after):  {shared:8.2f} µs")
+    print(f"  Saving per analysis:                      {legacy - shared:8.2f} µs")
+    print(f"  Full analyze_job_posting (after):         {analysis:8.2f} µs")
+
+
+def _synthetic_jobs(count: int) -> List[JobPosting]:
+    """Cycle the example jobs to build a larger corpus"""
+    jobs = list(get_all_jobs().values())
+    return [jobs[i % len(jobs)] for i in range(count)]
+
+
+def bench_batch_analysis(count: int = 20000):
+    """Benchmark 2: analyze_many vs one analyze_job_posting call per job"""
+    print("\n" + "=" * 70)
+    print(f"BENCHMARK 2: Batch analysis of {count} postings")
+    print("=" * 70)
+
+    profile = next(iter(get_all_profiles().values()))
+    jobs = _synthetic_jobs(count)
+    agent = LinkedInAgent(profile)
+
+    start = time.perf_counter()
+    for job in jobs:
+        agent.analyze_job_posting(job)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in agent.analyze_many(jobs):
+        pass
+    batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in JobMatcher(profile).match_many(jobs):
+        pass
+    scores_only = time.perf_counter() - start
+
+    print(f"  analyze_job_posting loop: {count / single:10.0f} jobs/s")
+    print(f"  analyze_many:             {count / batch:10.0f} jobs/s")
+    print(f"  match_many (scores only): {count / scores_only:10.0f} jobs/s")
+
+
+def _synthetic_profiles(count: int) -> List[UserProfile]:
+    """Cycle the example profiles to build a larger population"""
+    profiles = list(get_all_profiles().values())
+    return [profiles[i % len(profiles)] for i in range(count)]
+
+
+def bench_score_matrix(profile_count: int = 500, job_count: int = 20000):
+    """Benchmark 3: vectorized score matrix vs per-pair Python scoring"""
+    print("\n" + "=" * 70)
+    print(f"BENCHMARK 3: Score matrix, {profile_count} profiles x {job_count} jobs")
+    print("=" * 70)
+
+    if not NUMPY_AVAILABLE:
+        print("  SKIPPED: NumPy not installed")
+        return
+
+    profiles = _synthetic_profiles(profile_count)
+    jobs = _synthetic_jobs(job_count)
+
+    sample = profiles[:5]
+    start = time.perf_counter()
+    for profile in sample:
+        for _ in JobMatcher(profile).match_many(jobs):
+            pass
+    loop_rate = len(sample) * job_count / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    VectorizedMatcher(profiles).score(jobs, top_k=10)
+    matrix_rate = profile_count * job_count / (time.perf_counter() - start)
+
+    print(f"  Per-pair Python loop: {loop_rate:14,.0f} pairs/s")
+    print(f"  Vectorized matrix:    {matrix_rate:14,.0f} pairs/s")
+    print(f"  Speedup:              {matrix_rate / loop_rate:14.1f}x")
+
+
+def _random_jobs(count: int, vocabulary_size: int = 2000, seed: int = 7) -> List[JobPosting]:
+    """Jobs drawn from a large skill vocabulary, so most share nothing with a profile"""
+    rng = random.Random(seed)
+    vocabulary = [f"Skill{i}" for i in range(vocabulary_size)]
+    return [
+        JobPosting(
+            title=f"Job {i}", company=f"Company {i % 500}", description="",
+            required_skills=rng.sample(vocabulary, 5),
+            preferred_skills=rng.sample(vocabulary, 3),
+            experience_years=rng.randint(0, 10), seniority_level="Mid"
+        )
+        for i in range(count)
+    ]
+
+
+def bench_skill_index(count: int = 200000, k: int = 10):
+    """Benchmark 4: inverted-index top-k vs scoring and sorting every posting"""
+    print("\n" + "=" * 70)
+    print(f"BENCHMARK 4: Top-{k} retrieval over {count} postings")
+    print("=" * 70)
+
+    jobs = _random_jobs(count)
+    profile = UserProfile(
+        name="Bench", current_role="Engineer", years_experience=5,
+        skills=[f"Skill{i}" for i in range(0, 200, 20)], previous_roles=[],
+        education="", certifications=[]
+    )
+
+    start = time.perf_counter()
+    sorted(
+        ((score, i) for i, (_, _, score) in enumerate(JobMatcher(profile).match_many(jobs))),
+        reverse=True
+    )[:k]
+    full_scan = time.perf_counter() - start
+
+    index = SkillIndex()
+    start = time.perf_counter()
+    index.add_many(jobs)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index.top_k(profile, k)
+    query = time.perf_counter() - start
+
+    print(f"  Full scan + sort:  {full_scan * 1000:9.1f} ms")
+    print(f"  Index build:       {build * 1000:9.1f} ms (once per corpus)")
+    print(f"  Index top-k query: {query * 1000:9.1f} ms "
+          f"({len(index.candidates(profile))} of {count} postings scored)")
+
+
+SAMPLE_DESCRIPTION = (
+    "We are looking for a good engineer to maintain our Python and JavaScript "
+    "services on AWS with Docker, Kubernetes, CI/CD and GitHub Actions. "
+    "You will design REST APIs, tune PostgreSQL and Redis, and mentor others. "
+) * 10
+
+
+def _legacy_parse_skills(skills: List[str], text: str) -> List[str]:
+    """Skill extraction as done before the compiled pattern (one substring scan per skill)"""
+    return [skill for skill in set(skills) if skill.lower() in text.lower()]
+
+
+def bench_parse_from_text(repeat: int = 500):
+    """Benchmark 5: compiled skill pattern vs per-skill substring scans"""
+    print("\n" + "=" * 70)
+    print(f"BENCHMARK 5: Skill extraction from a {len(SAMPLE_DESCRIPTION)}-char description")
+    print("=" * 70)
+
+    for extra in (0, 2000):
+        skills = list(get_default_taxonomy().surface_forms) + [f"Skill{i}" for i in range(extra)]
+        pattern = compile_skill_pattern(skills)
+        legacy = _time_per_call(lambda: _legacy_parse_skills(skills, SAMPLE_DESCRIPTION), repeat)
+        compiled = _time_per_call(lambda: pattern.findall(SAMPLE_DESCRIPTION.lower()), repeat)
+        print(f"  {len(skills):5d} skills: substring scans {legacy:9.1f} µs, "
+              f"compiled pattern {compiled:7.1f} µs")
+
+
+def bench_parallel_scaling(count: int = 400000, worker_counts=(1, 2, 4, 8, 16, 32)):
+    """Benchmark 6: process-pool sharded top-k scoring at increasing worker counts"""
+    print("\n" + "=" * 70)
+    print(f"BENCHMARK 6: Parallel top-10 over {count} postings ({os.cpu_count()} CPUs here)")
+    print("=" * 70)
+
+    jobs = _random_jobs(count)
+    profile = UserProfile(
+        name="Bench", current_role="Engineer", years_experience=5,
+        skills=[f"Skill{i}" for i in range(0, 200, 20)], previous_roles=[],
+        education="", certifications=[]
+    )
+
+    start = time.perf_counter()
+    for _ in JobMatcher(profile).match_many(jobs):
+        pass
+    serial = time.perf_counter() - start
+    print(f"  serial match_many: {count / serial:12,.0f} jobs/s")
+
+    for workers in worker_counts:
+        with ParallelScorer(profile, workers=workers) as scorer:
+            scorer.top_k(jobs[:workers * scorer.chunk_size])  # start workers
+            start = time.perf_counter()
+            scorer.top_k(jobs, k=10)
+            elapsed = time.perf_counter() - start
+        print(f"  {workers:2d} workers:        {count / elapsed:12,.0f} jobs/s "
+              f"({serial / elapsed:5.2f}x serial)")
+
+
+def bench_llm_fan_out(latency: float = 0.25, repeat: int = 4):
+    """Benchmark 7: four LLM sections sequentially vs concurrently"""
+    print("\n" + "=" * 70)
+    print(f"BENCHMARK 7: LLM enhancement with a {latency * 1000:.0f} ms fake provider")
+    print("=" * 70)
+
+    profile = next(iter(get_all_profiles().values()))
+    job = next(iter(get_all_jobs().values()))
+    agent = EnhancedLinkedInAgent(profile, llm_analyzer=LLMEnhancedAnalyzer(FakeLLMProvider(latency)))
+    requests = agent._enhancement_requests(LinkedInAgent(profile).analyze_job_posting(job), job)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for request in requests.values():
+            agent.llm_analyzer.run(request)
+    sequential = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        agent.analyze_job_posting(job)
+    concurrent = (time.perf_counter() - start) / repeat
+
+    print(f"  Sequential (before): {sequential * 1000:7.0f} ms per enhanced analysis")
+    print(f"  Concurrent (after):  {concurrent * 1000:7.0f} ms per enhanced analysis")
+
+
+def bench_llm_stub_server(analyses: int = 64, concurrency: int = 8, latency: float = 0.05,
+                          jitter: float = 0.5, error_rate: float = 0.05):
+    """Benchmark 8: enhanced analyses through OpenAIProvider against the local stub server"""
+    print("\n" + "=" * 70)
+    print(f"BENCHMARK 8: {analyses} enhanced analyses, {concurrency} concurrent, "
+          f"stub server at {latency * 1000:.0f} ms median / {error_rate:.0%} errors")
+    print("=" * 70)
+
+    profile = next(iter(get_all_profiles().values()))
+    jobs = list(get_all_jobs().values())
+    provider = FakeLLMProvider(latency, jitter=jitter, error_rate=error_rate, response_chars=600)
+
+    with FakeOpenAIServer(provider) as server:
+        agent = EnhancedLinkedInAgent(profile, llm_analyzer=get_llm_analyzer(api_key="fake", base_url=server.base_url))
+
+        def timed_analysis(i: int) -> float:
+            start = time.perf_counter()
+            agent.analyze_job_posting(jobs[i % len(jobs)])
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            latencies = sorted(pool.map(timed_analysis, range(analyses)))
+        elapsed = time.perf_counter() - start
+
+    print(f"  Throughput:         {analyses / elapsed:7.1f} analyses/s")
+    print(f"  Latency p50 / p95:  {latencies[len(latencies) // 2] * 1000:7.0f} / "
+          f"{latencies[int(len(latencies) * 0.95)] * 1000:.0f} ms")
+    print(f"  Completions served: {provider.calls} ({provider.errors} injected errors)")
+
+
+def bench_llm_client_reuse(requests: int = 200):
+    """Benchmark 9: a new OpenAI client per agent vs the shared pooled provider"""
+    print("\n" + "=" * 70)
+    print(f"BENCHMARK 9: {requests} single-call agents against the stub server")
+    print("=" * 70)
+
+    with FakeOpenAIServer() as server:
+        start = time.perf_counter()
+        for i in range(requests):
+            OpenAIProvider(api_key="fake", base_url=server.base_url).generate_text(f"prompt {i}")
+        per_agent = (time.perf_counter() - start) / requests
+        per_agent_connections = server.connections
+
+        start = time.perf_counter()
+        for i in range(requests):
+            get_llm_analyzer(api_key="fake", base_url=server.base_url).llm.generate_text(f"prompt {i}")
+        shared = (time.perf_counter() - start) / requests
+        shared_connections = server.connections - per_agent_connections
+
+    print(f"  Client per agent (before): {per_agent * 1000:6.2f} ms per call, {per_agent_connections} connections")
+    print(f"  Shared pool (after):       {shared * 1000:6.2f} ms per call, {shared_connections} connections")
+
+
+def bench_batch_endpoint(count: int = 500, page: int = 20):
+    """Benchmark 10: one /api/analyze round trip per job vs one /api/analyze/batch request"""
+    print("\n" + "=" * 70)
+    print(f"BENCHMARK 10: Ranking {count} jobs through the web API")
+    print("=" * 70)
+
+    from dataclasses import asdict
+    from app import app
+
+    client = app.test_client()
+    profile = asdict(next(iter(get_all_profiles().values())))
+    jobs = [asdict(job) for job in _synthetic_jobs(count)]
+    profile_id = client.post('/api/profiles', json=profile).get_json()['profile_id']
+
+    start = time.perf_counter()
+    for job in jobs:
+        client.post('/api/analyze', json={'profile': profile, 'job': job})
+    per_job = time.perf_counter() - start
+
+    start = time.perf_counter()
+    client.post('/api/analyze/batch', json={'profile_id': profile_id, 'jobs': jobs})
+    batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    client.post('/api/analyze/batch', json={
+        'profile_id': profile_id, 'jobs': jobs, 'limit': page, 'fields': ['job_title', 'company', 'match_score']
+    })
+    ranked_page = time.perf_counter() - start
+
+    print(f"  /api/analyze per job (before):    {per_job * 1000:8.1f} ms")
+    print(f"  /api/analyze/batch, all analyses: {batch * 1000:8.1f} ms")
+    print(f"  /api/analyze/batch, top {page} scores: {ranked_page * 1000:7.1f} ms")
+
+
+def bench_web_codec(count: int = 1000, repeat: int = 20):
+    """Benchmark 11: request decode plus response encode, stdlib json vs web_codec"""
+    import gzip
+    import json
+    from dataclasses import asdict
+    from web_codec import JSON_BACKEND, decode_jobs, decode_profile, dumps_bytes, loads
+
+    print("\n" + "=" * 70)
+    print(f"BENCHMARK 11: Decoding and encoding a {count}-job batch ({JSON_BACKEND})")
+    print("=" * 70)
+
+    profile = next(iter(get_all_profiles().values()))
+    jobs = _synthetic_jobs(count)
+    request_body = json.dumps({'profile': asdict(profile), 'jobs': [asdict(job) for job in jobs]}).encode("utf-8")
+    response = LinkedInAgent(profile).rank_job_postings(jobs)
+
+    def stdlib():
+        data = json.loads(request_body)
+        p = data['profile']
+        UserProfile(p['name'], p['current_role'], p['years_experience'], p['skills'],
+                    p['previous_roles'], p['education'], p['certifications'])
+        for j in data['jobs']:
+            JobPosting(j['title'], j['company'], j['description'], j['required_skills'],
+                       j['preferred_skills'], j['experience_years'], j['seniority_level'])
+        # Flask's default provider: sorted keys, ASCII-escaped
+        return json.dumps(response, sort_keys=True).encode("utf-8")
+
+    def fast():
+        data = loads(request_body)
+        decode_profile(data['profile'])
+        decode_jobs(data['jobs'])
+        return dumps_bytes(response)
+
+    before = _time_per_call(stdlib, repeat)
+    after = _time_per_call(fast, repeat)
+    body = fast()
+    start = time.perf_counter()
+    compressed = gzip.compress(body, compresslevel=6)
+    gzip_ms = (time.perf_counter() - start) * 1000
+
+    print(f"  stdlib json + dict lookups (before): {before / 1000:7.2f} ms per request")
+    print(f"  web_codec with type checks (after):  {after / 1000:7.2f} ms per request")
+    print(f"  gzip level 6: {len(body) / 1024:.0f} KB -> {len(compressed) / 1024:.0f} KB in {gzip_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    bench_single_analysis()
+    bench_batch_analysis()
+    bench_score_matrix()
+    bench_skill_index()
+    bench_parse_from_text()
+    bench_parallel_scaling()
+    bench_llm_fan_out()
+    bench_llm_stub_server()
+    bench_llm_client_reuse()
+    bench_batch_endpoint()
+    bench_web_codec()
@@ -123,8 +123,7 @@ def demo_multiple_jobs():
     print(f"\nAnalyzing {len(jobs)} jobs for {user.name}...\n")
     
     results = []
-    for job in jobs:
-        analysis = agent.analyze_job_posting(job)
+    for job, analysis in zip(jobs, agent.analyze_many(jobs)):
         results.append({
             "job": f"{job.title} at {job.company}",
             "score": analysis['match_score']['percentage'],
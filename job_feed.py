@@ -0,0 +1,232 @@
+"""
+Streaming Job Feed Ingestion
+Scores JSONL/CSV job feeds of any size with bounded memory and resumable checkpoints
+"""
+
+import csv
+import json
+import os
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from linkedin_agent import UserProfile, JobPosting, JobMatcher, LinkedInAgent
+from linkedin_utils import JobPostingParser
+
+
+def _skill_list(value) -> list:
+    """
+    Accept skills as a list of strings or a semicolon/comma separated string
+
+    Raises:
+        TypeError: For any other value, so the record is skipped as malformed
+    """
+    if value is None:
+        return []
+    if isinstance(value, list):
+        if not all(isinstance(skill, str) for skill in value):
+            raise TypeError("skill lists must contain only strings")
+        return value
+    if not isinstance(value, str):
+        raise TypeError(f"skills must be a list or a string, not {type(value).__name__}")
+    separator = ";" if ";" in value else ","
+    return [s.strip() for s in value.split(separator) if s.strip()]
+
+
+_LEADING_NUMBER = re.compile(r"\s*(\d+(?:\.\d+)?)")
+
+
+def _years(value) -> Optional[int]:
+    """Whole years from a feed value such as 3, "3.5", "5+" or "3 years" (None if there is no number)"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    match = _LEADING_NUMBER.match(value) if isinstance(value, str) else None
+    return int(float(match.group(1))) if match else None
+
+
+def job_from_record(record: Dict[str, any]) -> JobPosting:
+    """
+    Build a JobPosting from a feed record
+
+    Missing required skills, and experience that is missing or has no
+    leading number, are filled in by running the description through
+    JobPostingParser.
+    """
+    description = record.get("description") or ""
+    required_skills = _skill_list(record.get("required_skills"))
+    experience_years = _years(record.get("experience_years"))
+
+    if not required_skills or experience_years is None:
+        parsed = JobPostingParser.parse_from_text(description)
+        required_skills = required_skills or parsed["skills"]
+        if experience_years is None:
+            experience_years = parsed["years"]
+
+    return JobPosting(
+        title=record.get("title") or "",
+        company=record.get("company") or "",
+        description=description,
+        required_skills=required_skills,
+        preferred_skills=_skill_list(record.get("preferred_skills")),
+        experience_years=experience_years,
+        seniority_level=record.get("seniority_level") or ""
+    )
+
+
+def _lines_with_offsets(f, offsets: list) -> Iterator[str]:
+    """Decode lines from a binary file, recording the byte offset after each one"""
+    for line in f:
+        offsets[0] += len(line)
+        yield line.decode("utf-8")
+
+
+# What a malformed record raises: bad JSON, a non-object line or a field of the wrong type
+RECORD_ERRORS = (ValueError, TypeError, KeyError, AttributeError)
+
+
+def iter_job_feed(path: str, start_offset: int = 0,
+                  skipped: Optional[List[Tuple[int, str]]] = None) -> Iterator[Tuple[JobPosting, int]]:
+    """
+    Stream job postings from a JSONL or CSV feed
+
+    Malformed records (truncated JSON, wrong field types) are skipped so one
+    bad line cannot stop a feed; each is appended to skipped, if given, as
+    (byte offset of the record, error message).
+
+    Args:
+        path: Feed file (.csv for CSV with a header row, anything else is JSONL)
+        start_offset: Byte offset to resume from (as yielded earlier)
+        skipped: List collecting skipped records
+
+    Yields:
+        (job_posting, offset) where offset is the byte position just after
+        the record - pass it back as start_offset to resume after it
+    """
+    is_csv = path.lower().endswith(".csv")
+    with open(path, "rb") as f:
+        header = None
+        if is_csv:
+            header = next(csv.reader([f.readline().decode("utf-8")]))
+            start_offset = max(start_offset, f.tell())
+        f.seek(start_offset)
+
+        offsets = [start_offset]
+        lines = _lines_with_offsets(f, offsets)
+
+        items = csv.DictReader(lines, fieldnames=header) if is_csv else (line for line in lines if line.strip())
+        record_start = offsets[0]
+        for item in items:
+            try:
+                job = job_from_record(item if is_csv else json.loads(item))
+            except RECORD_ERRORS as e:
+                if skipped is not None:
+                    skipped.append((record_start, f"{type(e).__name__}: {e}"))
+            else:
+                yield job, offsets[0]
+            record_start = offsets[0]
+
+
+def _write_checkpoint(path: str, state: Dict[str, int]):
+    """Atomically replace the checkpoint file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def score_job_feed(
+    input_path: str,
+    output_path: str,
+    user_profile: UserProfile,
+    checkpoint_path: Optional[str] = None,
+    checkpoint_every: int = 1000
+) -> Dict[str, int]:
+    """
+    Score every posting in a feed and append results to a JSONL file
+
+    Memory use is bounded by one record. Every checkpoint_every records the
+    output is flushed and the input/output byte offsets are saved; a rerun
+    with the same paths truncates output written after the last checkpoint
+    and resumes from there. The checkpoint is removed once the feed is done.
+
+    Args:
+        input_path: JSONL or CSV job feed
+        output_path: JSONL results, one line per posting
+        user_profile: Profile to score against
+        checkpoint_path: Checkpoint file (default: output_path + ".checkpoint")
+        checkpoint_every: Records between checkpoints
+
+    Returns:
+        Summary with records scored in this run, malformed records skipped
+        in this run (each reported with its byte offset) and the resume
+        offset used
+    """
+    checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+    state = {"input_offset": 0, "output_offset": 0, "records": 0}
+    if os.path.exists(checkpoint_path) and os.path.exists(output_path):
+        with open(checkpoint_path) as f:
+            state = json.load(f)
+
+    agent = LinkedInAgent(user_profile)
+    matcher = JobMatcher(user_profile)
+    resumed_from = state["input_offset"]
+    scored = 0
+    skipped: List[Tuple[int, str]] = []
+    skipped_count = 0
+
+    def report_skipped():
+        nonlocal skipped_count
+        for offset, error in skipped:
+            print(f"Warning: skipped malformed record at byte {offset} of {input_path}: {error}")
+        skipped_count += len(skipped)
+        skipped.clear()
+
+    with open(output_path, "r+b" if state["output_offset"] else "wb") as out:
+        out.truncate(state["output_offset"])
+        out.seek(state["output_offset"])
+
+        for job, offset in iter_job_feed(input_path, state["input_offset"], skipped):
+            report_skipped()
+            skill_match = matcher.match(job)
+            score = matcher.calculate_match_score(job, skill_match)
+            out.write(json.dumps({
+                "title": job.title,
+                "company": job.company,
+                "match_score": round(score, 1),
+                "rating": agent._rate_match(score),
+                "matched_required": skill_match.matched_required,
+                "missing_required": skill_match.missing_required
+            }).encode("utf-8") + b"\n")
+
+            scored += 1
+            state["records"] += 1
+            state["input_offset"] = offset
+            if scored % checkpoint_every == 0:
+                out.flush()
+                os.fsync(out.fileno())
+                state["output_offset"] = out.tell()
+                _write_checkpoint(checkpoint_path, state)
+
+        report_skipped()
+
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    return {"records": state["records"], "scored_this_run": scored, "skipped_this_run": skipped_count,
+            "resumed_from": resumed_from}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score a JSONL/CSV job feed against a profile")
+    parser.add_argument("feed", help="Input job feed (.jsonl or .csv)")
+    parser.add_argument("output", help="Output JSONL results")
+    parser.add_argument("--profile", required=True, help="UserProfile as a JSON file")
+    parser.add_argument("--checkpoint-every", type=int, default=1000)
+    args = parser.parse_args()
+
+    with open(args.profile) as f:
+        profile = UserProfile(**json.load(f))
+
+    summary = score_job_feed(args.feed, args.output, profile, checkpoint_every=args.checkpoint_every)
+    print(json.dumps(summary, indent=2))
@@ -4,10 +4,12 @@ Analyzes job postings and generates personalized application strategies
 """
 
 import json
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from skill_taxonomy import get_default_taxonomy
+
 
 class SkillMatch(Enum):
     EXPERT = "expert"
@@ -40,11 +42,36 @@ class JobPosting:
     seniority_level: str
 
 
+@dataclass
+class MatchResult:
+    """Skill match of one profile against one job posting"""
+    matched_required: List[str]
+    matched_preferred: List[str]
+    missing_required: List[str]
+    missing_preferred: List[str]
+    
+    def to_dict(self) -> Dict[str, List[str]]:
+        """Return the match in the legacy ``match_skills`` dict format"""
+        return {
+            "matched_required": list(self.matched_required),
+            "matched_preferred": list(self.matched_preferred),
+            "missing_required": list(self.missing_required),
+            "missing_preferred": list(self.missing_preferred)
+        }
+
+
 class JobMatcher:
     """Core matching logic for job applications"""
     
     def __init__(self, user_profile: UserProfile):
         self.user_profile = user_profile
+        # Normalized once per matcher; rebuild the matcher if the profile's skills change
+        self.user_skills = {self.normalize_skill(s) for s in user_profile.skills}
+    
+    @staticmethod
+    def normalize_skill(skill: str) -> str:
+        """Normalize a skill name or alias to its taxonomy skill ID"""
+        return get_default_taxonomy().normalize(skill)
     
     def extract_skill_requirements(self, job_posting: JobPosting) -> Dict[str, List[str]]:
         """Extract and categorize skills from job posting"""
@@ -54,41 +81,41 @@ class JobMatcher:
             "all": list(set(job_posting.required_skills + job_posting.preferred_skills))
         }
     
-    def match_skills(self, job_posting: JobPosting) -> Dict[str, any]:
+    def match(self, job_posting: JobPosting) -> MatchResult:
         """Match user skills against job requirements"""
-        skills_required = self.extract_skill_requirements(job_posting)
-        user_skills_lower = [s.lower() for s in self.user_profile.skills]
-        
-        matched = {
-            "matched_required": [],
-            "matched_preferred": [],
-            "missing_required": [],
-            "missing_preferred": []
-        }
+        user_skills = self.user_skills
+        normalize = self.normalize_skill
+        result = MatchResult([], [], [], [])
         
-        for skill in skills_required["required"]:
-            if skill.lower() in user_skills_lower:
-                matched["matched_required"].append(skill)
+        for skill in job_posting.required_skills:
+            if normalize(skill) in user_skills:
+                result.matched_required.append(skill)
             else:
-                matched["missing_required"].append(skill)
+                result.missing_required.append(skill)
         
-        for skill in skills_required["preferred"]:
-            if skill.lower() in user_skills_lower:
-                matched["matched_preferred"].append(skill)
+        for skill in job_posting.preferred_skills:
+            if normalize(skill) in user_skills:
+                result.matched_preferred.append(skill)
             else:
-                matched["missing_preferred"].append(skill)
+                result.missing_preferred.append(skill)
         
-        return matched
+        return result
+    
+    def match_skills(self, job_posting: JobPosting) -> Dict[str, any]:
+        """Match user skills against job requirements"""
+        return self.match(job_posting).to_dict()
     
-    def calculate_match_score(self, job_posting: JobPosting) -> float:
+    def calculate_match_score(self, job_posting: JobPosting,
+                              skill_match: Optional[MatchResult] = None) -> float:
         """Calculate overall match percentage (0-100)"""
-        skill_match = self.match_skills(job_posting)
+        if skill_match is None:
+            skill_match = self.match(job_posting)
         
-        required_skills = len(skill_match["matched_required"]) + len(skill_match["missing_required"])
+        required_skills = len(skill_match.matched_required) + len(skill_match.missing_required)
         if required_skills == 0:
             return 0.0
         
-        matched_percentage = (len(skill_match["matched_required"]) / required_skills) * 100
+        matched_percentage = (len(skill_match.matched_required) / required_skills) * 100
         
         # Experience level adjustment
         if self.user_profile.years_experience >= job_posting.experience_years:
@@ -99,26 +126,42 @@ class JobMatcher:
         
         final_score = min(100, max(0, matched_percentage + experience_bonus))
         return final_score
+    
+    def match_many(self, job_postings: Iterable[JobPosting]) -> Iterator[Tuple[JobPosting, MatchResult, float]]:
+        """
+        Match and score many job postings in one pass
+        
+        Args:
+            job_postings: List or iterator of job postings
+        
+        Yields:
+            (job_posting, skill_match, match_score) in input order
+        """
+        for job_posting in job_postings:
+            skill_match = self.match(job_posting)
+            yield job_posting, skill_match, self.calculate_match_score(job_posting, skill_match)
 
 
 class ApplicationAdvisor:
     """Generates application strategies and advice"""
     
-    def __init__(self, matcher: JobMatcher, job_posting: JobPosting):
+    def __init__(self, matcher: JobMatcher, job_posting: JobPosting,
+                 skill_match: Optional[MatchResult] = None):
         self.matcher = matcher
         self.job_posting = job_posting
+        self.skill_match = skill_match if skill_match is not None else matcher.match(job_posting)
     
     def generate_strong_points(self) -> List[str]:
         """Identify strongest selling points for the application"""
-        skill_match = self.matcher.match_skills(self.job_posting)
+        skill_match = self.skill_match
         
         strong_points = []
         
         # Strong point: Matched required skills
-        if skill_match["matched_required"]:
+        if skill_match.matched_required:
             strong_points.append(
-                f"You have {len(skill_match['matched_required'])} of the required skills: "
-                f"{', '.join(skill_match['matched_required'][:3])}"
+                f"You have {len(skill_match.matched_required)} of the required skills: "
+                f"{', '.join(skill_match.matched_required[:3])}"
             )
         
         # Strong point: Experience level
@@ -139,22 +182,22 @@ class ApplicationAdvisor:
     
     def generate_improvement_areas(self) -> List[str]:
         """Identify areas to improve for better application"""
-        skill_match = self.matcher.match_skills(self.job_posting)
+        skill_match = self.skill_match
         
         improvements = []
         
         # Missing required skills
-        if skill_match["missing_required"]:
+        if skill_match.missing_required:
             improvements.append(
                 f"Learn these required skills to be a stronger candidate: "
-                f"{', '.join(skill_match['missing_required'][:3])}"
+                f"{', '.join(skill_match.missing_required[:3])}"
             )
         
         # Missing preferred skills
-        if skill_match["missing_preferred"]:
+        if skill_match.missing_preferred:
             improvements.append(
                 f"Consider learning these preferred skills: "
-                f"{', '.join(skill_match['missing_preferred'][:2])}"
+                f"{', '.join(skill_match.missing_preferred[:2])}"
             )
         
         # Experience gap
@@ -172,11 +215,11 @@ class ApplicationAdvisor:
         talking_points = []
         
         # Highlight matched skills
-        skill_match = self.matcher.match_skills(self.job_posting)
-        if skill_match["matched_required"]:
+        skill_match = self.skill_match
+        if skill_match.matched_required:
             talking_points.append(
                 f"In your cover letter, emphasize your expertise in: "
-                f"{', '.join(skill_match['matched_required'][:2])}"
+                f"{', '.join(skill_match.matched_required[:2])}"
             )
         
         # Role relevance
@@ -195,18 +238,18 @@ class ApplicationAdvisor:
     
     def generate_interview_prep(self) -> Dict[str, List[str]]:
         """Generate potential interview questions and preparation tips"""
-        skill_match = self.matcher.match_skills(self.job_posting)
+        skill_match = self.skill_match
         
-        weak_areas = skill_match["missing_required"] + skill_match["missing_preferred"]
+        weak_areas = skill_match.missing_required + skill_match.missing_preferred
         
         prep = {
             "likely_questions": [
-                f"Tell us about your experience with {skill_match['matched_required'][0] if skill_match['matched_required'] else 'this stack'}",
+                f"Tell us about your experience with {skill_match.matched_required[0] if skill_match.matched_required else 'this stack'}",
                 f"Describe a challenging project in {self.matcher.user_profile.current_role}",
                 f"Why are you interested in joining {self.job_posting.company}?"
             ],
             "preparation_tips": [
-                f"Prepare examples using STAR method for {', '.join(skill_match['matched_required'][:2])}",
+                f"Prepare examples using STAR method for {', '.join(skill_match.matched_required[:2])}",
                 "Prepare 2-3 questions about the role and team",
                 f"Research {self.job_posting.company}'s recent news/product launches"
             ] if not weak_areas else [
@@ -219,36 +262,111 @@ class ApplicationAdvisor:
         return prep
 
 
+# Keys of an analysis, in order; the advisor sections are the expensive ones
+ANALYSIS_FIELDS = (
+    "job_title", "company", "match_score", "skill_analysis", "strong_points",
+    "improvement_areas", "cover_letter_tips", "interview_preparation", "recommendation"
+)
+
+
 class LinkedInAgent:
     """Main LinkedIn Job Application Assistant Agent"""
     
-    def __init__(self, user_profile: UserProfile):
+    def __init__(self, user_profile: UserProfile, matcher: Optional[JobMatcher] = None):
+        """
+        Args:
+            user_profile: User's LinkedIn profile
+            matcher: Prebuilt matcher for user_profile (e.g. from a
+                ProfileStore); by default one is built per analysis
+        """
         self.user_profile = user_profile
+        self.matcher = matcher
+    
+    def _get_matcher(self) -> JobMatcher:
+        return self.matcher or JobMatcher(self.user_profile)
     
     def analyze_job_posting(self, job_posting: JobPosting) -> Dict[str, any]:
         """Analyze a job posting and generate comprehensive application strategy"""
         
-        matcher = JobMatcher(self.user_profile)
-        advisor = ApplicationAdvisor(matcher, job_posting)
+        matcher = self._get_matcher()
+        skill_match = matcher.match(job_posting)
+        match_score = matcher.calculate_match_score(job_posting, skill_match)
+        
+        return self._build_analysis(matcher, job_posting, skill_match, match_score)
+    
+    def analyze_many(self, job_postings: Iterable[JobPosting]) -> Iterator[Dict[str, any]]:
+        """
+        Analyze many job postings, normalizing the profile's skills only once
+        
+        Args:
+            job_postings: List or iterator of job postings
         
-        match_score = matcher.calculate_match_score(job_posting)
+        Yields:
+            The same analysis as analyze_job_posting, in input order
+        """
+        matcher = self._get_matcher()
+        for job_posting, skill_match, match_score in matcher.match_many(job_postings):
+            yield self._build_analysis(matcher, job_posting, skill_match, match_score)
+    
+    def rank_job_postings(self, job_postings: Iterable[JobPosting], offset: int = 0,
+                          limit: Optional[int] = None,
+                          fields: Optional[Iterable[str]] = None) -> Dict[str, any]:
+        """
+        Score postings in one pass and analyze one page of them, best first
+        
+        Every posting is matched and scored, but analyses (and their advisor
+        sections) are only built for the requested page and fields.
+        
+        Args:
+            job_postings: List or iterator of job postings
+            offset: Ranked results to skip
+            limit: Maximum results returned (default: all)
+            fields: Analysis keys to include (default: ANALYSIS_FIELDS)
+        
+        Returns:
+            {'total', 'offset', 'limit', 'results'}; each result is an
+            analysis plus its posting's 'index' in the input
+        """
+        matcher = self._get_matcher()
+        scored = [
+            (match_score, index, job_posting, skill_match)
+            for index, (job_posting, skill_match, match_score) in enumerate(matcher.match_many(job_postings))
+        ]
+        # Best score first; ties keep input order
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        page = scored[offset:None if limit is None else offset + limit]
+        
+        fields = None if fields is None else set(fields)
+        results = []
+        for match_score, index, job_posting, skill_match in page:
+            analysis = self._build_analysis(matcher, job_posting, skill_match, match_score, fields)
+            analysis["index"] = index
+            results.append(analysis)
+        
+        return {"total": len(scored), "offset": offset, "limit": limit, "results": results}
+    
+    def _build_analysis(self, matcher: JobMatcher, job_posting: JobPosting,
+                        skill_match: MatchResult, match_score: float,
+                        fields: Optional[set] = None) -> Dict[str, any]:
+        """Assemble the analysis dict (or just the given fields) from a precomputed match"""
+        advisor = ApplicationAdvisor(matcher, job_posting, skill_match)
         
-        analysis = {
-            "job_title": job_posting.title,
-            "company": job_posting.company,
-            "match_score": {
+        sections = {
+            "job_title": lambda: job_posting.title,
+            "company": lambda: job_posting.company,
+            "match_score": lambda: {
                 "percentage": round(match_score, 1),
                 "rating": self._rate_match(match_score)
             },
-            "skill_analysis": matcher.match_skills(job_posting),
-            "strong_points": advisor.generate_strong_points(),
-            "improvement_areas": advisor.generate_improvement_areas(),
-            "cover_letter_tips": advisor.generate_talking_points(),
-            "interview_preparation": advisor.generate_interview_prep(),
-            "recommendation": self._generate_recommendation(match_score)
+            "skill_analysis": skill_match.to_dict,
+            "strong_points": advisor.generate_strong_points,
+            "improvement_areas": advisor.generate_improvement_areas,
+            "cover_letter_tips": advisor.generate_talking_points,
+            "interview_preparation": advisor.generate_interview_prep,
+            "recommendation": lambda: self._generate_recommendation(match_score)
         }
         
-        return analysis
+        return {name: build() for name, build in sections.items() if fields is None or name in fields}
     
     def _rate_match(self, score: float) -> str:
         """Convert score to rating"""
@@ -0,0 +1,88 @@
+"""
+Inverted skill -> job index for top-k job retrieval
+Only postings sharing a required skill with the profile are ever scored
+"""
+
+import heapq
+import json
+from dataclasses import asdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+from linkedin_agent import UserProfile, JobPosting, JobMatcher
+
+
+class SkillIndex:
+    """Persistent inverted index from normalized required skill to posting IDs"""
+
+    def __init__(self):
+        self.jobs: List[JobPosting] = []
+        self.postings: Dict[str, List[int]] = {}
+
+    def add(self, job_posting: JobPosting) -> int:
+        """Index a job posting and return its posting ID"""
+        job_id = len(self.jobs)
+        self.jobs.append(job_posting)
+        for skill in {JobMatcher.normalize_skill(s) for s in job_posting.required_skills}:
+            self.postings.setdefault(skill, []).append(job_id)
+        return job_id
+
+    def add_many(self, job_postings: Iterable[JobPosting]) -> List[int]:
+        """Index many job postings, returning their posting IDs"""
+        return [self.add(job) for job in job_postings]
+
+    def get(self, job_id: int) -> JobPosting:
+        """Return the job posting for a posting ID"""
+        return self.jobs[job_id]
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def candidates(self, user_profile: UserProfile) -> Set[int]:
+        """
+        Posting IDs that share at least one required skill with the profile
+
+        Preferred skills are not indexed: they do not affect the match score,
+        so a posting matching only preferred skills scores the same as one
+        matching nothing (at most the 10 point experience bonus).
+        """
+        candidate_ids: Set[int] = set()
+        for skill in {JobMatcher.normalize_skill(s) for s in user_profile.skills}:
+            candidate_ids.update(self.postings.get(skill, ()))
+        return candidate_ids
+
+    def top_k(self, user_profile: UserProfile, k: int = 10) -> List[Tuple[int, float]]:
+        """
+        Return the k best-matching candidate postings for a profile
+
+        Args:
+            user_profile: Profile to match
+            k: Number of postings to return
+
+        Returns:
+            (job_id, match_score) pairs, best first; ties keep the lower ID first
+        """
+        matcher = JobMatcher(user_profile)
+        scored = (
+            (matcher.calculate_match_score(self.jobs[job_id]), job_id)
+            for job_id in self.candidates(user_profile)
+        )
+        best = heapq.nlargest(k, scored, key=lambda item: (item[0], -item[1]))
+        return [(job_id, score) for score, job_id in best]
+
+    def save(self, path: str):
+        """Write the index to a JSON file"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "jobs": [asdict(job) for job in self.jobs],
+                "postings": self.postings
+            }, f)
+
+    @classmethod
+    def load(cls, path: str) -> "SkillIndex":
+        """Read an index written by save()"""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls()
+        index.jobs = [JobPosting(**job) for job in data["jobs"]]
+        index.postings = data["postings"]
+        return index
@@ -5,36 +5,29 @@ Utility functions for LinkedIn Agent
 import re
 from typing import List, Dict
 from linkedin_agent import JobPosting, UserProfile
+from skill_taxonomy import get_default_taxonomy
 
 
 class JobPostingParser:
     """Parse job postings from various formats"""
     
+    _YEARS_PATTERN = re.compile(r'(\d+)\+?\s*years?')
+    
     @staticmethod
     def parse_from_text(text: str) -> Dict[str, any]:
         """Extract skill keywords from job description text"""
         
-        # Common technical skills
-        tech_skills = {
-            "Python", "JavaScript", "Java", "C++", "C#", "Go", "Rust", "PHP",
-            "React", "Vue", "Angular", "Django", "Flask", "Spring", "FastAPI",
-            "SQL", "MongoDB", "PostgreSQL", "MySQL", "Redis", "Elasticsearch",
-            "Docker", "Kubernetes", "AWS", "Azure", "GCP", "Terraform",
-            "Git", "CI/CD", "Jenkins", "GitHub Actions", "REST APIs", "GraphQL",
-            "Microservices", "ML", "AI", "TensorFlow", "PyTorch"
-        }
+        lowered = text.lower()
         
-        found_skills = set()
-        for skill in tech_skills:
-            if skill.lower() in text.lower():
-                found_skills.add(skill)
+        # Whole-word taxonomy matches (names and aliases), in order of first appearance
+        found_skills = get_default_taxonomy().extract(text, lowered)
         
         # Count years of experience
-        years_match = re.search(r'(\d+)\+?\s*years?', text.lower())
+        years_match = JobPostingParser._YEARS_PATTERN.search(lowered)
         years = int(years_match.group(1)) if years_match else 3
         
         return {
-            "skills": list(found_skills),
+            "skills": found_skills,
             "years": years
         }
 
@@ -146,20 +139,13 @@ class InterviewSimulator:
     @staticmethod
     def generate_technical_questions(skills: List[str]) -> List[str]:
         """Generate technical questions based on skills"""
-        skill_questions = {
-            "Python": "Explain the difference between lists and tuples in Python",
-            "JavaScript": "What are closures in JavaScript and why are they important?",
-            "React": "What is the purpose of useEffect in React hooks?",
-            "SQL": "Explain the difference between JOIN and UNION in SQL",
-            "Docker": "What are the advantages of using Docker containers?",
-            "AWS": "What is the difference between EC2 and Lambda?",
-            "Design Patterns": "Explain the Observer pattern and provide an example"
-        }
+        taxonomy = get_default_taxonomy()
         
         questions = []
         for skill in skills[:3]:
-            if skill in skill_questions:
-                questions.append(skill_questions[skill])
+            question = taxonomy.question(skill)
+            if question:
+                questions.append(question)
         
         if not questions:
             questions.append("Tell me about your most challenging project")
@@ -0,0 +1,188 @@
+"""
+Vectorized profile x job scoring for large corpora
+Computes the JobMatcher.calculate_match_score formula as NumPy array operations
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from linkedin_agent import UserProfile, JobPosting, JobMatcher
+
+# NumPy is optional - only needed for matrix scoring
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class SkillVocabulary:
+    """Shared mapping from normalized skill to column id"""
+
+    normalize = staticmethod(JobMatcher.normalize_skill)
+
+    def __init__(self, skills: Iterable[str] = ()):
+        self.index: Dict[str, int] = {}
+        for skill in skills:
+            self.add(skill)
+
+    def add(self, skill: str) -> int:
+        """Add a skill (if new) and return its id"""
+        key = self.normalize(skill)
+        if key not in self.index:
+            self.index[key] = len(self.index)
+        return self.index[key]
+
+    def get(self, skill: str) -> Optional[int]:
+        """Return a skill's id, or None if it is not in the vocabulary"""
+        return self.index.get(self.normalize(skill))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+@dataclass
+class ScoreMatrix:
+    """Result of scoring a set of profiles against a set of jobs"""
+    scores: Optional["np.ndarray"]        # (profiles, jobs), None if not kept
+    top_indices: Optional["np.ndarray"]   # (profiles, k) job indices, best first
+    top_scores: Optional["np.ndarray"]    # (profiles, k) matching scores
+
+
+class VectorizedMatcher:
+    """Scores many profiles against many jobs with whole-matrix operations"""
+
+    def __init__(self, profiles: Sequence[UserProfile]):
+        """
+        Encode profiles into an incidence matrix over a shared skill vocabulary
+
+        Only profile skills enter the vocabulary: a job skill outside it can
+        never be matched, so it only counts toward the job's totals.
+
+        Args:
+            profiles: Profiles to score (row order of every result)
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy not available. Install with: pip install numpy")
+
+        self.profiles = list(profiles)
+        self.vocabulary = SkillVocabulary()
+        rows, cols = [], []
+        for row, profile in enumerate(self.profiles):
+            for col in {self.vocabulary.add(skill) for skill in profile.skills}:
+                rows.append(row)
+                cols.append(col)
+
+        # Skill-major incidence (vocab + 1 sentinel row, profiles); the all-zero
+        # sentinel row gives every job a non-empty segment for np.add.reduceat
+        self.sentinel = len(self.vocabulary)
+        self.skill_profiles = np.zeros((self.sentinel + 1, len(self.profiles)), dtype=np.uint8)
+        self.skill_profiles[cols, rows] = 1
+        self.profile_years = np.array([p.years_experience for p in self.profiles], dtype=np.float64)
+
+    def _encode(self, skill_lists: List[List[str]]) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """Encode job skill lists as CSR (indices, segment starts, list lengths)"""
+        indices, starts, totals = [], [], []
+        get = self.vocabulary.get
+        for skills in skill_lists:
+            starts.append(len(indices))
+            indices.append(self.sentinel)
+            for skill in skills:
+                col = get(skill)
+                if col is not None:
+                    indices.append(col)
+            totals.append(len(skills))
+        return (np.array(indices, dtype=np.intp),
+                np.array(starts, dtype=np.intp),
+                np.array(totals, dtype=np.float64))
+
+    def _count(self, indices: "np.ndarray", starts: "np.ndarray") -> "np.ndarray":
+        """Matched-skill counts, shape (profiles, jobs)"""
+        return np.add.reduceat(self.skill_profiles[indices], starts, axis=0, dtype=np.int32).T
+
+    def match_counts(self, jobs: Sequence[JobPosting]) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Count matched required and preferred skills for every profile/job pair
+
+        Returns:
+            (matched_required, matched_preferred), each shaped (profiles, jobs)
+        """
+        required = self._encode([job.required_skills for job in jobs])
+        preferred = self._encode([job.preferred_skills for job in jobs])
+        return self._count(*required[:2]), self._count(*preferred[:2])
+
+    def _score_chunk(self, jobs: Sequence[JobPosting]) -> "np.ndarray":
+        """Scores for one chunk of jobs, shape (profiles, jobs)"""
+        indices, starts, totals = self._encode([job.required_skills for job in jobs])
+        matched = self._count(indices, starts)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            matched_percentage = matched / totals * 100
+
+        # Experience level adjustment: +10 if met, else -5 per missing year
+        job_years = np.array([job.experience_years for job in jobs], dtype=np.float64)
+        year_gap = self.profile_years[:, None] - job_years[None, :]
+        experience_bonus = np.where(year_gap >= 0, 10.0, year_gap * 5)
+
+        scores = np.clip(matched_percentage + experience_bonus, 0, 100)
+        scores[:, totals == 0] = 0.0
+        return scores
+
+    def score(
+        self,
+        jobs: Sequence[JobPosting],
+        top_k: Optional[int] = None,
+        chunk_size: int = 512,
+        keep_scores: bool = True,
+        dtype=None
+    ) -> ScoreMatrix:
+        """
+        Score every profile against every job
+
+        Args:
+            jobs: Jobs to score (column order of the score array)
+            top_k: If set, also return the k best jobs per profile
+            chunk_size: Jobs encoded per step; bounds temporary memory
+            keep_scores: Keep the dense (profiles, jobs) array. Disable for
+                corpora where only top_k is needed - the dense array is
+                profiles * jobs * itemsize bytes
+            dtype: dtype of the dense array (default float64)
+
+        Returns:
+            ScoreMatrix with the dense scores and/or per-profile top-k
+        """
+        n_profiles = len(self.profiles)
+        scores = np.empty((n_profiles, len(jobs)), dtype=dtype or np.float64) if keep_scores else None
+        top_scores = np.empty((n_profiles, 0), dtype=np.float64)
+        top_indices = np.empty((n_profiles, 0), dtype=np.intp)
+
+        for start in range(0, len(jobs), chunk_size):
+            chunk = self._score_chunk(jobs[start:start + chunk_size])
+            if scores is not None:
+                scores[:, start:start + chunk.shape[1]] = chunk
+            if top_k:
+                # Stable sort keeps the lower job index first on ties
+                candidates = np.concatenate([top_scores, chunk], axis=1)
+                candidate_indices = np.concatenate(
+                    [top_indices, np.broadcast_to(np.arange(start, start + chunk.shape[1]), chunk.shape)],
+                    axis=1
+                )
+                order = np.argsort(-candidates, axis=1, kind="stable")[:, :top_k]
+                top_scores = np.take_along_axis(candidates, order, axis=1)
+                top_indices = np.take_along_axis(candidate_indices, order, axis=1)
+
+        return ScoreMatrix(
+            scores=scores,
+            top_indices=top_indices if top_k else None,
+            top_scores=top_scores if top_k else None
+        )
+
+
+def score_matrix(
+    profiles: Sequence[UserProfile],
+    jobs: Sequence[JobPosting],
+    top_k: Optional[int] = None,
+    **kwargs
+) -> ScoreMatrix:
+    """Convenience wrapper: encode profiles and score them against jobs"""
+    return VectorizedMatcher(profiles).score(jobs, top_k=top_k, **kwargs)
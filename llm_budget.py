@@ -0,0 +1,94 @@
+"""
+LLM Latency Budgets - recent provider latency and load for shedding decisions
+Lets the analyzer skip calls that will not finish within a request's budget
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+
+class LoadShedError(RuntimeError):
+    """Raised instead of calling the provider when a call should be skipped"""
+
+    def __init__(self, reason: str):
+        super().__init__(f"LLM call skipped: {reason}")
+        self.reason = reason
+
+
+class LatencyTracker:
+    """
+    Rolling window of a provider's call latencies plus its in-flight call count
+
+    Samples expire after max_age seconds, and while calls are being skipped
+    for slow latency one probe call per probe_interval is let through, so
+    percentiles recover once the provider is fast again (skipped calls add
+    no samples of their own).
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20, max_age: float = 60.0,
+                 probe_interval: float = 1.0):
+        """
+        Args:
+            window: Most recent successful calls kept
+            min_samples: Calls needed before percentile() reports anything
+            max_age: Seconds a sample counts towards percentiles
+            probe_interval: Seconds between calls let through while shedding
+        """
+        self.min_samples = min_samples
+        self.max_age = max_age
+        self.probe_interval = probe_interval
+        self._samples = deque(maxlen=window)  # (time.monotonic() at finish, seconds)
+        self._lock = threading.Lock()
+        self._last_call = time.monotonic()  # Start of the last call made while shedding, or last finish
+        self.in_flight = 0
+
+    def start(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finish(self, seconds: Optional[float] = None):
+        """End a call, recording its latency if it succeeded"""
+        with self._lock:
+            self.in_flight -= 1
+            if seconds is not None:
+                self._last_call = time.monotonic()
+                self._samples.append((self._last_call, seconds))
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q-th percentile latency in seconds (None until min_samples recent calls)"""
+        cutoff = time.monotonic() - self.max_age
+        with self._lock:
+            while self._samples and self._samples[0][0] < cutoff:
+                self._samples.popleft()
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(seconds for _, seconds in self._samples)
+        return ordered[min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1)]
+
+    def take_probe(self) -> bool:
+        """
+        Whether to let a call through despite slow percentiles: true once no
+        call has finished or been probed for probe_interval seconds
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_call < self.probe_interval:
+                return False
+            self._last_call = now
+            return True
+
+
+_trackers: Dict[Tuple[str, str], LatencyTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_latency_tracker(provider_name: str, model: str) -> LatencyTracker:
+    """Process-wide tracker for a provider and model"""
+    with _trackers_lock:
+        tracker = _trackers.get((provider_name, model))
+        if tracker is None:
+            tracker = _trackers[(provider_name, model)] = LatencyTracker()
+        return tracker
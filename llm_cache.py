@@ -0,0 +1,279 @@
+"""
+LLM Response Cache - in-process LRU in front of an on-disk SQLite store
+Keys are (provider, model, temperature, prompt hash); entries expire per method TTL
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+DAY = 24 * 60 * 60
+
+# Seconds each LLMEnhancedAnalyzer method's responses stay fresh (0 = never cache)
+DEFAULT_TTLS = {
+    "generate_personalized_cover_letter": DAY,
+    "generate_interview_talking_points": DAY,
+    "analyze_job_fit_narrative": DAY,
+    "generate_application_package": DAY,
+    "generate_learning_roadmap": 7 * DAY,
+    "generate_company_research_brief": 7 * DAY,
+    "generate_salary_negotiation_tips": 7 * DAY,
+}
+
+
+class LLMResponseCache:
+    """Two-tier (memory LRU + SQLite) cache for LLM responses"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 1024,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = DAY
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite file for the persistent tier (None for memory only)
+            max_entries: Size of the in-process LRU tier
+            ttls: Per-method TTLs in seconds, merged over DEFAULT_TTLS
+            default_ttl: TTL for methods without an entry
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, method TEXT, expires_at REAL, response TEXT)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(provider: str, model: str, temperature: float, prompt: str) -> str:
+        """Build the cache key for a request"""
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return hashlib.sha256(
+            json.dumps([provider, model, temperature, prompt_hash]).encode("utf-8")
+        ).hexdigest()
+
+    def ttl_for(self, method: str) -> float:
+        """TTL in seconds for a method's responses"""
+        return self.ttls.get(method, self.default_ttl)
+
+    def _count(self, method: str, outcome: str):
+        counters = self._stats.setdefault(method, {"memory_hits": 0, "disk_hits": 0, "misses": 0})
+        counters[outcome] += 1
+
+    def get(self, method: str, key: str) -> Optional[str]:
+        """Return a fresh cached response, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and entry[0] > now:
+                self._memory.move_to_end(key)
+                self._count(method, "memory_hits")
+                return entry[1]
+            if entry:
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT expires_at, response FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row and row[0] > now:
+                    self._remember(key, row[0], row[1])
+                    self._count(method, "disk_hits")
+                    return row[1]
+
+            self._count(method, "misses")
+            return None
+
+    def set(self, method: str, key: str, response: str):
+        """Store a response under the method's TTL"""
+        ttl = self.ttl_for(method)
+        if ttl <= 0:
+            return
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, expires_at, response)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, method, expires_at, response) VALUES (?, ?, ?, ?)",
+                    (key, method, expires_at, response)
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, expires_at: float, response: str):
+        """Insert into the LRU tier, evicting the least recently used entry"""
+        self._memory[key] = (expires_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        """Delete expired rows from the persistent tier; returns rows removed"""
+        if self._db is None:
+            return 0
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+            self._db.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, any]:
+        """Hit/miss counters per method and in total"""
+        with self._lock:
+            per_method = {method: dict(counters) for method, counters in self._stats.items()}
+        totals = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        for counters in per_method.values():
+            for name, value in counters.items():
+                totals[name] += value
+        lookups = sum(totals.values())
+        hits = totals["memory_hits"] + totals["disk_hits"]
+        return {
+            **totals,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "entries_in_memory": len(self._memory),
+            "by_method": per_method
+        }
+
+    def close(self):
+        """Close the persistent tier"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class _Flight:
+    """One in-flight call shared by concurrent threads and asyncio tasks"""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop  # Event loop running the call, if a task leads it
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        # Futures of waiting tasks, each resolved on its own loop
+        self.waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+
+def _settle(future: asyncio.Future, flight: _Flight):
+    if future.done():
+        return  # The waiter was cancelled
+    if isinstance(flight.error, asyncio.CancelledError):
+        future.cancel()
+    elif flight.error is not None:
+        future.set_exception(flight.error)
+    else:
+        future.set_result(flight.result)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one
+
+    The first caller for a key runs the call; callers arriving while it is in
+    flight wait and get the same result (or exception). Threads and asyncio
+    tasks on any event loop share one table, so a Flask thread and an ASGI
+    task asking for the same prompt make one provider call between them.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def _finish(self, key: str, flight: _Flight, result: Any = None, error: Optional[BaseException] = None):
+        """Publish a flight's outcome and wake every waiter"""
+        with self._lock:
+            del self._flights[key]
+            flight.result, flight.error = result, error
+            flight.done.set()
+            waiters, flight.waiters = flight.waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_settle, future, flight)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn, or wait for the identical call already in flight"""
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+            elif flight.loop is not None and flight.loop is running_loop:
+                # Blocking the thread of the loop running the shared call would deadlock
+                flight = None
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if flight is None:
+            return fn()
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, flight, error=e)
+            raise
+        self._finish(key, flight, result)
+        return result
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async counterpart of do; a cancelled waiter does not cancel the shared call"""
+        return await self.join_async(key, fn)
+
+    def join_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> "asyncio.Future":
+        """
+        Start fn as the shared call for key, or join the one in flight
+
+        Unlike do_async the call is registered before this returns. The
+        future resolves with the call's result; cancelling it only stops
+        this caller's wait.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                future = loop.create_future()
+                flight.waiters.append((loop, future))
+                return future
+            flight = self._flights[key] = _Flight(loop)
+            self.calls += 1
+
+        task = asyncio.ensure_future(fn())
+        task.add_done_callback(lambda _: self._task_done(key, flight, task))
+        return asyncio.shield(task)
+
+    def _task_done(self, key: str, flight: _Flight, task: "asyncio.Task"):
+        if task.cancelled():
+            self._finish(key, flight, error=asyncio.CancelledError())
+        elif task.exception() is not None:
+            self._finish(key, flight, error=task.exception())
+        else:
+            self._finish(key, flight, task.result())
@@ -0,0 +1,295 @@
+"""
+LLM Cassettes - record provider traffic to a file and replay it offline
+Replays serve recorded responses deterministically, with recorded or zero latency,
+and recorded_requests() re-issues the recorded traffic (e.g. for benchmarks)
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from llm_integration import Completion, LLMProvider, LLMProviderError
+
+
+# Version 2 added each call's prompt, temperature and offset
+CASSETTE_FORMAT_VERSION = 2
+
+
+def _open(path: str, mode: str):
+    """Open a cassette as text, gzip-compressed if the name ends in .gz"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def request_key(prompt: str, temperature: float) -> str:
+    """Key a replay looks a call up by"""
+    return hashlib.sha256(json.dumps([temperature, prompt]).encode("utf-8")).hexdigest()[:32]
+
+
+def _read_entries(path: str) -> Iterator[dict]:
+    """Recorded calls of a cassette, in the order they completed (header skipped)"""
+    with _open(path, "r") as f:
+        f.readline()
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+@dataclass
+class RecordedRequest:
+    """One recorded call; prompt is None if the cassette was recorded with redact_prompts"""
+    offset: float
+    prompt: Optional[str]
+    temperature: Optional[float]
+    latency: float
+    response: str
+
+
+def recorded_requests(path: str) -> List[RecordedRequest]:
+    """
+    Calls on a cassette in the order they were issued
+
+    offset is seconds from the start of the recording (0.0 for every call
+    on version 1 cassettes, which recorded neither offsets nor prompts).
+    """
+    requests = [
+        RecordedRequest(entry.get("offset", 0.0), entry.get("prompt"), entry.get("temperature"),
+                        entry["latency"], entry["response"])
+        for entry in _read_entries(path)
+    ]
+    requests.sort(key=lambda r: r.offset)
+    return requests
+
+
+async def replay_traffic(requests: List[RecordedRequest], call: Callable[[str, float], Awaitable[object]],
+                         speed: float = 1.0) -> List[float]:
+    """
+    Re-issue recorded requests at their recorded offsets
+
+    Args:
+        requests: From recorded_requests (prompts may be edited first)
+        call: Async function taking (prompt, temperature), e.g. a provider's
+            complete_async or a wrapper around an analyzer
+        speed: Replay speed-up (2.0 = arrivals twice as close together)
+
+    Returns:
+        Each request's latency in seconds, in request order
+    """
+    if any(r.prompt is None for r in requests):
+        raise ValueError("Cassette was recorded with redact_prompts; its requests cannot be re-issued")
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def issue(request: RecordedRequest) -> float:
+        await asyncio.sleep(max(0.0, start + request.offset / speed - loop.time()))
+        issued = loop.time()
+        await call(request.prompt, request.temperature if request.temperature is not None else 0.7)
+        return loop.time() - issued
+
+    return list(await asyncio.gather(*(issue(r) for r in requests)))
+
+
+class _CassetteWriter:
+    """Append side of one cassette file: its lock and the clock its offsets count from"""
+
+    def __init__(self, path: str, provider_name: str, model: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.base_offset = 0.0
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with _open(path, "w") as f:
+                f.write(json.dumps({"cassette": CASSETTE_FORMAT_VERSION, "provider": provider_name,
+                                    "model": model, "recorded_at": time.time()}) + "\n")
+        else:
+            # Appended calls continue the existing timeline (read once per process)
+            self.base_offset = max((entry.get("offset", 0.0) + entry["latency"] for entry in _read_entries(path)),
+                                   default=0.0)
+
+    def offset(self, started: float) -> float:
+        return self.base_offset + started - self.started
+
+    def append(self, entry: dict):
+        with self.lock, _open(self.path, "a") as f:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+
+_writers: Dict[str, _CassetteWriter] = {}
+_recorders: Dict[Tuple[str, int, bool], "RecordingProvider"] = {}
+_registry_lock = threading.RLock()
+
+
+def _writer(path: str, provider_name: str, model: str) -> _CassetteWriter:
+    """The process-wide writer for a cassette path"""
+    path = os.path.abspath(path)
+    with _registry_lock:
+        writer = _writers.get(path)
+        if writer is None:
+            writer = _writers[path] = _CassetteWriter(path, provider_name, model)
+        return writer
+
+
+def get_recording_provider(provider: LLMProvider, path: str, redact_prompts: bool = False) -> "RecordingProvider":
+    """Process-wide recorder of a provider's traffic to a cassette (one per path and provider)"""
+    key = (os.path.abspath(path), id(provider), redact_prompts)
+    with _registry_lock:
+        recorder = _recorders.get(key)
+        if recorder is None or recorder.provider is not provider:
+            recorder = _recorders[key] = RecordingProvider(provider, path, redact_prompts)
+        return recorder
+
+
+class RecordingProvider(LLMProvider):
+    """
+    Passes calls through to a provider and appends each call to a cassette file
+
+    Recorders of the same path share one lock and one clock, so calls from
+    every request land on a single timeline. Use get_recording_provider to
+    reuse one recorder across requests.
+    """
+
+    def __init__(self, provider: LLMProvider, path: str, redact_prompts: bool = False):
+        """
+        Args:
+            provider: Provider whose traffic is recorded
+            path: JSONL cassette (.gz for gzip); appended to if it exists
+            redact_prompts: Store prompts only as hashes; the cassette can
+                still be replayed but its requests cannot be re-issued
+        """
+        self.provider = provider
+        self.model = getattr(provider, "model", "")
+        self.path = path
+        self.redact_prompts = redact_prompts
+        self._writer = _writer(path, provider.name, self.model)
+
+    @property
+    def name(self) -> str:
+        return self.provider.name
+
+    def is_available(self) -> bool:
+        return self.provider.is_available()
+
+    def _record(self, prompt: str, temperature: float, completion: Completion, started: float):
+        entry = {
+            "key": request_key(prompt, temperature),
+            "offset": round(self._writer.offset(started), 4),
+            "latency": round(time.monotonic() - started, 4),
+            "temperature": temperature,
+            "response": completion.text,
+            "prompt_tokens": completion.prompt_tokens,
+            "completion_tokens": completion.completion_tokens
+        }
+        if not self.redact_prompts:
+            entry["prompt"] = prompt
+        self._writer.append(entry)
+
+    def generate_text(self, prompt: str, temperature: float = 0.7) -> str:
+        return self.complete(prompt, temperature).text
+
+    async def generate_text_async(self, prompt: str, temperature: float = 0.7) -> str:
+        return (await self.complete_async(prompt, temperature)).text
+
+    def complete(self, prompt: str, temperature: float = 0.7) -> Completion:
+        started = time.monotonic()
+        completion = self.provider.complete(prompt, temperature=temperature)
+        self._record(prompt, temperature, completion, started)
+        return completion
+
+    async def complete_async(self, prompt: str, temperature: float = 0.7) -> Completion:
+        started = time.monotonic()
+        completion = await self.provider.complete_async(prompt, temperature=temperature)
+        await asyncio.to_thread(self._record, prompt, temperature, completion, started)
+        return completion
+
+
+class ReplayProvider(LLMProvider):
+    """Serves responses from a cassette without any network access"""
+
+    def __init__(self, path: str, latency: str = "recorded", speed: float = 1.0,
+                 fallback_provider: Optional[LLMProvider] = None):
+        """
+        Args:
+            path: Cassette written by RecordingProvider
+            latency: "recorded" to wait each call's measured latency, "zero" not to wait
+            speed: Replay speed-up for recorded latency (2.0 = twice as fast)
+            fallback_provider: Provider for prompts not on the cassette
+                (default: raise LLMProviderError with status 404)
+        """
+        if latency not in ("recorded", "zero"):
+            raise ValueError(f"latency must be 'recorded' or 'zero', not {latency!r}")
+        self.latency = latency
+        self.speed = speed
+        self.fallback_provider = fallback_provider
+        self._entries: Dict[str, List[dict]] = {}
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        with _open(path, "r") as f:
+            header = json.loads(f.readline())
+        for entry in _read_entries(path):
+            self._entries.setdefault(entry["key"], []).append(entry)
+        self.recorded_name = header.get("provider", "")
+        self.model = header.get("model", "")
+
+    @property
+    def name(self) -> str:
+        # Replayed responses share cache keys with the recorded provider's
+        return self.recorded_name or super().name
+
+    def is_available(self) -> bool:
+        return True
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def _next_entry(self, prompt: str, temperature: float) -> Optional[dict]:
+        """Recorded responses for a prompt, served in recorded order and then cycled"""
+        key = request_key(prompt, temperature)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            return entries[position % len(entries)]
+
+    def _delay(self, entry: dict) -> float:
+        return entry["latency"] / self.speed if self.latency == "recorded" else 0.0
+
+    @staticmethod
+    def _completion(entry: dict) -> Completion:
+        return Completion(entry["response"], entry.get("prompt_tokens"), entry.get("completion_tokens"))
+
+    def _miss(self):
+        raise LLMProviderError("Prompt not on the cassette", 404)
+
+    def generate_text(self, prompt: str, temperature: float = 0.7) -> str:
+        return self.complete(prompt, temperature).text
+
+    async def generate_text_async(self, prompt: str, temperature: float = 0.7) -> str:
+        return (await self.complete_async(prompt, temperature)).text
+
+    def complete(self, prompt: str, temperature: float = 0.7) -> Completion:
+        entry = self._next_entry(prompt, temperature)
+        if entry is None:
+            if self.fallback_provider is None:
+                self._miss()
+            return self.fallback_provider.complete(prompt, temperature=temperature)
+        time.sleep(self._delay(entry))
+        return self._completion(entry)
+
+    async def complete_async(self, prompt: str, temperature: float = 0.7) -> Completion:
+        entry = self._next_entry(prompt, temperature)
+        if entry is None:
+            if self.fallback_provider is None:
+                self._miss()
+            return await self.fallback_provider.complete_async(prompt, temperature=temperature)
+        await asyncio.sleep(self._delay(entry))
+        return self._completion(entry)
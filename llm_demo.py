@@ -3,15 +3,18 @@ Enhanced LinkedIn Agent with LLM Integration
 Shows how to use LLM capabilities alongside the rule-based system
 """
 
-from linkedin_agent import LinkedInAgent, UserProfile, JobPosting
-from llm_integration import get_llm_analyzer, OPENAI_AVAILABLE
+from linkedin_agent import LinkedInAgent, UserProfile, JobPosting, JobMatcher
+from llm_integration import get_llm_analyzer, LLMEnhancedAnalyzer, OPENAI_AVAILABLE
+from llm_enrichment import BackgroundEnricher, get_enricher
 import json
 
 
 class EnhancedLinkedInAgent(LinkedInAgent):
     """Extended LinkedInAgent with LLM capabilities"""
     
-    def __init__(self, user_profile: UserProfile, use_llm: bool = True, api_key: str = None):
+    def __init__(self, user_profile: UserProfile, use_llm: bool = True, api_key: str = None,
+                 llm_deadline: float = None, llm_analyzer: LLMEnhancedAnalyzer = None,
+                 enricher: BackgroundEnricher = None, matcher: JobMatcher = None):
         """
         Initialize with optional LLM
         
@@ -19,19 +22,34 @@ class EnhancedLinkedInAgent(LinkedInAgent):
             user_profile: User's LinkedIn profile
             use_llm: Whether to enable LLM features
             api_key: Optional OpenAI API key
+            llm_deadline: Seconds allowed for all LLM sections together;
+                sections still running then use their rule-based fallback
+            llm_analyzer: Preconfigured analyzer (e.g. with a custom provider)
+            enricher: Worker pool for background enrichment (default: shared pool)
+            matcher: Prebuilt matcher for user_profile (default: built per analysis)
         """
-        super().__init__(user_profile)
+        super().__init__(user_profile, matcher=matcher)
         self.use_llm = use_llm and OPENAI_AVAILABLE
-        self.llm_analyzer = get_llm_analyzer(use_openai=use_llm, api_key=api_key)
+        self.llm_analyzer = llm_analyzer or get_llm_analyzer(use_openai=use_llm, api_key=api_key)
         self.llm_available = self.llm_analyzer.llm_available
+        self.llm_deadline = llm_deadline
+        self.enricher = enricher
     
-    def analyze_job_posting(self, job_posting: JobPosting, include_llm: bool = True):
+    def analyze_job_posting(self, job_posting: JobPosting, include_llm: bool = True,
+                            background: bool = False, latency_budget: float = None):
         """
         Enhanced analysis with LLM features
         
         Args:
             job_posting: Job to analyze
             include_llm: Whether to add LLM features to analysis
+            background: Return the rule-based analysis at once with an
+                'llm_enrichment' handle ({'id', 'status'}) instead of waiting;
+                fetch the llm_enhanced block later with get_enrichment(id)
+            latency_budget: Seconds the LLM sections may take for this request
+                (default: llm_deadline); calls recent latency says would not
+                fit are skipped for their rule-based fallback, and each
+                section's decision is reported under 'llm_decisions'
         
         Returns:
             Extended analysis dictionary
@@ -41,54 +59,184 @@ class EnhancedLinkedInAgent(LinkedInAgent):
         
         # Add LLM features if enabled and available
         if include_llm and self.llm_available:
-            base_analysis = self._enhance_with_llm(base_analysis, job_posting)
+            budget = self.llm_deadline if latency_budget is None else latency_budget
+            if background:
+                base_analysis['llm_enrichment'] = self._enrich_in_background(base_analysis, job_posting, budget)
+            else:
+                base_analysis = self._enhance_with_llm(base_analysis, job_posting, budget)
         
         return base_analysis
     
-    def _enhance_with_llm(self, base_analysis: dict, job_posting: JobPosting) -> dict:
-        """Add LLM-generated content to base analysis"""
-        
-        # Generate personalized cover letter opening
-        cover_letter = self.llm_analyzer.generate_personalized_cover_letter(
-            user_name=self.user_profile.name,
-            current_role=self.user_profile.current_role,
-            job_title=job_posting.title,
-            company=job_posting.company,
-            strong_points=base_analysis['strong_points'],
-            skills=self.user_profile.skills
-        )
+    def _enrich_in_background(self, base_analysis: dict, job_posting: JobPosting, budget: float = None) -> dict:
+        """Queue the LLM sections on the enrichment pool and return the job handle"""
+        requests = self._enhancement_requests(base_analysis, job_posting)
         
-        # Generate advanced interview talking points
-        interview_points = self.llm_analyzer.generate_interview_talking_points(
-            user_background=f"{self.user_profile.current_role} with {self.user_profile.years_experience} years",
-            job_requirements=job_posting.description,
-            matched_skills=base_analysis['skill_analysis']['matched_required'],
-            missing_skills=base_analysis['skill_analysis']['missing_required']
-        )
+        def enrich():
+            decisions = {}
+            results = self.llm_analyzer.run_many(requests, timeout=budget, decisions=decisions)
+            return {'llm_enhanced': self._merge_enhancements(results), 'llm_decisions': decisions}
         
-        # Generate narrative analysis
-        narrative = self.llm_analyzer.analyze_job_fit_narrative(
-            profile_summary=f"{self.user_profile.current_role} with {self.user_profile.years_experience} years experience",
-            job_summary=f"{job_posting.title} at {job_posting.company}",
-            match_percentage=base_analysis['match_score']['percentage']
-        )
+        job = (self.enricher or get_enricher()).submit(enrich)
+        return {'id': job.id, 'status': job.status}
+    
+    def get_enrichment(self, enrichment_id: str, wait: float = 0) -> dict:
+        """
+        State of a background enrichment
         
-        # Generate company research points
-        company_research = self.llm_analyzer.generate_company_research_brief(
-            company_name=job_posting.company,
-            industry="Tech"  # Could be extracted from job_posting
-        )
+        Args:
+            enrichment_id: ID from the analysis' 'llm_enrichment' handle
+            wait: Seconds to wait for it to finish (0 = just poll)
         
-        # Add LLM features to analysis
-        base_analysis['llm_enhanced'] = {
-            'personalized_cover_letter': cover_letter,
-            'ai_interview_points': interview_points,
-            'fit_narrative': narrative,
-            'company_research': company_research
-        }
+        Returns:
+            {'id', 'status', 'llm_enhanced', ...}, or None if unknown or expired
+        """
+        enricher = self.enricher or get_enricher()
+        job = enricher.wait(enrichment_id, wait) if wait else enricher.get(enrichment_id)
+        return job.to_dict() if job else None
+    
+    async def analyze_job_posting_async(self, job_posting: JobPosting, include_llm: bool = True,
+                                        background: bool = False, latency_budget: float = None):
+        """
+        Async counterpart of analyze_job_posting for callers already on an event loop
+        
+        Background enrichments run as tasks on the current loop instead of
+        occupying an enrichment worker thread.
+        """
+        base_analysis = super().analyze_job_posting(job_posting)
+        
+        if include_llm and self.llm_available:
+            budget = self.llm_deadline if latency_budget is None else latency_budget
+            requests = self._enhancement_requests(base_analysis, job_posting)
+            
+            async def enrich():
+                decisions = {}
+                results = await self.llm_analyzer.run_many_async(requests, timeout=budget, decisions=decisions)
+                return {'llm_enhanced': self._merge_enhancements(results), 'llm_decisions': decisions}
+            
+            if background:
+                job = (self.enricher or get_enricher()).submit_async(enrich)
+                base_analysis['llm_enrichment'] = {'id': job.id, 'status': job.status}
+            else:
+                base_analysis.update(await enrich())
         
         return base_analysis
     
+    def _enhancement_requests(self, base_analysis: dict, job_posting: JobPosting) -> dict:
+        """
+        The LLM sections to run, keyed by their llm_enhanced field
+        
+        With a structured-output analyzer this is a single application
+        package request that returns all four sections at once.
+        """
+        if self.llm_analyzer.structured_output:
+            return {
+                'application_package': self.llm_analyzer.application_package_request(
+                    user_name=self.user_profile.name,
+                    current_role=self.user_profile.current_role,
+                    years_experience=self.user_profile.years_experience,
+                    job_title=job_posting.title,
+                    company=job_posting.company,
+                    job_description=job_posting.description,
+                    industry="Tech",  # Could be extracted from job_posting
+                    strong_points=base_analysis['strong_points'],
+                    skills=self.user_profile.skills,
+                    matched_skills=base_analysis['skill_analysis']['matched_required'],
+                    missing_skills=base_analysis['skill_analysis']['missing_required'],
+                    match_percentage=base_analysis['match_score']['percentage']
+                )
+            }
+        
+        return {
+            # Personalized cover letter opening
+            'personalized_cover_letter': self.llm_analyzer.cover_letter_request(
+                user_name=self.user_profile.name,
+                current_role=self.user_profile.current_role,
+                job_title=job_posting.title,
+                company=job_posting.company,
+                strong_points=base_analysis['strong_points'],
+                skills=self.user_profile.skills
+            ),
+            # Advanced interview talking points
+            'ai_interview_points': self.llm_analyzer.talking_points_request(
+                user_background=f"{self.user_profile.current_role} with {self.user_profile.years_experience} years",
+                job_requirements=job_posting.description,
+                matched_skills=base_analysis['skill_analysis']['matched_required'],
+                missing_skills=base_analysis['skill_analysis']['missing_required']
+            ),
+            # Narrative analysis
+            'fit_narrative': self.llm_analyzer.fit_narrative_request(
+                profile_summary=f"{self.user_profile.current_role} with {self.user_profile.years_experience} years experience",
+                job_summary=f"{job_posting.title} at {job_posting.company}",
+                match_percentage=base_analysis['match_score']['percentage']
+            ),
+            # Company research points
+            'company_research': self.llm_analyzer.company_brief_request(
+                company_name=job_posting.company,
+                industry="Tech"  # Could be extracted from job_posting
+            )
+        }
+    
+    def _enhance_with_llm(self, base_analysis: dict, job_posting: JobPosting, budget: float = None) -> dict:
+        """Add LLM-generated content to base analysis, running independent calls concurrently"""
+        decisions = {}
+        base_analysis['llm_enhanced'] = self._merge_enhancements(self.llm_analyzer.run_many(
+            self._enhancement_requests(base_analysis, job_posting), timeout=budget, decisions=decisions
+        ))
+        base_analysis['llm_decisions'] = decisions
+        return base_analysis
+    
+    def stream_job_analysis(self, job_posting: JobPosting, include_llm: bool = True,
+                            latency_budget: float = None):
+        """
+        Analysis for streaming clients: rule-based result first, LLM sections as they generate
+        
+        latency_budget works as in analyze_job_posting: sections not expected
+        to finish in it are skipped, and ones still running when it ends are
+        cut off, both with their fallback value.
+        
+        Yields:
+            ("analysis", base_analysis) straight away, then for each LLM section
+            ("delta", {"section", "text"}) chunks and one ("section", {"section",
+            "value"}) with its final (possibly fallback) value, then ("done", {})
+        """
+        base_analysis = super().analyze_job_posting(job_posting)
+        yield 'analysis', base_analysis
+        
+        if include_llm and self.llm_available:
+            requests = self._enhancement_requests(base_analysis, job_posting)
+            budget = self.llm_deadline if latency_budget is None else latency_budget
+            for name, kind, value in self.llm_analyzer.stream_many(requests, timeout=budget):
+                yield from self._stream_events(name, kind, value)
+        
+        yield 'done', {}
+    
+    async def stream_job_analysis_async(self, job_posting: JobPosting, include_llm: bool = True,
+                                        latency_budget: float = None):
+        """Async counterpart of stream_job_analysis, yielding the same events"""
+        base_analysis = super().analyze_job_posting(job_posting)
+        yield 'analysis', base_analysis
+        
+        if include_llm and self.llm_available:
+            requests = self._enhancement_requests(base_analysis, job_posting)
+            budget = self.llm_deadline if latency_budget is None else latency_budget
+            async for name, kind, value in self.llm_analyzer.stream_many_async(requests, timeout=budget):
+                for event in self._stream_events(name, kind, value):
+                    yield event
+        
+        yield 'done', {}
+    
+    def _stream_events(self, name: str, kind: str, value) -> list:
+        """Client events for one stream_many item"""
+        if kind == 'delta':
+            return [('delta', {'section': name, 'text': value})]
+        return [('section', {'section': section, 'value': section_value})
+                for section, section_value in self._merge_enhancements({name: value}).items()]
+    
+    @staticmethod
+    def _merge_enhancements(results: dict) -> dict:
+        """Flatten an application package result into the llm_enhanced fields"""
+        return results.pop('application_package', None) or results
+    
     def get_learning_roadmap(self, job_posting: JobPosting) -> dict:
         """
         Generate learning roadmap for missing skills using LLM
@@ -99,10 +247,7 @@ class EnhancedLinkedInAgent(LinkedInAgent):
         Returns:
             Learning roadmap
         """
-        from linkedin_agent import JobMatcher
-        
-        matcher = JobMatcher(self.user_profile)
-        skills = matcher.match_skills(job_posting)
+        skills = self._get_matcher().match_skills(job_posting)
         
         roadmap = self.llm_analyzer.generate_learning_roadmap(
             missing_skills=skills['missing_required'],
@@ -0,0 +1,183 @@
+"""
+Background LLM Enrichment - return rule-based results now, LLM sections later
+Enrichment jobs run on a worker pool; clients poll or wait on them by ID
+"""
+
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+
+@dataclass
+class EnrichmentJob:
+    """State of one background enrichment"""
+    id: str
+    status: str = "pending"  # pending, done or failed
+    llm_enhanced: Optional[Dict[str, Any]] = None
+    llm_decisions: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    completed_at: Optional[float] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+    # Futures of coroutines in wait_async, resolved on their own loops when the job finishes
+    _waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = field(default_factory=list, repr=False)
+    _waiters_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly view for API responses"""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "llm_enhanced": self.llm_enhanced,
+            "llm_decisions": self.llm_decisions,
+            "error": self.error,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at
+        }
+
+    def set_done(self):
+        """Mark the job finished and wake its waiters, threads and coroutines alike"""
+        with self._waiters_lock:
+            self.done.set()
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future)
+
+    async def wait_async(self, timeout: Optional[float] = None) -> bool:
+        """Await the job finishing without holding a thread; False if timeout passed first"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._waiters_lock:
+            if self.done.is_set():
+                return True
+            self._waiters.append((loop, future))
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._waiters_lock:
+                if (loop, future) in self._waiters:
+                    self._waiters.remove((loop, future))
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class BackgroundEnricher:
+    """Runs enrichment functions on a thread pool and keeps their results for a while"""
+
+    def __init__(self, max_workers: int = 4, ttl: float = 600.0):
+        """
+        Args:
+            max_workers: Enrichments running at once
+            ttl: Seconds a finished job's result stays retrievable
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-enrichment")
+        self.ttl = ttl
+        self._jobs: Dict[str, EnrichmentJob] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+
+    def submit(self, enrich: Callable[[], Dict[str, Any]]) -> EnrichmentJob:
+        """
+        Queue an enrichment and return its pending job
+
+        Args:
+            enrich: Returns {'llm_enhanced': ..., 'llm_decisions': ...}
+        """
+        job = self._new_job()
+        self.executor.submit(self._run, job, enrich)
+        return job
+
+    def submit_async(self, enrich: Callable[[], Awaitable[Dict[str, Any]]]) -> EnrichmentJob:
+        """
+        Like submit, but for a coroutine function run as a task on the
+        current event loop, so no worker thread waits on the LLM
+        """
+        job = self._new_job()
+        task = asyncio.ensure_future(self._run_async(job, enrich))
+        self._tasks.add(task)  # The loop only keeps weak references to tasks
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def _new_job(self) -> EnrichmentJob:
+        job = EnrichmentJob(id=uuid.uuid4().hex)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        return job
+
+    def _run(self, job: EnrichmentJob, enrich: Callable[[], Dict[str, Any]]):
+        try:
+            self._finish(job, enrich())
+        except Exception as e:
+            self._finish(job, error=e)
+
+    async def _run_async(self, job: EnrichmentJob, enrich: Callable[[], Awaitable[Dict[str, Any]]]):
+        try:
+            self._finish(job, await enrich())
+        except Exception as e:
+            self._finish(job, error=e)
+
+    @staticmethod
+    def _finish(job: EnrichmentJob, result: Optional[Dict[str, Any]] = None, error: Optional[Exception] = None):
+        if error is None:
+            job.llm_enhanced = result['llm_enhanced']
+            job.llm_decisions = result.get('llm_decisions')
+            job.status = "done"
+        else:
+            job.error = str(error)
+            job.status = "failed"
+        job.completed_at = time.time()
+        job.set_done()
+
+    def _prune(self):
+        """Forget finished jobs older than the TTL (caller holds the lock)"""
+        cutoff = time.time() - self.ttl
+        expired = [job_id for job_id, job in self._jobs.items() if job.completed_at and job.completed_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[EnrichmentJob]:
+        """Current state of a job, or None if unknown or expired"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[EnrichmentJob]:
+        """Block until a job finishes or timeout passes, then return its state"""
+        job = self.get(job_id)
+        if job is not None:
+            job.done.wait(timeout)
+        return job
+
+    async def wait_async(self, job_id: str, timeout: Optional[float] = None) -> Optional[EnrichmentJob]:
+        """Like wait, but awaits the job instead of blocking a thread"""
+        job = self.get(job_id)
+        if job is not None:
+            await job.wait_async(timeout)
+        return job
+
+    def shutdown(self):
+        """Finish queued enrichments and stop the pool"""
+        self.executor.shutdown()
+
+
+_default_enricher: Optional[BackgroundEnricher] = None
+_default_enricher_lock = threading.Lock()
+
+
+def get_enricher() -> BackgroundEnricher:
+    """Process-wide enricher shared by agents and the web API"""
+    global _default_enricher
+    with _default_enricher_lock:
+        if _default_enricher is None:
+            _default_enricher = BackgroundEnricher()
+        return _default_enricher
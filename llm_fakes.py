@@ -0,0 +1,313 @@
+"""
+Fake LLM Provider for offline tests and benchmarks
+Deterministic responses with configurable latency, errors and response size -
+as an in-process provider or an OpenAI-compatible local HTTP server
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from llm_integration import Completion, LLMProvider, LLMProviderError
+from llm_metrics import estimate_tokens
+
+
+class FakeLLMProvider(LLMProvider):
+    """Local provider that answers every prompt after a simulated delay"""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        model: str = "fake-model",
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        response_chars: Optional[int] = None,
+        seed: int = 0
+    ):
+        """
+        Initialize fake provider
+
+        Args:
+            latency: Median seconds each call takes
+            model: Model name reported to caches and metrics
+            jitter: Log-normal sigma of the latency (0 = every call takes
+                exactly latency; 0.5 gives a p99 around 3x the median)
+            error_rate: Fraction of calls that fail with LLMProviderError
+            error_status: HTTP status carried by injected failures (e.g. 429, 503)
+            response_chars: Pad responses to this many characters
+            seed: Seed for the latency and error sequence
+        """
+        self.latency = latency
+        self.model = model
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.response_chars = response_chars
+        self.calls = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        return True
+
+    def _next_call(self) -> Tuple[float, bool]:
+        """Draw the next call's delay and whether it fails"""
+        with self._lock:
+            self.calls += 1
+            delay = self.latency
+            if self.jitter and delay:
+                delay *= self._random.lognormvariate(0.0, self.jitter)
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+            return delay, failed
+
+    def _respond(self, prompt: str, failed: bool) -> str:
+        if failed:
+            raise LLMProviderError(f"Injected fake error (HTTP {self.error_status})", self.error_status)
+        text = f"Fake response to a {len(prompt)}-character prompt"
+        if self.response_chars and len(text) < self.response_chars:
+            filler = " lorem ipsum dolor sit amet"
+            text += (filler * (self.response_chars // len(filler) + 1))[:self.response_chars - len(text)]
+        return text
+
+    def generate_text(self, prompt: str, temperature: float = 0.7) -> str:
+        delay, failed = self._next_call()
+        time.sleep(delay)
+        return self._respond(prompt, failed)
+
+    async def generate_text_async(self, prompt: str, temperature: float = 0.7) -> str:
+        delay, failed = self._next_call()
+        await asyncio.sleep(delay)
+        return self._respond(prompt, failed)
+
+    def complete(self, prompt: str, temperature: float = 0.7) -> Completion:
+        """Response with estimated usage, as the stub server reports it"""
+        text = self.generate_text(prompt, temperature)
+        return Completion(text, estimate_tokens(prompt), estimate_tokens(text))
+
+    async def complete_async(self, prompt: str, temperature: float = 0.7) -> Completion:
+        text = await self.generate_text_async(prompt, temperature)
+        return Completion(text, estimate_tokens(prompt), estimate_tokens(text))
+
+    def _chunks(self, prompt: str, failed: bool) -> List[str]:
+        """Split the response into word-sized stream chunks (fails before the first)"""
+        text = self._respond(prompt, failed)
+        words = text.split(" ")
+        return [word + " " for word in words[:-1]] + [words[-1]]
+
+    def stream_text(self, prompt: str, temperature: float = 0.7) -> Iterator[str]:
+        """Stream the response word by word, spreading the latency across chunks"""
+        delay, failed = self._next_call()
+        chunks = self._chunks(prompt, failed)
+        for chunk in chunks:
+            time.sleep(delay / len(chunks))
+            yield chunk
+
+    async def stream_text_async(self, prompt: str, temperature: float = 0.7) -> AsyncIterator[str]:
+        delay, failed = self._next_call()
+        chunks = self._chunks(prompt, failed)
+        for chunk in chunks:
+            await asyncio.sleep(delay / len(chunks))
+            yield chunk
+
+
+class _ChatCompletionsHandler(BaseHTTPRequestHandler):
+    """Serves POST /v1/chat/completions from the server's FakeLLMProvider"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without this, delayed ACKs add ~40 ms per response
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        if self.path.rstrip("/") not in ("/v1/chat/completions", "/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+            prompt = body["messages"][-1]["content"]
+        except (ValueError, KeyError, IndexError, TypeError):
+            self._send_json(400, {"error": {"message": "Malformed chat completion request", "type": "invalid_request_error"}})
+            return
+
+        provider: FakeLLMProvider = self.server.provider
+        try:
+            if body.get("stream"):
+                self._stream_completion(provider, prompt, body)
+                return
+            text = provider.generate_text(prompt, temperature=body.get("temperature", 0.7))
+        except LLMProviderError as e:
+            error_type = "rate_limit_error" if e.status_code == 429 else "server_error"
+            self._send_json(e.status_code or 500, {"error": {"message": str(e), "type": error_type}})
+            return
+
+        prompt_tokens = sum(estimate_tokens(str(m.get("content", ""))) for m in body["messages"])
+        completion_tokens = estimate_tokens(text)
+        self._send_json(200, {
+            "id": f"chatcmpl-fake-{provider.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model") or provider.model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+    def _stream_completion(self, provider: FakeLLMProvider, prompt: str, body: Dict[str, Any]):
+        """Send chat.completion.chunk events over SSE with chunked transfer encoding"""
+        chunks = provider.stream_text(prompt, temperature=body.get("temperature", 0.7))
+        first = next(chunks)  # Injected errors surface here, before any headers are sent
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        completion_id = f"chatcmpl-fake-{provider.calls}"
+        model = body.get("model") or provider.model
+        try:
+            for content in itertools.chain([first], chunks):
+                self._write_chunk("data: " + json.dumps({
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}]
+                }) + "\n\n")
+            self._write_chunk("data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client gave up mid-stream (e.g. its deadline passed)
+            self.close_connection = True
+
+    def _write_chunk(self, text: str):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeOpenAIServer:
+    """
+    Local OpenAI-compatible chat-completions server backed by a FakeLLMProvider
+
+    Point OpenAIProvider (or OPENAI_BASE_URL) at base_url to run the real
+    client code path offline:
+
+        with FakeOpenAIServer(FakeLLMProvider(latency=0.3, error_rate=0.05)) as server:
+            provider = OpenAIProvider(api_key="fake", base_url=server.base_url)
+    """
+
+    def __init__(self, provider: Optional[FakeLLMProvider] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Bind the server (port 0 picks a free port)
+
+        Args:
+            provider: Latency/error/size behaviour (default: instant responses)
+            host: Interface to listen on
+            port: Port to listen on
+        """
+        self.provider = provider or FakeLLMProvider()
+        self.httpd = ThreadingHTTPServer((host, port), _ChatCompletionsHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.provider = self.provider
+        self.httpd.connections = 0
+        self.httpd.lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def connections(self) -> int:
+        """TCP connections accepted so far (keep-alive reuse keeps this low)"""
+        return self.httpd.connections
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        """Serve requests on a background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self):
+        """Stop serving and release the port"""
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread = None
+        self.httpd.server_close()
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run an OpenAI-compatible fake LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.3, help="Median seconds per completion")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Log-normal latency sigma")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--response-chars", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(
+        FakeLLMProvider(
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            error_status=args.error_status,
+            response_chars=args.response_chars,
+            seed=args.seed
+        ),
+        host=args.host,
+        port=args.port
+    )
+    print(f"Fake OpenAI server on {server.base_url} (set OPENAI_BASE_URL to this)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
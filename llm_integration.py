@@ -3,19 +3,147 @@ LLM Integration Module - adds real AI capabilities to LinkedIn Agent
 Supports OpenAI and can be extended to other providers
 """
 
+import asyncio
+import json
 import os
-from typing import Optional, List, Dict
+import queue
+import re
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Coroutine, Iterator, Optional, List, Dict, Tuple
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from llm_cache import LLMResponseCache, SingleFlight
+from llm_budget import LatencyTracker, LoadShedError, get_latency_tracker
+from llm_metrics import MetricsRegistry, estimate_tokens, get_metrics_registry
 
 
 # Try to import OpenAI - if not installed, provide helpful error
 try:
-    from openai import OpenAI
+    import httpx
+    from openai import OpenAI, AsyncOpenAI, DEFAULT_TIMEOUT
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
 
 
+# Coalesces identical in-flight prompts across all analyzers in the process
+_shared_in_flight = SingleFlight()
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def run_coroutine(coro: Coroutine) -> Any:
+    """
+    Run a coroutine from synchronous code and wait for its result
+    
+    Uses one long-lived background event loop so async clients (and their
+    connection pools) are always used from the same loop.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """The long-lived event loop used by run_coroutine, started on first use"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm-event-loop", daemon=True).start()
+    return _loop
+
+
+def iterate_async(agen: AsyncIterator[Any]) -> Iterator[Any]:
+    """
+    Consume an async iterator from synchronous code
+    
+    Items are produced on the background loop and handed over through a
+    queue as they arrive. Closing the returned generator early cancels the
+    producer.
+    """
+    items: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+    
+    async def pump():
+        try:
+            async for item in agen:
+                items.put(("item", item))
+        except Exception as e:
+            items.put(("error", e))
+            return
+        items.put(("done", None))
+    
+    future = asyncio.run_coroutine_threadsafe(pump(), _background_loop())
+    try:
+        while True:
+            kind, value = items.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            yield value
+    finally:
+        future.cancel()
+
+
+async def run_coroutine_async(coro: Coroutine) -> Any:
+    """
+    Await a coroutine on the background loop from another event loop
+    
+    For async servers: the shared providers' async clients stay on the
+    background loop, and the caller's loop is free while the call runs.
+    Cancelling the caller cancels the coroutine.
+    """
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, _background_loop()))
+
+
+async def relay_async(agen: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    """Async counterpart of iterate_async: consume the background loop's iterator from another loop"""
+    loop = asyncio.get_running_loop()
+    items: "asyncio.Queue[Tuple[str, Any]]" = asyncio.Queue()
+    
+    def put(item: Tuple[str, Any]):
+        loop.call_soon_threadsafe(items.put_nowait, item)
+    
+    async def pump():
+        try:
+            async for item in agen:
+                put(("item", item))
+        except Exception as e:
+            put(("error", e))
+            return
+        put(("done", None))
+    
+    future = asyncio.run_coroutine_threadsafe(pump(), _background_loop())
+    try:
+        while True:
+            kind, value = await items.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            yield value
+    finally:
+        future.cancel()
+
+
+class LLMProviderError(RuntimeError):
+    """Provider call failure, with the HTTP status when the API returned one"""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class Completion:
+    """Generated text with the token usage the provider reported (None if not reported)"""
+    text: str
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+
+
 class LLMProvider(ABC):
     """Abstract base class for LLM providers"""
     
@@ -28,65 +156,551 @@ class LLMProvider(ABC):
     def is_available(self) -> bool:
         """Check if provider is available and configured"""
         pass
+    
+    @property
+    def name(self) -> str:
+        """Provider name used in cache keys (wrappers report the wrapped provider's)"""
+        return type(self).__name__
+    
+    async def generate_text_async(self, prompt: str, temperature: float = 0.7) -> str:
+        """Generate text without blocking the event loop (default: run generate_text in a thread)"""
+        return await asyncio.to_thread(self.generate_text, prompt, temperature)
+    
+    def complete(self, prompt: str, temperature: float = 0.7) -> Completion:
+        """Generate text along with token usage (default: usage not reported)"""
+        return Completion(self.generate_text(prompt, temperature=temperature))
+    
+    async def complete_async(self, prompt: str, temperature: float = 0.7) -> Completion:
+        """Async counterpart of complete"""
+        return Completion(await self.generate_text_async(prompt, temperature=temperature))
+    
+    def stream_text(self, prompt: str, temperature: float = 0.7) -> Iterator[str]:
+        """Yield the response in chunks as it is generated (default: one chunk)"""
+        yield self.generate_text(prompt, temperature=temperature)
+    
+    async def stream_text_async(self, prompt: str, temperature: float = 0.7) -> AsyncIterator[str]:
+        """Async counterpart of stream_text (default: one chunk)"""
+        yield await self.generate_text_async(prompt, temperature=temperature)
 
 
 class OpenAIProvider(LLMProvider):
     """OpenAI LLM Provider"""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini",
+                 base_url: Optional[str] = None, max_retries: int = 2,
+                 pool_size: Optional[int] = None, keepalive_expiry: float = 30.0):
         """
         Initialize OpenAI provider
         
         Args:
             api_key: OpenAI API key (if None, uses OPENAI_API_KEY env var)
             model: Model to use (default: gpt-4o-mini for cost-effectiveness)
+            base_url: OpenAI-compatible endpoint (if None, uses OPENAI_BASE_URL
+                env var or the public API), e.g. llm_fakes.FakeOpenAIServer
+            max_retries: Retries done by the OpenAI client itself (0 when
+                wrapped in llm_resilience.ResilientProvider)
+            pool_size: Max HTTP connections, all kept alive between calls
+                (None = the OpenAI client's own pool of 100/20 keep-alive)
+            keepalive_expiry: Seconds an idle pooled connection stays open
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.model = model
+        self.base_url = base_url or os.getenv("OPENAI_BASE_URL")
         self.client = None
+        self.async_client = None
         
         if self.api_key and OPENAI_AVAILABLE:
-            self.client = OpenAI(api_key=self.api_key)
+            http_client = async_http_client = None
+            if pool_size:
+                limits = httpx.Limits(
+                    max_connections=pool_size,
+                    max_keepalive_connections=pool_size,
+                    keepalive_expiry=keepalive_expiry
+                )
+                http_client = httpx.Client(limits=limits, timeout=DEFAULT_TIMEOUT)
+                async_http_client = httpx.AsyncClient(limits=limits, timeout=DEFAULT_TIMEOUT)
+            
+            self.client = OpenAI(api_key=self.api_key, base_url=self.base_url,
+                                 max_retries=max_retries, http_client=http_client)
+            self.async_client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url,
+                                            max_retries=max_retries, http_client=async_http_client)
     
     def is_available(self) -> bool:
         """Check if OpenAI is available and configured"""
         return OPENAI_AVAILABLE and self.client is not None
     
-    def generate_text(self, prompt: str, temperature: float = 0.7) -> str:
-        """Generate text using OpenAI API"""
+    def _check_available(self):
         if not self.is_available():
             raise RuntimeError(
                 "OpenAI not available. Install with: pip install openai\n"
                 "Then set OPENAI_API_KEY environment variable"
             )
+    
+    def _request_args(self, prompt: str, temperature: float) -> Dict[str, Any]:
+        """Chat-completions arguments shared by the sync and async paths"""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": "You are a helpful career advisor."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": temperature,
+            "max_tokens": 1000
+        }
+    
+    def generate_text(self, prompt: str, temperature: float = 0.7) -> str:
+        """Generate text using OpenAI API"""
+        return self.complete(prompt, temperature).text
+    
+    async def generate_text_async(self, prompt: str, temperature: float = 0.7) -> str:
+        """Generate text using the AsyncOpenAI client"""
+        return (await self.complete_async(prompt, temperature)).text
+    
+    @staticmethod
+    def _completion(response) -> Completion:
+        """Completion with the usage block of a chat-completions response"""
+        usage = response.usage
+        return Completion(
+            response.choices[0].message.content,
+            usage.prompt_tokens if usage else None,
+            usage.completion_tokens if usage else None
+        )
+    
+    def complete(self, prompt: str, temperature: float = 0.7) -> Completion:
+        """Generate text and its reported token usage"""
+        self._check_available()
+        
+        try:
+            return self._completion(self.client.chat.completions.create(**self._request_args(prompt, temperature)))
+        except Exception as e:
+            raise LLMProviderError(f"OpenAI API error: {e}", getattr(e, "status_code", None))
+    
+    async def complete_async(self, prompt: str, temperature: float = 0.7) -> Completion:
+        """Async counterpart of complete"""
+        self._check_available()
+        
+        try:
+            return self._completion(
+                await self.async_client.chat.completions.create(**self._request_args(prompt, temperature))
+            )
+        except Exception as e:
+            raise LLMProviderError(f"OpenAI API error: {e}", getattr(e, "status_code", None))
+    
+    def stream_text(self, prompt: str, temperature: float = 0.7) -> Iterator[str]:
+        """Stream content deltas using the chat-completions stream=True mode"""
+        self._check_available()
+        
+        try:
+            for chunk in self.client.chat.completions.create(**self._request_args(prompt, temperature), stream=True):
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise LLMProviderError(f"OpenAI API error: {e}", getattr(e, "status_code", None))
+    
+    async def stream_text_async(self, prompt: str, temperature: float = 0.7) -> AsyncIterator[str]:
+        """Async counterpart of stream_text"""
+        self._check_available()
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful career advisor."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=temperature,
-                max_tokens=1000
+            stream = await self.async_client.chat.completions.create(
+                **self._request_args(prompt, temperature), stream=True
             )
-            return response.choices[0].message.content
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
         except Exception as e:
-            raise RuntimeError(f"OpenAI API error: {e}")
+            raise LLMProviderError(f"OpenAI API error: {e}", getattr(e, "status_code", None))
+
+
+@dataclass
+class LLMRequest:
+    """One LLM-backed section: prompt, response parser and rule-based fallback"""
+    method: str
+    prompt: str
+    temperature: float
+    fallback: Callable[[], Any]
+    parse: Callable[[str], Any] = str
+
+
+# Field types of the structured application package response
+APPLICATION_PACKAGE_SCHEMA = {
+    "personalized_cover_letter": str,
+    "ai_interview_points": list,
+    "fit_narrative": str,
+    "company_research": str
+}
 
 
 class LLMEnhancedAnalyzer:
     """Enhances job analysis with LLM capabilities"""
     
-    def __init__(self, llm_provider: Optional[LLMProvider] = None):
+    def __init__(self, llm_provider: Optional[LLMProvider] = None,
+                 cache: Optional[LLMResponseCache] = None,
+                 structured_output: bool = False,
+                 in_flight: Optional[SingleFlight] = None,
+                 max_in_flight: Optional[int] = None,
+                 latency_tracker: Optional[LatencyTracker] = None,
+                 metrics: Optional[MetricsRegistry] = None):
         """
         Initialize with LLM provider
         
         Args:
             llm_provider: LLM provider (default: None for rule-based only)
+            cache: Response cache for byte-identical prompts (default: no caching)
+            structured_output: Request the enhancement sections as one JSON
+                object (see application_package_request) instead of one
+                prompt per section
+            in_flight: Single-flight group coalescing identical concurrent
+                prompts (default: one shared by every analyzer in the process)
+            max_in_flight: Skip calls (fallback) while this many provider calls
+                are already running (default: no limit)
+            latency_tracker: Recent latency and load used for skip decisions
+                (default: shared per provider and model)
+            metrics: Registry for per-method latency, tokens, cost, fallback
+                and cache metrics (default: the process-wide registry)
         """
         self.llm = llm_provider
         self.llm_available = llm_provider and llm_provider.is_available()
+        self.cache = cache
+        self.structured_output = structured_output
+        self.in_flight = in_flight or _shared_in_flight
+        self.max_in_flight = max_in_flight
+        self.metrics = metrics or get_metrics_registry()
+        self.latency = latency_tracker or get_latency_tracker(
+            llm_provider.name if llm_provider else "", getattr(llm_provider, "model", "")
+        )
+    
+    def _cache_key(self, prompt: str, temperature: float) -> str:
+        """Cache key identifying this provider, model, temperature and prompt"""
+        return LLMResponseCache.make_key(
+            self.llm.name, getattr(self.llm, "model", ""), temperature, prompt
+        )
+    
+    def _shed_reason(self, deadline: Optional[float]) -> Optional[str]:
+        """Why a provider call should be skipped now, or None to make it"""
+        if self.max_in_flight is not None and self.latency.in_flight >= self.max_in_flight:
+            return "queue_full"
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return "budget_exhausted"
+            p95 = self.latency.percentile(95)
+            if p95 is not None and p95 > remaining and not self.latency.take_probe():
+                return "p95_over_budget"
+        return None
+    
+    def _record_call(self, method: str, prompt: str, started: float, completion: Optional[Completion]):
+        """Record one provider call's latency, token usage and cost (completion None = failed)"""
+        seconds = time.monotonic() - started
+        model = getattr(self.llm, "model", "")
+        if completion is None:
+            self.metrics.record_call(method, model, seconds, error=True)
+            return
+        self.metrics.record_call(
+            method, model, seconds,
+            completion.prompt_tokens if completion.prompt_tokens is not None else estimate_tokens(prompt),
+            completion.completion_tokens if completion.completion_tokens is not None else estimate_tokens(completion.text)
+        )
+    
+    def _generate(self, method: str, prompt: str, temperature: float,
+                  deadline: Optional[float] = None) -> str:
+        """
+        Call the LLM provider, serving repeated prompts from the cache
+        
+        Concurrent calls for the same cache key (from any analyzer in the
+        process) share one provider call through the single-flight group.
+        On a cache miss the call is skipped with LoadShedError if it is not
+        expected to finish before deadline (a time.monotonic() value) or
+        too many calls are already in flight.
+        """
+        key = self._cache_key(prompt, temperature)
+        if self.cache is not None:
+            cached = self.cache.get(method, key)
+            self.metrics.record_cache(method, cached is not None)
+            if cached is not None:
+                return cached
+        
+        reason = self._shed_reason(deadline)
+        if reason:
+            raise LoadShedError(reason)
+        
+        def call_provider() -> str:
+            self.latency.start()
+            started = time.monotonic()
+            elapsed = None
+            try:
+                completion = self.llm.complete(prompt, temperature=temperature)
+                elapsed = time.monotonic() - started
+            finally:
+                self.latency.finish(elapsed)
+                self._record_call(method, prompt, started, completion if elapsed is not None else None)
+            if self.cache is not None:
+                self.cache.set(method, key, completion.text)
+            return completion.text
+        
+        return self.in_flight.do(key, call_provider)
+    
+    async def _generate_async(self, method: str, prompt: str, temperature: float,
+                              deadline: Optional[float] = None) -> str:
+        """Async counterpart of _generate"""
+        key = self._cache_key(prompt, temperature)
+        if self.cache is not None:
+            cached = self.cache.get(method, key)
+            self.metrics.record_cache(method, cached is not None)
+            if cached is not None:
+                return cached
+        
+        reason = self._shed_reason(deadline)
+        if reason:
+            raise LoadShedError(reason)
+        
+        async def call_provider() -> str:
+            self.latency.start()
+            started = time.monotonic()
+            elapsed = None
+            try:
+                completion = await self.llm.complete_async(prompt, temperature=temperature)
+                elapsed = time.monotonic() - started
+            finally:
+                self.latency.finish(elapsed)
+                self._record_call(method, prompt, started, completion if elapsed is not None else None)
+            if self.cache is not None:
+                self.cache.set(method, key, completion.text)
+            return completion.text
+        
+        return await self.in_flight.do_async(key, call_provider)
+    
+    def _run(self, request: LLMRequest, deadline: Optional[float]) -> Tuple[Any, Dict[str, Any]]:
+        """Run one request, returning its result and the decision that produced it"""
+        result, decision = self._serve(request, deadline)
+        self.metrics.record_outcome(request.method, decision)
+        return result, decision
+    
+    def _serve(self, request: LLMRequest, deadline: Optional[float]) -> Tuple[Any, Dict[str, Any]]:
+        """Body of _run, before the outcome is recorded"""
+        if not self.llm_available:
+            return request.fallback(), {"source": "fallback", "reason": "llm_unavailable"}
+        
+        try:
+            response = self._generate(request.method, request.prompt, request.temperature, deadline)
+            return request.parse(response), {"source": "llm"}
+        except LoadShedError as e:
+            return request.fallback(), {"source": "fallback", "reason": e.reason}
+        except Exception as e:
+            print(f"LLM error: {e}. Using fallback.")
+            return request.fallback(), {"source": "fallback", "reason": "error"}
+    
+    async def _run_async(self, request: LLMRequest, deadline: Optional[float]) -> Tuple[Any, Dict[str, Any]]:
+        """Async counterpart of _run"""
+        result, decision = await self._serve_async(request, deadline)
+        self.metrics.record_outcome(request.method, decision)
+        return result, decision
+    
+    async def _serve_async(self, request: LLMRequest,
+                           deadline: Optional[float]) -> Tuple[Any, Dict[str, Any]]:
+        """Body of _run_async, before the outcome is recorded"""
+        if not self.llm_available:
+            return request.fallback(), {"source": "fallback", "reason": "llm_unavailable"}
+        
+        try:
+            response = await self._generate_async(request.method, request.prompt, request.temperature, deadline)
+            return request.parse(response), {"source": "llm"}
+        except LoadShedError as e:
+            return request.fallback(), {"source": "fallback", "reason": e.reason}
+        except Exception as e:
+            print(f"LLM error: {e}. Using fallback.")
+            return request.fallback(), {"source": "fallback", "reason": "error"}
+    
+    def run(self, request: LLMRequest, budget: Optional[float] = None) -> Any:
+        """
+        Run one request, falling back to the rule-based result on any error
+        
+        Args:
+            request: Request to run
+            budget: Seconds this call may take; it is skipped (fallback) when
+                recent p95 latency says it would not finish in time
+        """
+        deadline = None if budget is None else time.monotonic() + budget
+        return self._run(request, deadline)[0]
+    
+    async def run_async(self, request: LLMRequest, budget: Optional[float] = None) -> Any:
+        """Async counterpart of run"""
+        deadline = None if budget is None else time.monotonic() + budget
+        return (await self._run_async(request, deadline))[0]
+    
+    async def run_many_async(self, requests: Dict[str, LLMRequest],
+                             timeout: Optional[float] = None,
+                             decisions: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Run independent requests concurrently under one shared deadline
+        
+        Args:
+            requests: Requests keyed by result name
+            timeout: Latency budget in seconds for all requests together;
+                calls not expected to finish in it are skipped, and ones
+                still running when it ends are cancelled - both use their
+                fallback
+            decisions: If given, filled with each request's decision:
+                {"source": "llm"} or {"source": "fallback", "reason": ...}
+                with reason llm_unavailable, queue_full, budget_exhausted,
+                p95_over_budget, error or timeout
+        
+        Returns:
+            Results keyed like requests
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        tasks = {
+            name: asyncio.ensure_future(self._run_async(request, deadline))
+            for name, request in requests.items()
+        }
+        if tasks:
+            _, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+            for task in pending:
+                task.cancel()
+        
+        results = {}
+        for name, task in tasks.items():
+            if task.done() and not task.cancelled():
+                results[name], decision = task.result()
+            else:
+                results[name], decision = requests[name].fallback(), {"source": "fallback", "reason": "timeout"}
+                self.metrics.record_outcome(requests[name].method, decision)
+            if decisions is not None:
+                decisions[name] = decision
+        return results
+    
+    def run_many(self, requests: Dict[str, LLMRequest], timeout: Optional[float] = None,
+                 decisions: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Synchronous wrapper around run_many_async"""
+        return run_coroutine(self.run_many_async(requests, timeout, decisions))
+    
+    async def stream_async(self, request: LLMRequest,
+                           deadline: Optional[float] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Run one request, yielding text as the provider streams it
+        
+        Yields ("delta", text) chunks, then exactly one ("result", value)
+        with the parsed response - or the fallback if the provider failed,
+        in which case any deltas already sent should be discarded.
+        
+        Goes through the same cache, load shedding (against deadline, a
+        time.monotonic() value), latency tracking and single-flight group as
+        _generate_async. A stream that joins an identical call already in
+        flight gets its whole text as one delta when that call finishes.
+        """
+        if not self.llm_available:
+            self.metrics.record_outcome(request.method, {"source": "fallback", "reason": "llm_unavailable"})
+            yield "result", request.fallback()
+            return
+        
+        key = self._cache_key(request.prompt, request.temperature)
+        response = None
+        if self.cache is not None:
+            response = self.cache.get(request.method, key)
+            self.metrics.record_cache(request.method, response is not None)
+        reason = None if response is not None else self._shed_reason(deadline)
+        if reason:
+            self.metrics.record_outcome(request.method, {"source": "fallback", "reason": reason})
+            yield "result", request.fallback()
+            return
+        
+        deltas: "asyncio.Queue[str]" = asyncio.Queue()
+        
+        async def call_provider() -> str:
+            # Runs only if this stream leads the flight; its chunks reach the stream through deltas
+            self.latency.start()
+            started = time.monotonic()
+            elapsed = None
+            chunks = []
+            try:
+                async for chunk in self.llm.stream_text_async(request.prompt, temperature=request.temperature):
+                    chunks.append(chunk)
+                    deltas.put_nowait(chunk)
+                elapsed = time.monotonic() - started
+            finally:
+                self.latency.finish(elapsed)
+                self._record_call(request.method, request.prompt, started,
+                                  Completion("".join(chunks)) if elapsed is not None else None)
+            text = "".join(chunks)
+            if self.cache is not None:
+                self.cache.set(request.method, key, text)
+            return text
+        
+        try:
+            if response is None:
+                flight = self.in_flight.join_async(key, call_provider)
+                streamed = False
+                try:
+                    while not flight.done() or not deltas.empty():
+                        if deltas.empty():
+                            next_delta = asyncio.ensure_future(deltas.get())
+                            await asyncio.wait({flight, next_delta}, return_when=asyncio.FIRST_COMPLETED)
+                            if not next_delta.done():
+                                next_delta.cancel()
+                                continue
+                            chunk = next_delta.result()
+                        else:
+                            chunk = deltas.get_nowait()
+                        streamed = True
+                        yield "delta", chunk
+                    response = flight.result()
+                finally:
+                    flight.cancel()  # Only stops this stream's wait, not the shared call
+                if not streamed:
+                    yield "delta", response
+            else:
+                yield "delta", response
+            result, decision = request.parse(response), {"source": "llm"}
+        except Exception as e:
+            print(f"LLM error: {e}. Using fallback.")
+            result, decision = request.fallback(), {"source": "fallback", "reason": "error"}
+        self.metrics.record_outcome(request.method, decision)
+        yield "result", result
+    
+    async def stream_many_async(self, requests: Dict[str, LLMRequest],
+                                timeout: Optional[float] = None) -> AsyncIterator[Tuple[str, str, Any]]:
+        """
+        Stream independent requests concurrently under one shared deadline
+        
+        Yields (name, kind, value) events from all requests interleaved in
+        arrival order, with kind "delta" or "result" as in stream_async.
+        Requests unfinished at the deadline are cancelled and get a
+        "result" event with their fallback; ones recent latency says would
+        not finish in time are skipped (fallback) without a provider call.
+        """
+        events: "asyncio.Queue[Tuple[str, str, Any]]" = asyncio.Queue()
+        shed_deadline = None if timeout is None else time.monotonic() + timeout
+        
+        async def pump(name: str, request: LLMRequest):
+            async for kind, value in self.stream_async(request, shed_deadline):
+                await events.put((name, kind, value))
+        
+        tasks = {name: asyncio.ensure_future(pump(name, request)) for name, request in requests.items()}
+        deadline = None if timeout is None else asyncio.get_running_loop().time() + timeout
+        finished = set()
+        try:
+            while len(finished) < len(tasks):
+                remaining = None if deadline is None else deadline - asyncio.get_running_loop().time()
+                try:
+                    name, kind, value = await asyncio.wait_for(events.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if kind == "result":
+                    finished.add(name)
+                yield name, kind, value
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        
+        for name, request in requests.items():
+            if name not in finished:
+                self.metrics.record_outcome(request.method, {"source": "fallback", "reason": "timeout"})
+                yield name, "result", request.fallback()
+    
+    def stream_many(self, requests: Dict[str, LLMRequest],
+                    timeout: Optional[float] = None) -> Iterator[Tuple[str, str, Any]]:
+        """Synchronous wrapper around stream_many_async"""
+        return iterate_async(self.stream_many_async(requests, timeout))
     
     def generate_personalized_cover_letter(
         self, 
@@ -111,9 +725,18 @@ class LLMEnhancedAnalyzer:
         Returns:
             Generated cover letter opening paragraph
         """
-        if not self.llm_available:
-            return self._fallback_cover_letter(user_name, job_title, company)
-        
+        return self.run(self.cover_letter_request(user_name, current_role, job_title, company, strong_points, skills))
+    
+    def cover_letter_request(
+        self, 
+        user_name: str,
+        current_role: str,
+        job_title: str,
+        company: str,
+        strong_points: List[str],
+        skills: List[str]
+    ) -> LLMRequest:
+        """Build the personalized cover letter request"""
         prompt = f"""
 Write a compelling cover letter opening paragraph (2-3 sentences) for:
 - Candidate: {user_name} ({current_role})
@@ -124,11 +747,12 @@ Write a compelling cover letter opening paragraph (2-3 sentences) for:
 Make it personalized, confident, and specific to the role. Focus on what they can contribute.
 """
         
-        try:
-            return self.llm.generate_text(prompt, temperature=0.7)
-        except Exception as e:
-            print(f"LLM error: {e}. Using fallback.")
-            return self._fallback_cover_letter(user_name, job_title, company)
+        return LLMRequest(
+            method="generate_personalized_cover_letter",
+            prompt=prompt,
+            temperature=0.7,
+            fallback=lambda: self._fallback_cover_letter(user_name, job_title, company)
+        )
     
     def generate_interview_talking_points(
         self,
@@ -149,9 +773,16 @@ Make it personalized, confident, and specific to the role. Focus on what they ca
         Returns:
             List of talking points for interview
         """
-        if not self.llm_available:
-            return self._fallback_talking_points(matched_skills)
-        
+        return self.run(self.talking_points_request(user_background, job_requirements, matched_skills, missing_skills))
+    
+    def talking_points_request(
+        self,
+        user_background: str,
+        job_requirements: str,
+        matched_skills: List[str],
+        missing_skills: List[str]
+    ) -> LLMRequest:
+        """Build the interview talking points request"""
         prompt = f"""
 Generate 5 specific talking points for an interview for this job:
 
@@ -170,15 +801,16 @@ Provide interview talking points that:
 3. Show understanding of job requirements
 4. Are specific and memorable
 
-Format as: point 1 | point 2 | point 3 | etc.
+Format as a JSON array of strings, one talking point per string.
 """
         
-        try:
-            response = self.llm.generate_text(prompt, temperature=0.6)
-            return [p.strip() for p in response.split('|')[:5]]
-        except Exception as e:
-            print(f"LLM error: {e}. Using fallback.")
-            return self._fallback_talking_points(matched_skills)
+        return LLMRequest(
+            method="generate_interview_talking_points",
+            prompt=prompt,
+            temperature=0.6,
+            parse=lambda response: self._parse_list(response, limit=5, separator='|'),
+            fallback=lambda: self._fallback_talking_points(matched_skills)
+        )
     
     def analyze_job_fit_narrative(
         self,
@@ -197,9 +829,15 @@ Format as: point 1 | point 2 | point 3 | etc.
         Returns:
             Narrative explanation of fit
         """
-        if not self.llm_available:
-            return self._fallback_fit_narrative(match_percentage)
-        
+        return self.run(self.fit_narrative_request(profile_summary, job_summary, match_percentage))
+    
+    def fit_narrative_request(
+        self,
+        profile_summary: str,
+        job_summary: str,
+        match_percentage: float
+    ) -> LLMRequest:
+        """Build the job fit narrative request"""
         prompt = f"""
 Provide a brief, insightful narrative (3-4 sentences) analyzing the job fit:
 
@@ -214,11 +852,12 @@ MATCH SCORE: {match_percentage}%
 Be honest but encouraging. Highlight key alignment points and growth opportunities.
 """
         
-        try:
-            return self.llm.generate_text(prompt, temperature=0.7)
-        except Exception as e:
-            print(f"LLM error: {e}. Using fallback.")
-            return self._fallback_fit_narrative(match_percentage)
+        return LLMRequest(
+            method="analyze_job_fit_narrative",
+            prompt=prompt,
+            temperature=0.7,
+            fallback=lambda: self._fallback_fit_narrative(match_percentage)
+        )
     
     def generate_learning_roadmap(
         self,
@@ -235,9 +874,14 @@ Be honest but encouraging. Highlight key alignment points and growth opportuniti
         Returns:
             Dictionary with learning steps and resources
         """
-        if not self.llm_available:
-            return self._fallback_learning_roadmap(missing_skills)
-        
+        return self.run(self.learning_roadmap_request(missing_skills, priority_level))
+    
+    def learning_roadmap_request(
+        self,
+        missing_skills: List[str],
+        priority_level: str = "high"
+    ) -> LLMRequest:
+        """Build the learning roadmap request"""
         prompt = f"""
 Create a learning roadmap for someone who needs to learn these skills:
 {', '.join(missing_skills)}
@@ -253,16 +897,17 @@ For each skill, provide:
 Format concisely for practical use.
 """
         
-        try:
-            response = self.llm.generate_text(prompt, temperature=0.5)
-            return {
+        return LLMRequest(
+            method="generate_learning_roadmap",
+            prompt=prompt,
+            temperature=0.5,
+            parse=lambda response: {
                 "roadmap": response,
                 "skills": missing_skills,
                 "priority": priority_level
-            }
-        except Exception as e:
-            print(f"LLM error: {e}. Using fallback.")
-            return self._fallback_learning_roadmap(missing_skills)
+            },
+            fallback=lambda: self._fallback_learning_roadmap(missing_skills)
+        )
     
     def generate_company_research_brief(
         self,
@@ -279,9 +924,14 @@ Format concisely for practical use.
         Returns:
             Research talking points
         """
-        if not self.llm_available:
-            return f"Research {company_name}'s recent news and product launches"
-        
+        return self.run(self.company_brief_request(company_name, industry))
+    
+    def company_brief_request(
+        self,
+        company_name: str,
+        industry: str
+    ) -> LLMRequest:
+        """Build the company research brief request"""
         prompt = f"""
 Based on general knowledge, provide 3-4 talking points about {company_name} ({industry}) that would be impressive in an interview:
 
@@ -295,11 +945,12 @@ This should help demonstrate genuine interest in the company.
 Be specific but use only well-known information.
 """
         
-        try:
-            return self.llm.generate_text(prompt, temperature=0.6)
-        except Exception as e:
-            print(f"LLM error: {e}. Using fallback.")
-            return f"Research {company_name}'s recent news and product launches"
+        return LLMRequest(
+            method="generate_company_research_brief",
+            prompt=prompt,
+            temperature=0.6,
+            fallback=lambda: f"Research {company_name}'s recent news and product launches"
+        )
     
     def generate_salary_negotiation_tips(
         self,
@@ -318,9 +969,15 @@ Be specific but use only well-known information.
         Returns:
             List of negotiation tips
         """
-        if not self.llm_available:
-            return self._fallback_salary_tips()
-        
+        return self.run(self.salary_tips_request(role, experience_years, location))
+    
+    def salary_tips_request(
+        self,
+        role: str,
+        experience_years: int,
+        location: str = "US"
+    ) -> LLMRequest:
+        """Build the salary negotiation tips request"""
         prompt = f"""
 Generate 5 practical salary negotiation tips for:
 - Role: {role}
@@ -334,15 +991,118 @@ Tips should address:
 4. How to negotiate beyond salary
 5. Red flags to watch for
 
-Format as concise, actionable tips.
+Format as a JSON array of strings, one concise, actionable tip per string.
 """
         
+        return LLMRequest(
+            method="generate_salary_negotiation_tips",
+            prompt=prompt,
+            temperature=0.6,
+            parse=lambda response: self._parse_list(response, limit=5, separator='\n'),
+            fallback=lambda: self._fallback_salary_tips()
+        )
+    
+    def application_package_request(
+        self,
+        user_name: str,
+        current_role: str,
+        years_experience: int,
+        job_title: str,
+        company: str,
+        job_description: str,
+        industry: str,
+        strong_points: List[str],
+        skills: List[str],
+        matched_skills: List[str],
+        missing_skills: List[str],
+        match_percentage: float
+    ) -> LLMRequest:
+        """
+        Build one request for all four enhancement sections
+        
+        The candidate and job context is sent once and the answer comes back
+        as a JSON object validated against APPLICATION_PACKAGE_SCHEMA. A field
+        that is missing or has the wrong type gets its own rule-based fallback;
+        an unparseable response falls back for every field.
+        
+        Returns:
+            LLMRequest whose result is keyed like EnhancedLinkedInAgent's
+            llm_enhanced block
+        """
+        prompt = f"""
+Prepare job application material for this candidate. Respond with only a JSON object.
+
+CANDIDATE: {user_name} ({current_role}, {years_experience} years experience)
+KEY STRENGTHS: {', '.join(strong_points[:3])}
+KEY SKILLS: {', '.join(skills[:5])}
+MATCHED SKILLS: {', '.join(matched_skills)}
+MISSING SKILLS: {', '.join(missing_skills)}
+
+JOB: {job_title} at {company} ({industry})
+JOB REQUIREMENTS:
+{job_description}
+
+MATCH SCORE: {match_percentage}%
+
+JSON fields:
+- "personalized_cover_letter": string, a compelling cover letter opening paragraph (2-3 sentences); personalized, confident, specific to the role
+- "ai_interview_points": array of 5 strings, specific interview talking points that highlight matched skills, address missing skills professionally and show understanding of the requirements
+- "fit_narrative": string, a brief, honest but encouraging narrative (3-4 sentences) analyzing the job fit
+- "company_research": string, 3-4 talking points about {company} based on well-known information that demonstrate genuine interest
+"""
+        
+        fallbacks = {
+            "personalized_cover_letter": lambda: self._fallback_cover_letter(user_name, job_title, company),
+            "ai_interview_points": lambda: self._fallback_talking_points(matched_skills),
+            "fit_narrative": lambda: self._fallback_fit_narrative(match_percentage),
+            "company_research": lambda: f"Research {company}'s recent news and product launches"
+        }
+        
+        return LLMRequest(
+            method="generate_application_package",
+            prompt=prompt,
+            temperature=0.7,
+            parse=lambda response: self._parse_package(response, fallbacks),
+            fallback=lambda: {field: fallback() for field, fallback in fallbacks.items()}
+        )
+    
+    @staticmethod
+    def _parse_json(response: str) -> Any:
+        """Parse a JSON response, tolerating a surrounding markdown code fence"""
+        text = response.strip()
+        fenced = re.match(r"^```(?:json)?\s*(.*?)\s*```$", text, re.S)
+        return json.loads(fenced.group(1) if fenced else text)
+    
+    @classmethod
+    def _parse_list(cls, response: str, limit: int, separator: str) -> List[str]:
+        """Parse a JSON array of strings, or split on separator if the model ignored the format"""
         try:
-            response = self.llm.generate_text(prompt, temperature=0.6)
-            return [t.strip() for t in response.split('\n') if t.strip()][:5]
-        except Exception as e:
-            print(f"LLM error: {e}. Using fallback.")
-            return self._fallback_salary_tips()
+            items = cls._parse_json(response)
+        except ValueError:
+            items = response.split(separator)
+        else:
+            if not isinstance(items, list):
+                raise ValueError(f"Expected a JSON array, got {type(items).__name__}")
+        return [str(item).strip() for item in items if str(item).strip()][:limit]
+    
+    @classmethod
+    def _parse_package(cls, response: str, fallbacks: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+        """Validate an application package, replacing invalid fields with their fallback"""
+        package = cls._parse_json(response)
+        if not isinstance(package, dict):
+            raise ValueError(f"Expected a JSON object, got {type(package).__name__}")
+        
+        result = {}
+        for field, fallback in fallbacks.items():
+            value = package.get(field)
+            expected = APPLICATION_PACKAGE_SCHEMA[field]
+            if expected is str and isinstance(value, str) and value.strip():
+                result[field] = value.strip()
+            elif expected is list and isinstance(value, list) and value and all(isinstance(v, str) for v in value):
+                result[field] = [v.strip() for v in value][:5]
+            else:
+                result[field] = fallback()
+        return result
     
     # Fallback methods for rule-based alternatives
     
@@ -395,24 +1155,136 @@ Format as concise, actionable tips.
         ]
 
 
-def get_llm_analyzer(use_openai: bool = True, api_key: Optional[str] = None) -> LLMEnhancedAnalyzer:
+def get_llm_analyzer(use_openai: bool = True, api_key: Optional[str] = None,
+                     cache: Optional[LLMResponseCache] = None,
+                     base_url: Optional[str] = None) -> LLMEnhancedAnalyzer:
     """
     Factory function to create LLM analyzer
     
     Args:
         use_openai: Whether to try to use OpenAI
         api_key: OpenAI API key (optional, uses env var if not provided)
+        cache: Response cache (default: shared cache at LLM_CACHE_PATH if set)
+        base_url: OpenAI-compatible endpoint (optional, uses OPENAI_BASE_URL env var)
+    
+    The provider comes from get_shared_provider, so every analyzer in the
+    process shares one pooled client and rate limiter per key and model.
+    
+    If the LLM_CASSETTE env var names a cassette file, LLM_CASSETTE_MODE=record
+    appends the provider's traffic to it and LLM_CASSETTE_MODE=replay (the
+    default) serves it back offline instead of calling OpenAI, with
+    LLM_CASSETTE_LATENCY=recorded or zero (see llm_cassette). Recordings keep
+    prompt text unless LLM_CASSETTE_REDACT=1.
     
     Returns:
         LLMEnhancedAnalyzer (with or without LLM)
     """
+    if cache is None:
+        cache = get_shared_cache()
+    
+    cassette = os.getenv("LLM_CASSETTE")
+    cassette_mode = os.getenv("LLM_CASSETTE_MODE", "replay")
+    if cassette and cassette_mode == "replay":
+        from llm_cassette import ReplayProvider
+        provider = ReplayProvider(cassette, latency=os.getenv("LLM_CASSETTE_LATENCY", "recorded"))
+        return LLMEnhancedAnalyzer(provider, cache=cache)
+    
     if use_openai and OPENAI_AVAILABLE:
         try:
-            provider = OpenAIProvider(api_key=api_key)
-            if provider.is_available():
-                return LLMEnhancedAnalyzer(provider)
+            provider = get_shared_provider(api_key=api_key, base_url=base_url)
+            if provider is not None and cassette and cassette_mode == "record":
+                from llm_cassette import get_recording_provider
+                provider = get_recording_provider(provider, cassette,
+                                                  redact_prompts=os.getenv("LLM_CASSETTE_REDACT") == "1")
+            if provider is not None:
+                max_in_flight = _env_float("LLM_MAX_IN_FLIGHT")
+                return LLMEnhancedAnalyzer(
+                    provider, cache=cache, max_in_flight=int(max_in_flight) if max_in_flight else None
+                )
         except Exception as e:
             print(f"Warning: Could not initialize OpenAI: {e}")
     
     # Fall back to rule-based
     return LLMEnhancedAnalyzer(llm_provider=None)
+
+
+_providers: Dict[Tuple[str, str, Optional[str]], LLMProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_shared_provider(api_key: Optional[str] = None, model: Optional[str] = None,
+                        base_url: Optional[str] = None) -> Optional[LLMProvider]:
+    """
+    Process-wide OpenAI provider for an (api key, model, endpoint)
+    
+    The first call builds an OpenAIProvider with a keep-alive connection pool
+    (LLM_POOL_SIZE env var, default 20) wrapped in
+    llm_resilience.ResilientProvider, rate limited by the
+    LLM_REQUESTS_PER_MINUTE and LLM_TOKENS_PER_MINUTE env vars if set. Later
+    calls reuse it, so connections, TLS sessions and rate-limit budgets are
+    shared across agents.
+    
+    Args:
+        api_key: OpenAI API key (default: OPENAI_API_KEY env var)
+        model: Model (default: OPENAI_MODEL env var or gpt-4o-mini)
+        base_url: OpenAI-compatible endpoint (default: OPENAI_BASE_URL env var)
+    
+    Returns:
+        Shared provider, or None if OpenAI is not installed or configured
+    """
+    from llm_resilience import ResilientProvider
+    
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    base_url = base_url or os.getenv("OPENAI_BASE_URL")
+    if not (OPENAI_AVAILABLE and api_key):
+        return None
+    
+    key = (api_key, model, base_url)
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is None:
+            openai_provider = OpenAIProvider(
+                api_key=api_key,
+                model=model,
+                base_url=base_url,
+                max_retries=0,
+                pool_size=int(os.getenv("LLM_POOL_SIZE", "20"))
+            )
+            if not openai_provider.is_available():
+                return None
+            provider = _providers[key] = ResilientProvider(
+                openai_provider,
+                requests_per_minute=_env_float("LLM_REQUESTS_PER_MINUTE"),
+                tokens_per_minute=_env_float("LLM_TOKENS_PER_MINUTE")
+            )
+        return provider
+
+
+def close_shared_providers():
+    """Close pooled connections of every shared provider and forget them"""
+    with _providers_lock:
+        providers = list(_providers.values())
+        _providers.clear()
+    for provider in providers:
+        openai_provider = getattr(provider, "provider", provider)
+        if getattr(openai_provider, "client", None) is not None:
+            openai_provider.client.close()
+            run_coroutine(openai_provider.async_client.close())
+
+
+def _env_float(name: str) -> Optional[float]:
+    """Numeric environment setting, None when unset"""
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+_shared_cache: Optional[LLMResponseCache] = None
+
+
+def get_shared_cache() -> Optional[LLMResponseCache]:
+    """Process-wide response cache backed by LLM_CACHE_PATH (None if unset)"""
+    global _shared_cache
+    if _shared_cache is None and os.getenv("LLM_CACHE_PATH"):
+        _shared_cache = LLMResponseCache(os.getenv("LLM_CACHE_PATH"))
+    return _shared_cache
@@ -0,0 +1,184 @@
+"""
+LLM Metrics - per-method latency histograms, token usage, cost, fallback and cache rates
+One in-process registry shared by every analyzer; the web app serves its snapshot
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+
+# Latency histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float("inf"))
+
+# USD per million (prompt, completion) tokens; unknown models are costed at zero
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) when usage is not reported"""
+    return max(1, len(text) // 4)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated USD cost of one call"""
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+class Histogram:
+    """Fixed-bucket histogram (not thread-safe; the registry locks around it)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None if empty)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+    def snapshot(self) -> Dict[str, Any]:
+        def ms(seconds: Optional[float]) -> Optional[float]:
+            return None if seconds is None or seconds == float("inf") else round(seconds * 1000, 1)
+
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.sum / self.count) if self.count else None,
+            "p50_ms": ms(self.quantile(0.5)),
+            "p95_ms": ms(self.quantile(0.95)),
+            "p99_ms": ms(self.quantile(0.99)),
+            "buckets": {
+                ("+Inf" if bound == float("inf") else f"{bound * 1000:g}ms"): count
+                for bound, count in zip(self.buckets, self.counts)
+            }
+        }
+
+
+class _MethodMetrics:
+    """Counters for one LLMEnhancedAnalyzer method"""
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.provider_calls = 0
+        self.provider_errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.requests = 0
+        self.fallbacks: Dict[str, int] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        fallbacks = sum(self.fallbacks.values())
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "requests": self.requests,
+            "fallbacks": fallbacks,
+            "fallback_rate": round(fallbacks / self.requests, 3) if self.requests else 0.0,
+            "fallback_reasons": dict(self.fallbacks),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_rate": round(self.cache_hits / lookups, 3) if lookups else 0.0,
+            "provider_calls": self.provider_calls,
+            "provider_errors": self.provider_errors,
+            "latency": self.latency.snapshot(),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost_usd": round(self.cost_usd, 6)
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe per-method LLM metrics"""
+
+    def __init__(self):
+        self._methods: Dict[str, _MethodMetrics] = {}
+        self._lock = threading.Lock()
+
+    def _method(self, method: str) -> _MethodMetrics:
+        metrics = self._methods.get(method)
+        if metrics is None:
+            metrics = self._methods[method] = _MethodMetrics()
+        return metrics
+
+    def record_call(self, method: str, model: str, seconds: float,
+                    prompt_tokens: int = 0, completion_tokens: int = 0, error: bool = False):
+        """One provider call: latency, and token usage and cost if it succeeded"""
+        with self._lock:
+            metrics = self._method(method)
+            metrics.provider_calls += 1
+            metrics.latency.observe(seconds)
+            if error:
+                metrics.provider_errors += 1
+                return
+            metrics.prompt_tokens += prompt_tokens
+            metrics.completion_tokens += completion_tokens
+            metrics.cost_usd += estimate_cost(model, prompt_tokens, completion_tokens)
+
+    def record_cache(self, method: str, hit: bool):
+        """One response cache lookup"""
+        with self._lock:
+            metrics = self._method(method)
+            if hit:
+                metrics.cache_hits += 1
+            else:
+                metrics.cache_misses += 1
+
+    def record_outcome(self, method: str, decision: Dict[str, Any]):
+        """How one analyzer request was served (see LLMEnhancedAnalyzer.run_many_async)"""
+        with self._lock:
+            metrics = self._method(method)
+            metrics.requests += 1
+            if decision.get("source") == "fallback":
+                reason = decision.get("reason", "unknown")
+                metrics.fallbacks[reason] = metrics.fallbacks.get(reason, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-method metrics and totals, ready to serialize as JSON"""
+        with self._lock:
+            methods = {method: metrics.snapshot() for method, metrics in sorted(self._methods.items())}
+
+        totals = {
+            name: sum(m[name] for m in methods.values())
+            for name in ("requests", "fallbacks", "cache_hits", "cache_misses",
+                         "provider_calls", "provider_errors", "prompt_tokens", "completion_tokens", "cost_usd")
+        }
+        lookups = totals["cache_hits"] + totals["cache_misses"]
+        totals["cost_usd"] = round(totals["cost_usd"], 6)
+        totals["fallback_rate"] = round(totals["fallbacks"] / totals["requests"], 3) if totals["requests"] else 0.0
+        totals["cache_hit_rate"] = round(totals["cache_hits"] / lookups, 3) if lookups else 0.0
+        return {"methods": methods, "totals": totals}
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """The process-wide registry used by default"""
+    return _registry
@@ -0,0 +1,274 @@
+"""
+LLM Resilience Layer - rate limiting, retries and circuit breaking for any LLMProvider
+Keeps bursts from hammering a provider that is already failing or rate-limiting us
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import AsyncIterator, Iterator, Optional
+
+from llm_integration import Completion, LLMProvider, LLMProviderError
+
+
+# HTTP statuses worth retrying; failures without a status (timeouts, connection errors) are retried too
+RETRYABLE_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(LLMProviderError):
+    """Raised without calling the provider while the circuit breaker is open"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a per-minute rate"""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            per_minute: Tokens added per minute
+            capacity: Burst size (default: one minute's worth)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Take amount tokens, possibly ahead of time
+
+        Returns:
+            Seconds the caller must wait before proceeding, or None (and
+            nothing taken) if that would exceed max_wait
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (amount - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= amount
+            return wait
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets one probe through after reset_timeout"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before a probe request
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may go to the provider now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            # One probe per reset_timeout, so a probe that never reports back cannot wedge the circuit
+            now = time.monotonic()
+            if now - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._opened_at = now
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class ResilientProvider(LLMProvider):
+    """Wraps an LLMProvider with rate limits, jittered retries and a circuit breaker"""
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        max_wait: float = 10.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        completion_tokens: int = 500
+    ):
+        """
+        Initialize the resilience layer
+
+        Args:
+            provider: Provider to protect (give it no retries of its own)
+            requests_per_minute: Request rate limit (None = unlimited)
+            tokens_per_minute: Estimated token rate limit (None = unlimited)
+            max_retries: Retries after a 429/5xx/connection failure
+            base_delay: First backoff ceiling in seconds, doubled per retry
+            max_delay: Largest backoff ceiling in seconds
+            max_wait: Longest a call waits for rate-limit budget before failing
+            failure_threshold: Consecutive failed attempts that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe
+            completion_tokens: Completion tokens budgeted per request
+        """
+        self.provider = provider
+        self.model = getattr(provider, "model", "")
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_wait = max_wait
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.completion_tokens = completion_tokens
+
+    @property
+    def name(self) -> str:
+        return self.provider.name
+
+    def is_available(self) -> bool:
+        return self.provider.is_available()
+
+    def _admit(self, prompt: str) -> float:
+        """Check the breaker and take rate-limit budget; returns seconds to wait first"""
+        if not self.breaker.allow():
+            raise CircuitOpenError("Circuit open - provider is failing, skipping call")
+
+        wait = 0.0
+        for bucket, amount in ((self.request_bucket, 1), (self.token_bucket, len(prompt) // 4 + self.completion_tokens)):
+            if bucket is None:
+                continue
+            bucket_wait = bucket.reserve(amount, self.max_wait)
+            if bucket_wait is None:
+                raise LLMProviderError("Local rate limit budget exhausted", 429)
+            wait = max(wait, bucket_wait)
+        return wait
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Full-jitter backoff before the next attempt, or None to give up"""
+        if isinstance(error, CircuitOpenError):
+            return None
+        if not isinstance(error, LLMProviderError):
+            self.breaker.record_failure()
+            return None
+        if error.status_code is not None and error.status_code not in RETRYABLE_STATUSES:
+            # The provider answered; the request itself was bad
+            self.breaker.record_success()
+            return None
+        self.breaker.record_failure()
+        if attempt >= self.max_retries:
+            return None
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def generate_text(self, prompt: str, temperature: float = 0.7) -> str:
+        return self.complete(prompt, temperature).text
+
+    async def generate_text_async(self, prompt: str, temperature: float = 0.7) -> str:
+        return (await self.complete_async(prompt, temperature)).text
+
+    def complete(self, prompt: str, temperature: float = 0.7) -> Completion:
+        attempt = 0
+        while True:
+            time.sleep(self._admit(prompt))
+            try:
+                completion = self.provider.complete(prompt, temperature=temperature)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return completion
+
+    async def complete_async(self, prompt: str, temperature: float = 0.7) -> Completion:
+        attempt = 0
+        while True:
+            await asyncio.sleep(self._admit(prompt))
+            try:
+                completion = await self.provider.complete_async(prompt, temperature=temperature)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return completion
+
+    def stream_text(self, prompt: str, temperature: float = 0.7) -> Iterator[str]:
+        """Stream with the same protections; only failures before the first chunk are retried"""
+        attempt = 0
+        while True:
+            time.sleep(self._admit(prompt))
+            chunks = self.provider.stream_text(prompt, temperature=temperature)
+            try:
+                first = next(chunks, None)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            break
+
+        if first is not None:
+            yield first
+        try:
+            yield from chunks
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+
+    async def stream_text_async(self, prompt: str, temperature: float = 0.7) -> AsyncIterator[str]:
+        attempt = 0
+        while True:
+            await asyncio.sleep(self._admit(prompt))
+            chunks = self.provider.stream_text_async(prompt, temperature=temperature).__aiter__()
+            try:
+                first = await chunks.__anext__()
+            except StopAsyncIteration:
+                first = None
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            break
+
+        if first is not None:
+            yield first
+            try:
+                async for chunk in chunks:
+                    yield chunk
+            except Exception:
+                self.breaker.record_failure()
+                raise
+        self.breaker.record_success()
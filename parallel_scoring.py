@@ -0,0 +1,112 @@
+"""
+Process-Pool Sharded Scoring
+Scores large job corpora across CPU cores and merges per-shard top-k results
+"""
+
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from linkedin_agent import UserProfile, JobPosting, JobMatcher, LinkedInAgent
+from skill_taxonomy import SkillTaxonomy, get_default_taxonomy, set_default_taxonomy
+
+
+# Per-worker state, set once by _init_worker
+_worker_matcher: Optional[JobMatcher] = None
+
+
+def _init_worker(user_profile: UserProfile, taxonomy_compiled: Dict[str, any]):
+    """Install the profile and compiled taxonomy once per worker process"""
+    global _worker_matcher
+    set_default_taxonomy(SkillTaxonomy.from_compiled(taxonomy_compiled))
+    _worker_matcher = JobMatcher(user_profile)
+
+
+def _score_shard(start: int, requirements: List[Tuple[List[str], int]], k: int) -> List[Tuple[float, int]]:
+    """Score one chunk in a worker and return its top k as (score, corpus_index)"""
+    matcher = _worker_matcher
+    scored = (
+        (matcher.calculate_match_score(JobPosting("", "", "", required_skills, [], experience_years, "")),
+         start + offset)
+        for offset, (required_skills, experience_years) in enumerate(requirements)
+    )
+    return heapq.nlargest(k, scored, key=_rank_key)
+
+
+def _rank_key(item: Tuple) -> Tuple[float, int]:
+    """Best score first; ties keep the lower corpus index first"""
+    return item[0], -item[1]
+
+
+class ParallelScorer:
+    """Shards a job corpus across a process pool for one profile"""
+
+    def __init__(self, user_profile: UserProfile, workers: Optional[int] = None, chunk_size: int = 2000):
+        """
+        Start the worker pool
+
+        Args:
+            user_profile: Profile to score against (sent to each worker once)
+            workers: Worker processes (default: os.cpu_count())
+            chunk_size: Jobs per task
+        """
+        self.user_profile = user_profile
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(user_profile, get_default_taxonomy().compiled)
+        )
+
+    def top_k(self, job_postings: Iterable[JobPosting], k: int = 10) -> List[Tuple[int, float, JobPosting]]:
+        """
+        Return the k best-matching postings of a corpus
+
+        Only each posting's required skills and experience - all the score
+        depends on - are sent to the workers. The corpus is consumed lazily
+        with at most two chunks per worker in flight, so iterators over very
+        large feeds stay bounded in memory.
+
+        Returns:
+            (corpus_index, match_score, job_posting), best first
+        """
+        jobs = iter(job_postings)
+        pending = {}
+        best: List[Tuple[float, int, JobPosting]] = []
+        start = 0
+
+        while True:
+            while len(pending) < 2 * self.workers:
+                chunk = list(islice(jobs, self.chunk_size))
+                if not chunk:
+                    break
+                requirements = [(job.required_skills, job.experience_years) for job in chunk]
+                pending[self.executor.submit(_score_shard, start, requirements, k)] = (start, chunk)
+                start += len(chunk)
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk_start, chunk = pending.pop(future)
+                shard_best = [(score, index, chunk[index - chunk_start]) for score, index in future.result()]
+                best = heapq.nlargest(k, best + shard_best, key=_rank_key)
+
+        return [(index, score, job) for score, index, job in best]
+
+    def analyze_top_k(self, job_postings: Iterable[JobPosting], k: int = 10) -> List[Dict[str, any]]:
+        """Full LinkedInAgent analysis for the k best-matching postings, best first"""
+        best = self.top_k(job_postings, k)
+        return list(LinkedInAgent(self.user_profile).analyze_many(job for _, _, job in best))
+
+    def close(self):
+        """Shut down the worker pool"""
+        self.executor.shutdown()
+
+    def __enter__(self) -> "ParallelScorer":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,83 @@
+"""
+Profile Store - server-side user profiles with an LRU of compiled matchers
+Clients register a profile once and analyze jobs by profile ID
+"""
+
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from linkedin_agent import JobMatcher, UserProfile
+
+
+@dataclass
+class StoredProfile:
+    """A registered profile; version increases on every update"""
+    id: str
+    profile: UserProfile
+    version: int = 1
+
+
+class ProfileStore:
+    """
+    Thread-safe in-memory profiles (in production, back this with a database)
+
+    Matchers, with the profile's skills normalized, are built on first use
+    and kept in a bounded LRU; updating a profile drops its matcher.
+    """
+
+    def __init__(self, max_matchers: int = 1024):
+        """
+        Args:
+            max_matchers: Compiled matchers kept before the least recently used is dropped
+        """
+        self.max_matchers = max_matchers
+        self._profiles: Dict[str, StoredProfile] = {}
+        self._matchers: "OrderedDict[str, JobMatcher]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, profile: UserProfile) -> StoredProfile:
+        """Register a profile under a new ID"""
+        stored = StoredProfile(id=uuid.uuid4().hex, profile=profile)
+        with self._lock:
+            self._profiles[stored.id] = stored
+        return stored
+
+    def update(self, profile_id: str, profile: UserProfile) -> Optional[StoredProfile]:
+        """Replace a profile's data (None if the ID is unknown)"""
+        with self._lock:
+            stored = self._profiles.get(profile_id)
+            if stored is None:
+                return None
+            stored = self._profiles[profile_id] = StoredProfile(profile_id, profile, stored.version + 1)
+            self._matchers.pop(profile_id, None)
+            return stored
+
+    def get(self, profile_id: str) -> Optional[StoredProfile]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def matcher(self, profile_id: str) -> Optional[JobMatcher]:
+        """Compiled matcher for a profile (None if the ID is unknown)"""
+        with self._lock:
+            matcher = self._matchers.get(profile_id)
+            if matcher is not None:
+                self._matchers.move_to_end(profile_id)
+                return matcher
+            stored = self._profiles.get(profile_id)
+        if stored is None:
+            return None
+
+        # Normalize outside the lock; a concurrent build of the same matcher is harmless
+        matcher = JobMatcher(stored.profile)
+        with self._lock:
+            if self._profiles.get(profile_id) is stored:
+                self._matchers[profile_id] = matcher
+                while len(self._matchers) > self.max_matchers:
+                    self._matchers.popitem(last=False)
+        return matcher
+
+    def __len__(self) -> int:
+        return len(self._profiles)
@@ -0,0 +1,242 @@
+"""
+Skill Taxonomy - one normalized skill ID space for parsing, matching and interview prep
+Loads skills and aliases from a JSON/CSV data file and caches the compiled form on disk
+"""
+
+import csv
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Pattern
+
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills.json")
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "linkedin_agent")
+
+# Bump when the compiled format changes so stale cache files are ignored
+CACHE_FORMAT_VERSION = 2
+
+
+def build_skill_regex(skills: Iterable[str], lowercase: bool = True) -> str:
+    """
+    Build one word-bounded regex source matching any skill in lowercased text
+    (or, with lowercase=False, matching the skills exactly as written)
+
+    The alternation is factored into a prefix trie, so the engine walks a
+    single branch per text position instead of retrying every skill. The
+    leading word-boundary check sits after each first character, which lets
+    the engine skip positions that cannot start any skill.
+    """
+    trie = {}
+    for skill in skills:
+        node = trie
+        for ch in (skill.lower() if lowercase else skill):
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def to_regex(node: dict) -> str:
+        branches = [re.escape(ch) + to_regex(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        if "" in node:
+            return "(?:" + "|".join(branches) + ")?"
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    first = [re.escape(ch) + r"(?<!\w.)" + to_regex(child) for ch, child in sorted(trie.items()) if ch]
+    return "(?:" + "|".join(first) + r")(?!\w)"
+
+
+def compile_skill_pattern(skills: Iterable[str]) -> Pattern:
+    """Compile skills into one word-bounded regex for lowercased text"""
+    return re.compile(build_skill_regex(skills))
+
+
+def _is_compiled(data: any) -> bool:
+    """Whether data has the shape of SkillTaxonomy.compiled (e.g. a cache file)"""
+    return (
+        isinstance(data, dict)
+        and all(isinstance(data.get(key), dict) for key in ("names", "surface_forms", "questions"))
+        and isinstance(data.get("pattern"), str)
+        and isinstance(data.get("case_pattern"), (str, type(None)))
+    )
+
+
+class SkillTaxonomy:
+    """Canonical skills with aliases, compiled into a text matcher"""
+
+    def __init__(self, records: Iterable[Dict[str, any]]):
+        """
+        Compile a taxonomy from skill records
+
+        Args:
+            records: Dicts with "name", optional "aliases" list, optional
+                "case_sensitive" list and optional interview "question".
+                Forms listed in "case_sensitive" (the name or aliases that
+                are also ordinary words, e.g. "Go" or "Spark") are found in
+                text only exactly as written; skill lists accept every form
+                in any case.
+        """
+        names = {}
+        surface_forms = {}
+        questions = {}
+        text_forms = []
+        case_sensitive_forms = []
+
+        for record in records:
+            skill_id = record["name"].lower()
+            names[skill_id] = record["name"]
+            case_sensitive = list(record.get("case_sensitive", []))
+            for form in [record["name"]] + list(record.get("aliases", [])) + case_sensitive:
+                surface_forms[form.lower()] = skill_id
+                (case_sensitive_forms if form in case_sensitive else text_forms).append(form)
+            if record.get("question"):
+                questions[skill_id] = record["question"]
+
+        self._init_compiled({
+            "names": names,
+            "surface_forms": surface_forms,
+            "questions": questions,
+            "pattern": build_skill_regex(text_forms),
+            "case_pattern": build_skill_regex(case_sensitive_forms, lowercase=False) if case_sensitive_forms else None
+        })
+
+    def _init_compiled(self, compiled: Dict[str, any]):
+        """Set state from the compiled (cacheable) form"""
+        self.compiled = compiled
+        self.names: Dict[str, str] = compiled["names"]
+        self.surface_forms: Dict[str, str] = compiled["surface_forms"]
+        self.questions: Dict[str, str] = compiled["questions"]
+        self.pattern = re.compile(compiled["pattern"])
+        self.case_pattern = re.compile(compiled["case_pattern"]) if compiled.get("case_pattern") else None
+
+    @classmethod
+    def from_compiled(cls, compiled: Dict[str, any]) -> "SkillTaxonomy":
+        """Restore a taxonomy from its compiled form without rebuilding it"""
+        taxonomy = cls.__new__(cls)
+        taxonomy._init_compiled(compiled)
+        return taxonomy
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_TAXONOMY_PATH, cache_dir: Optional[str] = None) -> "SkillTaxonomy":
+        """
+        Load a taxonomy data file, using the on-disk compiled cache when valid
+
+        Args:
+            path: JSON list of skill records, or CSV with name, aliases and
+                case_sensitive (semicolon separated) and question columns
+            cache_dir: Where compiled taxonomies are cached, keyed by the
+                data file's hash (default: SKILL_TAXONOMY_CACHE_DIR env var
+                or ~/.cache/linkedin_agent)
+
+        Returns:
+            Compiled SkillTaxonomy
+        """
+        with open(path, "rb") as f:
+            raw = f.read()
+
+        digest = hashlib.sha256(raw).hexdigest()
+        cache_dir = cache_dir or os.getenv("SKILL_TAXONOMY_CACHE_DIR", DEFAULT_CACHE_DIR)
+        cache_path = os.path.join(cache_dir, f"taxonomy-v{CACHE_FORMAT_VERSION}-{digest}.json")
+
+        # A missing, corrupt or wrongly shaped cache file is rebuilt below
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                compiled = json.load(f)
+            if _is_compiled(compiled):
+                return cls.from_compiled(compiled)
+        except (OSError, ValueError, re.error):
+            pass
+
+        text = raw.decode("utf-8")
+        if path.lower().endswith(".csv"):
+            records = [
+                {
+                    "name": row["name"],
+                    "aliases": [a.strip() for a in (row.get("aliases") or "").split(";") if a.strip()],
+                    "case_sensitive": [a.strip() for a in (row.get("case_sensitive") or "").split(";") if a.strip()],
+                    "question": row.get("question") or None
+                }
+                for row in csv.DictReader(text.splitlines())
+            ]
+        else:
+            records = json.loads(text)
+
+        taxonomy = cls(records)
+
+        # Cache is best effort - a read-only disk just means compiling next time
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(taxonomy.compiled, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+
+        return taxonomy
+
+    def normalize(self, skill: str) -> str:
+        """Return the skill ID for a skill name or alias (lowercased name if unknown)"""
+        key = skill.lower()
+        return self.surface_forms.get(key, key)
+
+    def display_name(self, skill: str) -> str:
+        """Return the canonical display name for a skill name, alias or ID"""
+        return self.names.get(self.normalize(skill), skill)
+
+    def extract(self, text: str, lowered: Optional[str] = None) -> List[str]:
+        """
+        Return canonical names of skills mentioned in text, in order of first appearance
+
+        Callers that already hold text.lower() pass it as lowered to skip
+        lowercasing the text again.
+        """
+        surface_forms = self.surface_forms
+        names = self.names
+        if lowered is None:
+            lowered = text.lower()
+        if self.case_pattern is None:
+            skill_ids = dict.fromkeys(surface_forms[m] for m in self.pattern.findall(lowered))
+        else:
+            # Merge both patterns' matches by position; a longer form ("Spring Boot") wins over
+            # a case-sensitive one inside it ("Spring")
+            found = [(m.start(), m.end(), m.group()) for m in self.pattern.finditer(lowered)]
+            case_found = []
+            i = 0  # Both lists are in position order, so one pass finds the overlaps
+            for m in self.case_pattern.finditer(text):
+                while i < len(found) and found[i][1] <= m.start():
+                    i += 1
+                if i == len(found) or found[i][0] >= m.end():
+                    case_found.append((m.start(), m.end(), m.group().lower()))
+            found += case_found
+            found.sort()
+            skill_ids = dict.fromkeys(surface_forms[form] for _, _, form in found)
+        return [names[skill_id] for skill_id in skill_ids]
+
+    def question(self, skill: str) -> Optional[str]:
+        """Return the interview question for a skill, if the taxonomy has one"""
+        return self.questions.get(self.normalize(skill))
+
+    def __contains__(self, skill: str) -> bool:
+        return skill.lower() in self.surface_forms
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+_default_taxonomy: Optional[SkillTaxonomy] = None
+
+
+def get_default_taxonomy() -> SkillTaxonomy:
+    """Return the process-wide taxonomy (SKILL_TAXONOMY_PATH env var or bundled skills.json)"""
+    global _default_taxonomy
+    if _default_taxonomy is None:
+        _default_taxonomy = SkillTaxonomy.load(os.getenv("SKILL_TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH))
+    return _default_taxonomy
+
+
+def set_default_taxonomy(taxonomy: SkillTaxonomy):
+    """Replace the process-wide taxonomy"""
+    global _default_taxonomy
+    _default_taxonomy = taxonomy
@@ -3,8 +3,26 @@ Comprehensive Test Suite for LinkedIn Job Application Assistant
 Tests all features and edge cases
 """
 
-from linkedin_agent import LinkedInAgent, UserProfile, JobPosting
+import json
+
+from linkedin_agent import LinkedInAgent, UserProfile, JobPosting, JobMatcher, ApplicationAdvisor
 from linkedin_utils import JobPostingParser, ProfileValidator, ApplicationTracker
+from linkedin_vectorized import NUMPY_AVAILABLE, score_matrix
+from linkedin_index import SkillIndex
+from linkedin_utils import InterviewSimulator
+from skill_taxonomy import SkillTaxonomy, get_default_taxonomy
+from job_feed import iter_job_feed, job_from_record, score_job_feed
+from parallel_scoring import ParallelScorer
+from llm_integration import LLMProvider, LLMProviderError, OpenAIProvider, LLMEnhancedAnalyzer, get_llm_analyzer
+from llm_integration import get_shared_provider, close_shared_providers
+from llm_cache import LLMResponseCache, SingleFlight
+from llm_budget import LatencyTracker
+from llm_metrics import MetricsRegistry
+from llm_resilience import ResilientProvider, CircuitBreaker, CircuitOpenError, TokenBucket
+from llm_fakes import FakeLLMProvider, FakeOpenAIServer
+from llm_cassette import RecordingProvider, ReplayProvider, get_recording_provider, recorded_requests, replay_traffic
+from llm_demo import EnhancedLinkedInAgent
+from profile_store import ProfileStore
 from examples import get_all_profiles, get_all_jobs, SCENARIOS
 
 
@@ -225,6 +243,1248 @@ def test_application_tracker():
     print(f"Avg score (all): {pattern['average_match_score_all']}%")
 
 
+def test_shared_match_result():
+    """Test that one MatchResult drives the score and every advisor section"""
+    print("\n" + "="*70)
+    print("TEST 9: Shared Match Result")
+    print("="*70)
+    
+    profiles = get_all_profiles()
+    jobs = get_all_jobs()
+    
+    for profile in profiles.values():
+        matcher = JobMatcher(profile)
+        for job in jobs.values():
+            skill_match = matcher.match(job)
+            assert skill_match.to_dict() == matcher.match_skills(job)
+            assert matcher.calculate_match_score(job, skill_match) == matcher.calculate_match_score(job)
+            
+            shared = ApplicationAdvisor(matcher, job, skill_match)
+            fresh = ApplicationAdvisor(matcher, job)
+            assert shared.generate_strong_points() == fresh.generate_strong_points()
+            assert shared.generate_interview_prep() == fresh.generate_interview_prep()
+    
+    print(f"✓ {len(profiles) * len(jobs)} profile/job pairs agree")
+
+
+def test_batch_matching():
+    """Test that batch analysis matches the single-job path exactly"""
+    print("\n" + "="*70)
+    print("TEST 10: Batch Matching")
+    print("="*70)
+    
+    jobs = list(get_all_jobs().values())
+    
+    for profile in get_all_profiles().values():
+        agent = LinkedInAgent(profile)
+        single = [agent.analyze_job_posting(job) for job in jobs]
+        batch = list(agent.analyze_many(iter(jobs)))
+        assert batch == single, f"Batch analysis differs for {profile.name}"
+        
+        scores = [score for _, _, score in JobMatcher(profile).match_many(jobs)]
+        assert scores == [JobMatcher(profile).calculate_match_score(job) for job in jobs]
+    
+    print(f"✓ analyze_many matches analyze_job_posting for {len(jobs)} jobs per profile")
+
+
+def test_score_matrix():
+    """Test that vectorized scores equal calculate_match_score for every pair"""
+    print("\n" + "="*70)
+    print("TEST 11: Vectorized Score Matrix")
+    print("="*70)
+    
+    if not NUMPY_AVAILABLE:
+        print("⚠ SKIP: NumPy not installed")
+        return
+    
+    profiles = list(get_all_profiles().values())
+    jobs = list(get_all_jobs().values()) + [
+        JobPosting(title="No Requirements", company="C", description="",
+                   required_skills=[], preferred_skills=["Python"],
+                   experience_years=1, seniority_level="Junior")
+    ]
+    
+    result = score_matrix(profiles, jobs, top_k=2, chunk_size=3)
+    
+    for row, profile in enumerate(profiles):
+        matcher = JobMatcher(profile)
+        expected = [matcher.calculate_match_score(job) for job in jobs]
+        assert list(result.scores[row]) == expected, f"Matrix row differs for {profile.name}"
+        
+        best = sorted(range(len(jobs)), key=lambda j: (-expected[j], j))[:2]
+        assert list(result.top_indices[row]) == best
+    
+    print(f"✓ {len(profiles)}x{len(jobs)} matrix matches per-pair scoring")
+
+
+def test_skill_index():
+    """Test inverted index top-k retrieval and persistence"""
+    print("\n" + "="*70)
+    print("TEST 12: Inverted Skill Index")
+    print("="*70)
+    
+    import os
+    import tempfile
+    
+    jobs = list(get_all_jobs().values())
+    index = SkillIndex()
+    index.add_many(jobs)
+    
+    for profile in get_all_profiles().values():
+        matcher = JobMatcher(profile)
+        candidates = index.candidates(profile)
+        for job_id, job in enumerate(jobs):
+            shares_skill = any(s.lower() in matcher.user_skills for s in job.required_skills)
+            assert (job_id in candidates) == shares_skill
+        
+        expected = sorted(
+            ((job_id, matcher.calculate_match_score(jobs[job_id])) for job_id in candidates),
+            key=lambda item: (-item[1], item[0])
+        )[:3]
+        assert index.top_k(profile, k=3) == expected
+    
+    path = os.path.join(tempfile.mkdtemp(), "index.json")
+    index.save(path)
+    loaded = SkillIndex.load(path)
+    assert loaded.jobs == index.jobs and loaded.postings == index.postings
+    
+    print(f"✓ Top-k from {len(jobs)} indexed postings matches full scoring")
+
+
+def test_skill_extraction_word_boundaries():
+    """Test that parsed skills only match whole words"""
+    print("\n" + "="*70)
+    print("TEST 13: Skill Extraction Word Boundaries")
+    print("="*70)
+    
+    parsed = JobPostingParser.parse_from_text(
+        "A good engineer to maintain our HTML pages and JavaScript apps"
+    )
+    for skill in ["Go", "AI", "ML", "Java"]:
+        assert skill not in parsed['skills'], f"{skill} matched inside another word"
+    assert parsed['skills'] == ["HTML", "JavaScript"]
+    
+    parsed = JobPostingParser.parse_from_text(
+        "Go, C++ and C# services on AWS; CI/CD with GitHub Actions. 7+ years"
+    )
+    assert parsed['skills'] == ["Go", "C++", "C#", "AWS", "CI/CD", "GitHub Actions"]
+    assert parsed['years'] == 7
+    
+    print("✓ Skills matched on word boundaries only")
+
+
+def test_skill_taxonomy():
+    """Test taxonomy aliases, file formats and the compiled cache"""
+    print("\n" + "="*70)
+    print("TEST 14: Skill Taxonomy")
+    print("="*70)
+    
+    import os
+    import tempfile
+    
+    # Aliases share one skill ID across parsing, matching and interview prep
+    parsed = JobPostingParser.parse_from_text("Deploy ReactJS apps on k8s with Golang services")
+    assert parsed['skills'] == ["React", "Kubernetes", "Go"]
+    
+    profile = UserProfile(
+        name="Alias", current_role="Dev", years_experience=3,
+        skills=["k8s", "reactjs"], previous_roles=[], education="", certifications=[]
+    )
+    job = JobPosting(
+        title="Dev", company="C", description="",
+        required_skills=["Kubernetes", "React"], preferred_skills=[],
+        experience_years=3, seniority_level="Mid"
+    )
+    assert JobMatcher(profile).match(job).matched_required == ["Kubernetes", "React"]
+    assert InterviewSimulator.generate_technical_questions(["python"]) == \
+        InterviewSimulator.generate_technical_questions(["Python"])
+    
+    # CSV data files compile and cache like JSON ones
+    workdir = tempfile.mkdtemp()
+    data_path = os.path.join(workdir, "skills.csv")
+    with open(data_path, "w") as f:
+        f.write("name,aliases,question\nKubernetes,k8s;kube,What is a pod?\nGo,golang,\n")
+    cache_dir = os.path.join(workdir, "cache")
+    
+    taxonomy = SkillTaxonomy.load(data_path, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    cached = SkillTaxonomy.load(data_path, cache_dir=cache_dir)
+    assert cached.compiled == taxonomy.compiled
+    assert cached.normalize("KUBE") == "kubernetes"
+    assert cached.question("k8s") == "What is a pod?"
+    assert cached.extract("golang and kube") == ["Go", "Kubernetes"]
+    
+    # Ambiguous forms match prose only exactly as written, but skill lists take them in any case
+    assert JobPostingParser.parse_from_text("Add guard rails that spark joy; ready to go, ts=5")['skills'] == []
+    assert JobPostingParser.parse_from_text("Rails and Spark jobs in TS; Spring Boot")['skills'] == \
+        ["Ruby on Rails", "Apache Spark", "TypeScript", "Spring Boot"]
+    assert [get_default_taxonomy().normalize(s) for s in ("rails", "ts", "spark")] == \
+        ["ruby on rails", "typescript", "apache spark"]
+    
+    # A cache file of the wrong shape is rebuilt rather than breaking the load
+    cache_path = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+    for bad in ("[1, 2]", '{"names": [], "surface_forms": {}, "questions": {}, "pattern": 5}', '"x"'):
+        with open(cache_path, "w") as f:
+            f.write(bad)
+        assert SkillTaxonomy.load(data_path, cache_dir=cache_dir).compiled == taxonomy.compiled
+    
+    print("✓ Aliases normalized; compiled cache reused")
+
+
+def test_job_feed_resume():
+    """Test streaming feed scoring and resuming from a checkpoint"""
+    print("\n" + "="*70)
+    print("TEST 15: Streaming Job Feed")
+    print("="*70)
+    
+    import json
+    import os
+    import tempfile
+    from dataclasses import asdict
+    
+    workdir = tempfile.mkdtemp()
+    feed_path = os.path.join(workdir, "feed.jsonl")
+    output_path = os.path.join(workdir, "results.jsonl")
+    
+    jobs = list(get_all_jobs().values()) * 3
+    with open(feed_path, "w") as f:
+        for job in jobs:
+            f.write(json.dumps(asdict(job)) + "\n")
+        f.write(json.dumps({"title": "Parsed", "company": "C",
+                            "description": "Python and k8s, 4+ years"}) + "\n")
+    
+    profile = next(iter(get_all_profiles().values()))
+    summary = score_job_feed(feed_path, output_path, profile)
+    assert summary["records"] == len(jobs) + 1
+    with open(output_path) as f:
+        complete = f.readlines()
+    assert json.loads(complete[-1])["missing_required"] == ["Python", "Kubernetes"]
+    
+    # Simulate a crash after record 5: checkpoint there, plus a torn write after it
+    offsets = [offset for _, offset in iter_job_feed(feed_path)]
+    with open(output_path, "w") as f:
+        f.writelines(complete[:5])
+        output_offset = f.tell()
+        f.write('{"title": "torn')
+    with open(output_path + ".checkpoint", "w") as f:
+        json.dump({"input_offset": offsets[4], "output_offset": output_offset, "records": 5}, f)
+    
+    summary = score_job_feed(feed_path, output_path, profile)
+    assert summary["resumed_from"] == offsets[4] and summary["scored_this_run"] == len(jobs) - 4
+    with open(output_path) as f:
+        assert f.readlines() == complete
+    assert not os.path.exists(output_path + ".checkpoint")
+    
+    # Malformed records mid-feed are skipped with their offsets; the run finishes and can resume past them
+    corrupt_path = os.path.join(workdir, "corrupt.jsonl")
+    corrupt_output = os.path.join(workdir, "corrupt-results.jsonl")
+    lines = [json.dumps(asdict(job)) + "\n" for job in jobs[:4]]
+    lines[1:1] = ['{"title": "truncated", "compa\n', '[1, 2]\n']
+    with open(corrupt_path, "w") as f:
+        f.writelines(lines)
+    skipped = []
+    assert len(list(iter_job_feed(corrupt_path, skipped=skipped))) == 4
+    assert [offset for offset, _ in skipped] == [len(lines[0]), len(lines[0]) + len(lines[1])]
+    summary = score_job_feed(corrupt_path, corrupt_output, profile, checkpoint_every=1)
+    assert summary["scored_this_run"] == 4 and summary["skipped_this_run"] == 2
+    
+    # Skill fields must be a list of strings or a string; other values mark the record malformed
+    assert job_from_record({"title": "T", "required_skills": None, "description": "Python"}).required_skills == ["Python"]
+    for bad in (5, {"a": 1}, ["Python", 3]):
+        try:
+            job_from_record({"title": "T", "required_skills": bad})
+            assert False, f"accepted {bad!r}"
+        except TypeError:
+            pass
+    
+    # Free-form experience values take their leading number, else the description's years
+    record = {"title": "T", "company": "C", "required_skills": "Python", "description": "6+ years of Go"}
+    for value, years in (("3.5", 3), ("5+", 5), ("3 years", 3), (2.0, 2), ("senior", 6), ("", 6)):
+        assert job_from_record(dict(record, experience_years=value)).experience_years == years
+    
+    print(f"✓ {len(jobs) + 1} streamed records; resumed run matches uninterrupted run")
+
+
+def test_parallel_top_k():
+    """Test that sharded process-pool scoring matches serial ranking"""
+    print("\n" + "="*70)
+    print("TEST 16: Parallel Sharded Scoring")
+    print("="*70)
+    
+    jobs = list(get_all_jobs().values()) * 5
+    profile = next(iter(get_all_profiles().values()))
+    matcher = JobMatcher(profile)
+    expected = sorted(
+        ((i, matcher.calculate_match_score(job)) for i, job in enumerate(jobs)),
+        key=lambda item: (-item[1], item[0])
+    )[:4]
+    
+    with ParallelScorer(profile, workers=2, chunk_size=3) as scorer:
+        best = scorer.top_k(iter(jobs), k=4)
+        analyses = scorer.analyze_top_k(jobs, k=4)
+    
+    assert [(index, score) for index, score, _ in best] == expected
+    assert [a['match_score']['percentage'] for a in analyses] == [round(s, 1) for _, s in expected]
+    
+    print(f"✓ Merged top-4 of {len(jobs)} postings matches serial scoring")
+
+
+class CountingProvider(LLMProvider):
+    """Offline provider that counts calls and echoes the prompt length"""
+    
+    model = "counting"
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def generate_text(self, prompt: str, temperature: float = 0.7) -> str:
+        self.calls += 1
+        return f"response {self.calls} to {len(prompt)} chars"
+    
+    def is_available(self) -> bool:
+        return True
+
+
+def test_llm_response_cache():
+    """Test the two-tier LLM response cache"""
+    print("\n" + "="*70)
+    print("TEST 17: LLM Response Cache")
+    print("="*70)
+    
+    import os
+    import tempfile
+    
+    db_path = os.path.join(tempfile.mkdtemp(), "llm_cache.sqlite")
+    provider = CountingProvider()
+    analyzer = LLMEnhancedAnalyzer(provider, cache=LLMResponseCache(db_path, max_entries=2))
+    
+    first = analyzer.generate_company_research_brief("Google", "Tech")
+    assert analyzer.generate_company_research_brief("Google", "Tech") == first
+    assert provider.calls == 1
+    analyzer.generate_company_research_brief("Stripe", "Fintech")
+    assert provider.calls == 2
+    
+    # A new process sees the SQLite tier
+    fresh = LLMEnhancedAnalyzer(provider, cache=LLMResponseCache(db_path))
+    assert fresh.generate_company_research_brief("Google", "Tech") == first
+    assert provider.calls == 2
+    stats = fresh.cache.stats()
+    assert stats["disk_hits"] == 1 and stats["misses"] == 0
+    
+    # Zero TTL disables caching for a method
+    no_cache = LLMEnhancedAnalyzer(provider, cache=LLMResponseCache(
+        ttls={"generate_company_research_brief": 0}))
+    no_cache.generate_company_research_brief("Google", "Tech")
+    no_cache.generate_company_research_brief("Google", "Tech")
+    assert provider.calls == 4
+    
+    print(f"✓ Cache stats: {analyzer.cache.stats()['hit_rate']} hit rate in first process")
+
+
+def test_concurrent_llm_enhancement():
+    """Test that LLM sections run concurrently and respect the shared deadline"""
+    print("\n" + "="*70)
+    print("TEST 18: Concurrent LLM Enhancement")
+    print("="*70)
+    
+    import time
+    
+    profile = next(iter(get_all_profiles().values()))
+    job = next(iter(get_all_jobs().values()))
+    
+    agent = EnhancedLinkedInAgent(profile, llm_analyzer=LLMEnhancedAnalyzer(FakeLLMProvider(latency=0.2)))
+    start = time.perf_counter()
+    enhanced = agent.analyze_job_posting(job)['llm_enhanced']
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.6, f"Four 200 ms calls took {elapsed:.2f}s - not concurrent"
+    assert enhanced['fit_narrative'].startswith("Fake response")
+    assert len(enhanced['ai_interview_points']) == 1
+    
+    # Sections still running at the deadline use their rule-based fallback
+    agent.llm_deadline = 0.05
+    enhanced = agent.analyze_job_posting(job)['llm_enhanced']
+    assert enhanced['company_research'] == f"Research {job.company}'s recent news and product launches"
+    assert enhanced['ai_interview_points'] == LLMEnhancedAnalyzer._fallback_talking_points(
+        agent.analyze_job_posting(job, include_llm=False)['skill_analysis']['matched_required'])
+    
+    print(f"✓ Four sections in {elapsed * 1000:.0f} ms; deadline fallbacks applied")
+
+
+class PackageProvider(CountingProvider):
+    """Offline provider answering with a fenced application package JSON object"""
+    
+    def generate_text(self, prompt: str, temperature: float = 0.7) -> str:
+        self.calls += 1
+        return "```json\n" + json.dumps({
+            "personalized_cover_letter": "I am excited to apply.",
+            "ai_interview_points": ["Led a migration", "Mentored juniors"],
+            "fit_narrative": 42,
+        }) + "\n```"
+
+
+def test_structured_llm_enhancement():
+    """Test the single structured call that replaces the four enhancement calls"""
+    print("\n" + "="*70)
+    print("TEST 19: Structured LLM Enhancement")
+    print("="*70)
+    
+    profile = next(iter(get_all_profiles().values()))
+    job = next(iter(get_all_jobs().values()))
+    
+    provider = PackageProvider()
+    agent = EnhancedLinkedInAgent(profile, llm_analyzer=LLMEnhancedAnalyzer(provider, structured_output=True))
+    analysis = agent.analyze_job_posting(job)
+    enhanced = analysis['llm_enhanced']
+    
+    assert provider.calls == 1
+    assert set(enhanced) == {'personalized_cover_letter', 'ai_interview_points', 'fit_narrative', 'company_research'}
+    assert enhanced['personalized_cover_letter'] == "I am excited to apply."
+    assert enhanced['ai_interview_points'] == ["Led a migration", "Mentored juniors"]
+    # Wrong type and missing fields fall back individually
+    assert enhanced['fit_narrative'] == LLMEnhancedAnalyzer._fallback_fit_narrative(
+        analysis['match_score']['percentage'])
+    assert enhanced['company_research'] == f"Research {job.company}'s recent news and product launches"
+    
+    # List sections accept JSON arrays and still tolerate the legacy delimiters
+    assert LLMEnhancedAnalyzer._parse_list('["a", " b "]', limit=5, separator='|') == ["a", "b"]
+    assert LLMEnhancedAnalyzer._parse_list("a | b | c", limit=2, separator='|') == ["a", "b"]
+    
+    print("✓ One call filled all four sections with per-field fallbacks")
+
+
+def test_fake_llm_server():
+    """Test the fake provider knobs and the OpenAI-compatible stub server"""
+    print("\n" + "="*70)
+    print("TEST 20: Fake LLM Provider and Stub Server")
+    print("="*70)
+    
+    import urllib.error
+    import urllib.request
+    
+    # Same seed, same sequence of injected failures
+    outcomes = []
+    for _ in range(2):
+        provider = FakeLLMProvider(error_rate=0.3, error_status=429, response_chars=200, seed=3)
+        run = []
+        for _ in range(20):
+            try:
+                run.append(len(provider.generate_text("hello")))
+            except LLMProviderError as e:
+                run.append(e.status_code)
+        outcomes.append(run)
+    assert outcomes[0] == outcomes[1]
+    assert set(outcomes[0]) == {200, 429}
+    
+    profile = next(iter(get_all_profiles().values()))
+    job = next(iter(get_all_jobs().values()))
+    
+    with FakeOpenAIServer(FakeLLMProvider(response_chars=120)) as server:
+        # The real OpenAI client code path, end to end
+        analyzer = get_llm_analyzer(api_key="fake-key", base_url=server.base_url, cache=LLMResponseCache())
+        assert analyzer.llm_available
+        agent = EnhancedLinkedInAgent(profile, llm_analyzer=analyzer)
+        enhanced = agent.analyze_job_posting(job)['llm_enhanced']
+        assert enhanced['fit_narrative'].startswith("Fake response")
+        assert len(enhanced['fit_narrative']) == 120
+        assert server.provider.calls == 4
+        
+        server.provider.error_rate = 1.0
+        server.provider.error_status = 429
+        request = urllib.request.Request(
+            server.base_url + "/chat/completions",
+            data=json.dumps({"model": "m", "messages": [{"role": "user", "content": "hi"}]}).encode(),
+            headers={"Content-Type": "application/json"}
+        )
+        try:
+            urllib.request.urlopen(request)
+            assert False, "Expected an injected 429"
+        except urllib.error.HTTPError as e:
+            assert e.code == 429
+            assert json.loads(e.read())["error"]["type"] == "rate_limit_error"
+    
+    print(f"✓ Stub server served {server.provider.calls} completions through OpenAIProvider")
+
+
+def test_llm_resilience():
+    """Test retries, the circuit breaker and the token bucket"""
+    print("\n" + "="*70)
+    print("TEST 21: LLM Resilience Layer")
+    print("="*70)
+    
+    import time
+    
+    fake = FakeLLMProvider(error_rate=1.0, error_status=503)
+    provider = ResilientProvider(fake, max_retries=2, base_delay=0.001, failure_threshold=3, reset_timeout=0.05)
+    analyzer = LLMEnhancedAnalyzer(provider)
+    
+    # Retried, then fails over to the rule-based fallback
+    assert analyzer.generate_company_research_brief("Google", "Tech") == "Research Google's recent news and product launches"
+    assert fake.calls == 3
+    assert provider.breaker.state == CircuitBreaker.OPEN
+    
+    # While open, calls fail fast without reaching the provider
+    try:
+        provider.generate_text("hello")
+        assert False, "Expected CircuitOpenError"
+    except CircuitOpenError:
+        pass
+    assert fake.calls == 3
+    
+    # After the reset timeout one probe goes through and closes the circuit
+    time.sleep(0.06)
+    fake.error_rate = 0.0
+    assert provider.generate_text("hello").startswith("Fake response")
+    assert provider.breaker.state == CircuitBreaker.CLOSED
+    
+    # Client errors are not retried
+    fake.error_rate, fake.error_status = 1.0, 400
+    calls = fake.calls
+    try:
+        provider.generate_text("hello")
+        assert False, "Expected LLMProviderError"
+    except LLMProviderError as e:
+        assert e.status_code == 400
+    assert fake.calls == calls + 1
+    
+    bucket = TokenBucket(per_minute=60, capacity=1)
+    assert bucket.reserve(1) == 0
+    assert 0.9 < bucket.reserve(1) <= 1.0
+    assert bucket.reserve(1, max_wait=0.5) is None
+    
+    print("✓ Retries, circuit breaker and rate limiter behave as configured")
+
+
+def test_shared_llm_provider():
+    """Test that analyzers share one pooled provider per key and model"""
+    print("\n" + "="*70)
+    print("TEST 22: Shared LLM Provider Pool")
+    print("="*70)
+    
+    with FakeOpenAIServer() as server:
+        first = get_llm_analyzer(api_key="fake-key", base_url=server.base_url)
+        second = get_llm_analyzer(api_key="fake-key", base_url=server.base_url)
+        assert first.llm is second.llm
+        assert get_shared_provider("fake-key", "other-model", server.base_url) is not first.llm
+        assert get_shared_provider("other-key", base_url=server.base_url) is not first.llm
+        
+        for i in range(5):
+            get_llm_analyzer(api_key="fake-key", base_url=server.base_url).llm.generate_text(f"prompt {i}")
+        assert server.provider.calls == 5
+        assert server.connections == 1, f"{server.connections} connections for 5 sequential calls"
+        
+        close_shared_providers()
+        assert get_shared_provider("fake-key", base_url=server.base_url) is not first.llm
+        close_shared_providers()
+    
+    print("✓ Five analyzers reused one keep-alive connection")
+
+
+def test_single_flight_coalescing():
+    """Test that identical concurrent prompts share one provider call"""
+    print("\n" + "="*70)
+    print("TEST 23: Single-Flight Prompt Coalescing")
+    print("="*70)
+    
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    
+    provider = FakeLLMProvider(latency=0.1)
+    in_flight = SingleFlight()
+    
+    # Threads: one analyzer per simulated user request
+    def brief(_):
+        return LLMEnhancedAnalyzer(provider, in_flight=in_flight).generate_company_research_brief("Google", "Tech")
+    with ThreadPoolExecutor(8) as pool:
+        briefs = list(pool.map(brief, range(8)))
+    assert provider.calls == 1
+    assert len(set(briefs)) == 1 and briefs[0].startswith("Fake response")
+    assert in_flight.coalesced == 7
+    
+    # Asyncio tasks
+    analyzer = LLMEnhancedAnalyzer(provider, in_flight=in_flight)
+    
+    async def many_briefs():
+        requests = [analyzer.company_brief_request("Stripe", "Fintech") for _ in range(5)]
+        return await asyncio.gather(*(analyzer.run_async(r) for r in requests))
+    assert len(set(asyncio.run(many_briefs()))) == 1
+    assert provider.calls == 2
+    
+    # Threads, tasks on this loop and tasks on the shared background loop all join one call
+    from llm_integration import run_coroutine
+    request = analyzer.company_brief_request("Netflix", "Streaming")
+    
+    def netflix_in_thread(_):
+        return LLMEnhancedAnalyzer(provider, in_flight=in_flight).generate_company_research_brief("Netflix", "Streaming")
+    
+    async def mixed():
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(4) as pool:
+            threads = [loop.run_in_executor(pool, netflix_in_thread, i) for i in range(2)]
+            other_loop = [loop.run_in_executor(pool, run_coroutine, analyzer.run_async(request)) for _ in range(2)]
+            tasks = [analyzer.run_async(request) for _ in range(2)]
+            return await asyncio.gather(*threads, *other_loop, *tasks)
+    coalesced_before = in_flight.coalesced
+    assert len(set(asyncio.run(mixed()))) == 1
+    assert provider.calls == 3 and in_flight.coalesced - coalesced_before == 5
+    
+    # A shared failure reaches every waiter, which each fall back
+    provider.error_rate = 1.0
+    with ThreadPoolExecutor(4) as pool:
+        briefs = list(pool.map(brief, range(4)))
+    assert briefs == ["Research Google's recent news and product launches"] * 4
+    assert provider.calls == 4
+    
+    print(f"✓ {in_flight.calls} provider calls served {in_flight.calls + in_flight.coalesced} requests")
+
+
+def test_streaming_analysis_endpoint():
+    """Test the SSE endpoint sends the rule-based analysis before LLM sections"""
+    print("\n" + "="*70)
+    print("TEST 24: Streaming Analysis Endpoint")
+    print("="*70)
+    
+    import time
+    from dataclasses import asdict
+    from app import app
+    
+    profile = next(iter(get_all_profiles().values()))
+    job = next(iter(get_all_jobs().values()))
+    app.config['LLM_ANALYZER'] = LLMEnhancedAnalyzer(FakeLLMProvider(latency=0.3))
+    try:
+        start = time.perf_counter()
+        response = app.test_client().post('/api/analyze/stream', json={
+            'profile': asdict(profile), 'job': asdict(job)
+        }, buffered=False)
+        assert response.mimetype == 'text/event-stream'
+        chunks = iter(response.response)
+        first = next(chunks).decode()
+        first_event_ms = (time.perf_counter() - start) * 1000
+        body = first + b"".join(chunks).decode()
+    finally:
+        del app.config['LLM_ANALYZER']
+    
+    assert first.startswith("event: analysis\n")
+    assert first_event_ms < 250, f"First event after {first_event_ms:.0f} ms"
+    events = [block.split("\n", 1) for block in body.strip().split("\n\n")]
+    names = [event[0][len("event: "):] for event in events]
+    payloads = [json.loads(event[1][len("data: "):]) for event in events]
+    assert names[-1] == "done"
+    assert "delta" in names
+    sections = {p['section']: p['value'] for n, p in zip(names, payloads) if n == "section"}
+    assert set(sections) == {'personalized_cover_letter', 'ai_interview_points', 'fit_narrative', 'company_research'}
+    assert sections['fit_narrative'].startswith("Fake response")
+    
+    # Streams share the single-flight, latency tracking, metrics and load shedding of non-streamed calls
+    import asyncio
+    from llm_integration import LLMRequest
+    provider = FakeLLMProvider(latency=0.1)
+    tracker = LatencyTracker(min_samples=1)
+    metrics = MetricsRegistry()
+    analyzer = LLMEnhancedAnalyzer(provider, in_flight=SingleFlight(), latency_tracker=tracker, metrics=metrics)
+    request = LLMRequest("fit_narrative", "Explain the fit", 0.7, fallback=lambda: "fallback")
+    
+    async def collect(budget=None):
+        deadline = None if budget is None else time.monotonic() + budget
+        return [event async for event in analyzer.stream_async(request, deadline)]
+    
+    async def concurrent():
+        return await asyncio.gather(collect(), collect(), analyzer.run_async(request))
+    
+    leader, follower, joined = asyncio.run(concurrent())
+    assert provider.calls == 1 and analyzer.in_flight.coalesced == 2
+    assert leader[-1] == follower[-1] == ("result", joined) and joined.startswith("Fake response")
+    assert len(leader) > 2 and follower[:-1] == [("delta", joined)]
+    assert tracker.in_flight == 0 and tracker.percentile(95) >= 0.1
+    assert metrics.snapshot()["methods"]["fit_narrative"]["provider_calls"] == 1
+    
+    assert asyncio.run(collect(budget=0.05)) == [("result", "fallback")] and provider.calls == 1
+    assert metrics.snapshot()["methods"]["fit_narrative"]["fallback_reasons"] == {"p95_over_budget": 1}
+    
+    print(f"✓ Rule-based analysis streamed after {first_event_ms:.0f} ms, then {names.count('delta')} LLM deltas")
+
+
+def test_background_enrichment():
+    """Test rule-based responses returned at once with LLM sections filled in later"""
+    print("\n" + "="*70)
+    print("TEST 25: Background LLM Enrichment")
+    print("="*70)
+    
+    import time
+    from dataclasses import asdict
+    from app import app
+    
+    profile = next(iter(get_all_profiles().values()))
+    job = next(iter(get_all_jobs().values()))
+    client = app.test_client()
+    app.config['LLM_ANALYZER'] = LLMEnhancedAnalyzer(FakeLLMProvider(latency=0.3))
+    try:
+        start = time.perf_counter()
+        analysis = client.post('/api/analyze', json={
+            'profile': asdict(profile), 'job': asdict(job), 'llm': 'background'
+        }).get_json()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    finally:
+        del app.config['LLM_ANALYZER']
+    
+    assert elapsed_ms < 200, f"Rule-based response took {elapsed_ms:.0f} ms"
+    assert 'llm_enhanced' not in analysis
+    handle = analysis['llm_enrichment']
+    assert handle['status'] == 'pending'
+    
+    assert client.get(f"/api/enrichment/{handle['id']}").get_json()['status'] == 'pending'
+    enrichment = client.get(f"/api/enrichment/{handle['id']}?wait=5").get_json()
+    assert enrichment['status'] == 'done'
+    assert enrichment['llm_enhanced']['fit_narrative'].startswith("Fake response")
+    assert len(enrichment['llm_enhanced']) == 4
+    assert client.get("/api/enrichment/no-such-id").status_code == 404
+    
+    # Same flow through the agent API
+    agent = EnhancedLinkedInAgent(profile, llm_analyzer=LLMEnhancedAnalyzer(FakeLLMProvider()))
+    handle = agent.analyze_job_posting(job, background=True)['llm_enrichment']
+    assert agent.get_enrichment(handle['id'], wait=5)['status'] == 'done'
+    
+    print(f"✓ Rule-based analysis in {elapsed_ms:.0f} ms; LLM sections delivered by enrichment ID")
+
+
+def test_latency_budget_shedding():
+    """Test that calls which cannot meet the latency budget are skipped and reported"""
+    print("\n" + "="*70)
+    print("TEST 26: Latency Budget Load Shedding")
+    print("="*70)
+    
+    import time
+    
+    profile = next(iter(get_all_profiles().values()))
+    job = next(iter(get_all_jobs().values()))
+    provider = FakeLLMProvider(latency=0.1)
+    tracker = LatencyTracker(min_samples=3)
+    agent = EnhancedLinkedInAgent(profile, llm_analyzer=LLMEnhancedAnalyzer(
+        provider, in_flight=SingleFlight(), latency_tracker=tracker, max_in_flight=8))
+    
+    # No latency history yet: calls are made, and cut off at the deadline
+    analysis = agent.analyze_job_posting(job, latency_budget=0.05)
+    assert {d['reason'] for d in analysis['llm_decisions'].values()} == {'timeout'}
+    
+    # Within budget: real LLM output
+    analysis = agent.analyze_job_posting(job, latency_budget=2.0)
+    assert all(d == {'source': 'llm'} for d in analysis['llm_decisions'].values())
+    assert tracker.percentile(95) >= 0.1
+    
+    # p95 of about 100 ms cannot fit a 50 ms budget: skipped without calling the provider
+    calls = provider.calls
+    start = time.perf_counter()
+    analysis = agent.analyze_job_posting(job, latency_budget=0.05)
+    elapsed = time.perf_counter() - start
+    assert provider.calls == calls
+    assert {d['reason'] for d in analysis['llm_decisions'].values()} == {'p95_over_budget'}
+    assert analysis['llm_enhanced']['company_research'] == f"Research {job.company}'s recent news and product launches"
+    assert elapsed < 0.05
+    
+    # Too many calls already in flight
+    for _ in range(8):
+        tracker.start()
+    analysis = agent.analyze_job_posting(job)
+    assert {d['reason'] for d in analysis['llm_decisions'].values()} == {'queue_full'}
+    for _ in range(8):
+        tracker.finish()
+    
+    # Shedding stops once latency is normal again: probe calls refresh the window and old samples expire
+    from llm_integration import LLMRequest
+    fast = FakeLLMProvider(latency=0.01)
+    recovering = LatencyTracker(min_samples=5, max_age=0.5, probe_interval=0.05)
+    analyzer = LLMEnhancedAnalyzer(fast, in_flight=SingleFlight(), latency_tracker=recovering)
+    for _ in range(5):
+        recovering.start()
+        recovering.finish(0.3)
+    request = analyzer.company_brief_request("Google", "Tech")
+    decisions = []
+    for _ in range(30):
+        decisions.append(analyzer._run(request, time.monotonic() + 0.2)[1].get('reason', 'llm'))
+        time.sleep(0.03)
+    assert decisions[0] == 'p95_over_budget' and 'llm' in decisions[:5]
+    assert decisions[-10:] == ['llm'] * 10 and recovering.percentile(95) < 0.2
+    
+    print(f"✓ Over-budget request served rule-based text in {elapsed * 1000:.1f} ms with decisions recorded")
+
+
+def test_llm_metrics():
+    """Test per-method LLM metrics and the metrics endpoint"""
+    print("\n" + "="*70)
+    print("TEST 27: LLM Metrics")
+    print("="*70)
+    
+    from app import app
+    
+    metrics = MetricsRegistry()
+    with FakeOpenAIServer(FakeLLMProvider(latency=0.01, response_chars=400)) as server:
+        provider = OpenAIProvider(api_key="fake-key", model="gpt-4o-mini", base_url=server.base_url, max_retries=0)
+        analyzer = LLMEnhancedAnalyzer(provider, cache=LLMResponseCache(), in_flight=SingleFlight(), metrics=metrics)
+        analyzer.generate_company_research_brief("Google", "Tech")
+        analyzer.generate_company_research_brief("Google", "Tech")
+        server.provider.error_rate = 1.0
+        analyzer.analyze_job_fit_narrative("Engineer", "Senior Engineer", 70)
+    
+    brief = metrics.snapshot()["methods"]["generate_company_research_brief"]
+    assert brief["requests"] == 2 and brief["provider_calls"] == 1
+    assert brief["cache_hits"] == 1 and brief["cache_hit_rate"] == 0.5
+    assert brief["completion_tokens"] == 100  # usage reported by the server: 400 chars / 4
+    assert brief["prompt_tokens"] > 0 and brief["cost_usd"] > 0
+    assert brief["latency"]["count"] == 1 and brief["latency"]["p95_ms"] is not None
+    
+    narrative = metrics.snapshot()["methods"]["analyze_job_fit_narrative"]
+    assert narrative["provider_errors"] == 1
+    assert narrative["fallback_rate"] == 1.0 and narrative["fallback_reasons"] == {"error": 1}
+    
+    totals = app.test_client().get('/api/metrics').get_json()["totals"]
+    assert {"requests", "fallback_rate", "cache_hit_rate", "cost_usd"} <= set(totals)
+    
+    print(f"✓ {metrics.snapshot()['totals']['requests']} requests measured; ${brief['cost_usd']:.6f} estimated cost")
+
+
+def test_llm_cassette_replay():
+    """Test recording LLM traffic and replaying it offline"""
+    print("\n" + "="*70)
+    print("TEST 28: LLM Cassette Record/Replay")
+    print("="*70)
+    
+    import asyncio
+    import os
+    import tempfile
+    import time
+    
+    profile = get_all_profiles()["backend"]
+    jobs = [get_all_jobs()["backend"], get_all_jobs()["frontend"]]
+    path = os.path.join(tempfile.mkdtemp(), "traffic.jsonl.gz")
+    
+    recorder = RecordingProvider(FakeLLMProvider(latency=0.02, response_chars=300), path)
+    agent = EnhancedLinkedInAgent(profile, llm_analyzer=LLMEnhancedAnalyzer(recorder, cache=LLMResponseCache()))
+    recorded = [agent.analyze_job_posting(job)['llm_enhanced'] for job in jobs]
+    
+    replay = ReplayProvider(path, latency="zero")
+    assert len(replay) == recorder.provider.calls > 0 and replay.name == "FakeLLMProvider"
+    
+    os.environ["LLM_CASSETTE"] = path
+    os.environ["LLM_CASSETTE_LATENCY"] = "zero"
+    try:
+        analyzer = get_llm_analyzer(cache=LLMResponseCache())
+    finally:
+        del os.environ["LLM_CASSETTE"], os.environ["LLM_CASSETTE_LATENCY"]
+    assert isinstance(analyzer.llm, ReplayProvider)
+    
+    agent = EnhancedLinkedInAgent(profile, llm_analyzer=analyzer)
+    start = time.perf_counter()
+    replayed = [agent.analyze_job_posting(job)['llm_enhanced'] for job in jobs]
+    elapsed = time.perf_counter() - start
+    assert replayed == recorded
+    
+    timed = ReplayProvider(path, latency="recorded")
+    agent = EnhancedLinkedInAgent(profile, llm_analyzer=LLMEnhancedAnalyzer(timed, cache=LLMResponseCache()))
+    start = time.perf_counter()
+    assert agent.analyze_job_posting(jobs[0])['llm_enhanced'] == recorded[0]
+    assert time.perf_counter() - start >= 0.02  # each recorded call took at least the fake's latency
+    
+    try:
+        timed.complete("a prompt that was never recorded")
+        assert False, "Expected a cassette miss"
+    except LLMProviderError as e:
+        assert e.status_code == 404
+    
+    # Recorders of one path share a timeline: per-request recorders keep the real gaps between calls
+    timeline_path = os.path.join(os.path.dirname(path), "timeline.jsonl")
+    fake = FakeLLMProvider(latency=0.0)
+    assert get_recording_provider(fake, timeline_path) is get_recording_provider(fake, timeline_path)
+    for i in range(3):
+        RecordingProvider(fake, timeline_path).complete(f"request {i}")
+        time.sleep(0.1)
+    offsets = [r.offset for r in recorded_requests(timeline_path)]
+    assert all(later - earlier >= 0.1 for earlier, later in zip(offsets, offsets[1:]))
+    
+    # Recorded requests carry their prompts and offsets, so the traffic can be re-issued
+    requests = recorded_requests(path)
+    assert len(requests) == len(replay) and all(r.prompt for r in requests)
+    assert [r.offset for r in requests] == sorted(r.offset for r in requests) and requests[-1].offset > 0
+    echo = FakeLLMProvider(latency=0.0, response_chars=50)
+    latencies = asyncio.run(replay_traffic(requests, echo.complete_async, speed=10.0))
+    assert len(latencies) == echo.calls == len(requests)
+    
+    redacted_path = os.path.join(os.path.dirname(path), "redacted.jsonl")
+    RecordingProvider(FakeLLMProvider(latency=0.0), redacted_path, redact_prompts=True).complete("secret prompt")
+    assert "secret prompt" not in open(redacted_path).read()
+    assert ReplayProvider(redacted_path, latency="zero").complete("secret prompt").text
+    assert recorded_requests(redacted_path)[0].prompt is None
+    
+    print(f"✓ {len(replay)} recorded calls replayed identically in {elapsed * 1000:.1f} ms")
+
+
+def test_profile_store_endpoints():
+    """Test stored profiles, cached matchers and analysis by profile ID"""
+    print("\n" + "="*70)
+    print("TEST 29: Profile Store Endpoints")
+    print("="*70)
+    
+    from dataclasses import asdict
+    from app import app
+    
+    profiles = get_all_profiles()
+    job = asdict(get_all_jobs()["backend"])
+    client = app.test_client()
+    
+    created = client.post('/api/profiles', json=asdict(profiles["backend"]))
+    assert created.status_code == 201
+    profile_id = created.get_json()['profile_id']
+    assert client.get(f'/api/profiles/{profile_id}').get_json()['profile']['name'] == profiles["backend"].name
+    
+    by_id = client.post('/api/analyze', json={'profile_id': profile_id, 'job': job}).get_json()
+    inline = client.post('/api/analyze', json={'profile': asdict(profiles["backend"]), 'job': job}).get_json()
+    assert by_id == inline
+    
+    updated = client.put(f'/api/profiles/{profile_id}', json=asdict(profiles["frontend"])).get_json()
+    assert updated['version'] == 2
+    after_update = client.post('/api/analyze', json={'profile_id': profile_id, 'job': job}).get_json()
+    assert after_update['match_score'] != by_id['match_score']
+    
+    assert client.get('/api/profiles/unknown').status_code == 404
+    assert client.post('/api/analyze', json={'profile_id': 'unknown', 'job': job}).status_code == 404
+    for bad_id in (['a'], {'id': 1}, 7):
+        response = client.post('/api/analyze', json={'profile_id': bad_id, 'job': job})
+        assert response.status_code == 400 and 'profile_id' in response.get_json()['error']
+    assert client.post('/api/profiles', json={'name': 'Incomplete'}).status_code == 400
+    
+    # Matchers are reused until the profile changes, and bounded by LRU
+    store = ProfileStore(max_matchers=2)
+    ids = [store.create(profile).id for profile in profiles.values()]
+    assert store.matcher(ids[0]) is store.matcher(ids[0])
+    for stored_id in ids:
+        store.matcher(stored_id)
+    assert len(store._matchers) == 2 and ids[0] not in store._matchers
+    first = store.matcher(ids[-1])
+    store.update(ids[-1], profiles["frontend"])
+    assert store.matcher(ids[-1]) is not first
+    
+    print(f"✓ Profile {profile_id[:8]} analyzed by ID; matcher LRU bounded at {store.max_matchers}")
+
+
+def test_batch_analysis_endpoint():
+    """Test ranked, paginated batch analysis with a fields selector"""
+    print("\n" + "="*70)
+    print("TEST 30: Batch Analysis Endpoint")
+    print("="*70)
+    
+    from dataclasses import asdict
+    from app import app
+    
+    client = app.test_client()
+    profile = get_all_profiles()["backend"]
+    jobs = list(get_all_jobs().values())
+    body = {'profile': asdict(profile), 'jobs': [asdict(job) for job in jobs]}
+    
+    full = client.post('/api/analyze/batch', json=body).get_json()
+    assert full['total'] == len(jobs) and len(full['results']) == len(jobs)
+    scores = [r['match_score']['percentage'] for r in full['results']]
+    assert scores == sorted(scores, reverse=True)
+    best = full['results'][0]
+    assert {k: v for k, v in best.items() if k != 'index'} == LinkedInAgent(profile).analyze_job_posting(jobs[best['index']])
+    
+    page = client.post('/api/analyze/batch', json=dict(
+        body, offset=1, limit=2, fields=['job_title', 'match_score']
+    )).get_json()
+    assert [r['index'] for r in page['results']] == [r['index'] for r in full['results'][1:3]]
+    assert set(page['results'][0]) == {'job_title', 'match_score', 'index'}
+    
+    profile_id = client.post('/api/profiles', json=asdict(profile)).get_json()['profile_id']
+    by_id = client.post('/api/analyze/batch', json={'profile_id': profile_id, 'jobs': body['jobs']}).get_json()
+    assert by_id == full
+    
+    assert client.post('/api/analyze/batch', json=dict(body, fields=['salary'])).status_code == 400
+    assert client.post('/api/analyze/batch', json=dict(body, limit=-1)).status_code == 400
+    for bad in ({'fields': 5}, {'fields': 'match_score'}, {'limit': True}, {'offset': False}):
+        assert client.post('/api/analyze/batch', json=dict(body, **bad)).status_code == 400
+    app.config['MAX_BATCH_JOBS'], max_jobs = 2, app.config['MAX_BATCH_JOBS']
+    try:
+        assert client.post('/api/analyze/batch', json=body).status_code == 413
+    finally:
+        app.config['MAX_BATCH_JOBS'] = max_jobs
+    
+    print(f"✓ {full['total']} jobs ranked in one request; best match {scores[0]}%")
+
+
+def test_analysis_etag_cache():
+    """Test cached analysis responses, ETags and 304s, and invalidation on profile change"""
+    print("\n" + "="*70)
+    print("TEST 31: Analysis Result Cache and ETags")
+    print("="*70)
+    
+    from dataclasses import asdict
+    from app import app, analysis_results
+    
+    client = app.test_client()
+    analysis_results.clear()
+    profile = asdict(get_all_profiles()["backend"])
+    body = {'profile': profile, 'job': asdict(get_all_jobs()["backend"])}
+    
+    first = client.post('/api/analyze', json=body)
+    etag = first.headers['ETag']
+    assert first.status_code == 200 and len(analysis_results) == 1
+    
+    hits = analysis_results.hits
+    repeat = client.post('/api/analyze', json=body, headers={'If-None-Match': etag})
+    assert repeat.status_code == 304 and repeat.data == b"" and repeat.headers['ETag'] == etag
+    assert analysis_results.hits == hits + 1
+    
+    # Fields the analysis does not read, and skill order, share the entry
+    reordered = dict(profile, name="Someone Else", skills=list(reversed(profile['skills'])))
+    same = client.post('/api/analyze', json=dict(body, profile=reordered))
+    assert same.headers['ETag'] == etag and same.data == first.data and len(analysis_results) == 1
+    
+    # A stored profile's update changes its key, so the old result is not served
+    profile_id = client.post('/api/profiles', json=profile).get_json()['profile_id']
+    by_id = {'profile_id': profile_id, 'job': body['job']}
+    assert client.post('/api/analyze', json=by_id, headers={'If-None-Match': etag}).status_code == 304
+    client.put(f'/api/profiles/{profile_id}', json=dict(profile, years_experience=0))
+    changed = client.post('/api/analyze', json=by_id, headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.headers['ETag'] != etag
+    assert changed.get_json()['match_score'] != first.get_json()['match_score']
+    
+    print(f"✓ Repeat request answered 304 from cache; {len(analysis_results)} results cached")
+
+
+def test_web_codec():
+    """Test the fast JSON provider, response compression and schema request decoding"""
+    print("\n" + "="*70)
+    print("TEST 32: Web Codec")
+    print("="*70)
+    
+    import gzip
+    from dataclasses import asdict
+    from app import app
+    from web_codec import JSON_BACKEND, FastJSONProvider, decode_profile
+    
+    client = app.test_client()
+    assert isinstance(app.json, FastJSONProvider)
+    profile = asdict(get_all_profiles()["backend"])
+    jobs = [asdict(job) for job in get_all_jobs().values()]
+    body = {'profile': profile, 'jobs': jobs}
+    
+    plain = client.post('/api/analyze/batch', json=body)
+    compressed = client.post('/api/analyze/batch', json=body, headers={'Accept-Encoding': 'gzip, deflate'})
+    assert 'Content-Encoding' not in plain.headers
+    assert compressed.headers['Content-Encoding'] == 'gzip' and 'Accept-Encoding' in compressed.headers['Vary']
+    assert gzip.decompress(compressed.data) == plain.data
+    assert len(compressed.data) < len(plain.data) / 2
+    
+    # Small bodies are not worth compressing; weak ETags still revalidate
+    assert 'Content-Encoding' not in client.get('/api/profiles/unknown', headers={'Accept-Encoding': 'gzip'}).headers
+    single = {'profile': profile, 'job': jobs[0]}
+    first = client.post('/api/analyze', json=single, headers={'Accept-Encoding': 'gzip'})
+    assert first.headers['ETag'].startswith('W/')
+    repeat = client.post('/api/analyze', json=single, headers={'Accept-Encoding': 'gzip', 'If-None-Match': first.headers['ETag']})
+    assert repeat.status_code == 304
+    
+    # Schema decoding: optional fields default, bad types and missing fields are 400s naming the field
+    minimal = {k: v for k, v in profile.items() if k not in ('previous_roles', 'certifications')}
+    assert decode_profile(minimal).certifications == []
+    bad_type = client.post('/api/analyze', json={'profile': dict(profile, years_experience="five"), 'job': jobs[0]})
+    assert bad_type.status_code == 400 and 'profile.years_experience' in bad_type.get_json()['error']
+    missing = dict(jobs[1])
+    del missing['title']
+    bad_job = client.post('/api/analyze/batch', json={'profile': profile, 'jobs': [jobs[0], missing]})
+    assert bad_job.status_code == 400 and bad_job.get_json()['error'] == 'jobs[1].title is required'
+    bad_skill = client.post('/api/analyze', json={'profile': dict(profile, skills=["Python", 3]), 'job': jobs[0]})
+    assert bad_skill.get_json()['error'] == 'profile.skills[1] must be of type str'
+    assert client.post('/api/analyze', json=[1, 2]).status_code == 400
+    
+    # Malformed JSON is a 400 under every installed backend, not the backend's own exception
+    backends = _web_codec_backends()
+    for backend, codec in backends.items():
+        assert codec.JSON_BACKEND == backend
+        for malformed in (b'{"profile": ', b'not json', b'\xff\xfe'):
+            try:
+                codec.decode_body(malformed)
+                assert False, f"{backend} accepted {malformed!r}"
+            except codec.RequestDecodeError:
+                pass
+    assert client.post('/api/analyze', data=b'{"profile": ', content_type='application/json').status_code == 400
+    
+    print(f"✓ {JSON_BACKEND} encoder (decode errors checked for {', '.join(backends)}); "
+          f"batch response {len(plain.data)} -> {len(compressed.data)} bytes gzipped")
+
+
+def _web_codec_backends():
+    """A fresh copy of web_codec for each installed JSON backend, the faster ones hidden as needed"""
+    import importlib.util
+    import sys
+    import web_codec
+    
+    hidden_by_backend = {'orjson': [], 'msgspec': ['orjson'], 'json': ['orjson', 'msgspec']}
+    codecs = {}
+    for backend, hidden in hidden_by_backend.items():
+        if backend != 'json' and importlib.util.find_spec(backend) is None:
+            continue
+        saved = {name: sys.modules.get(name) for name in hidden}
+        sys.modules.update({name: None for name in hidden})  # makes "import name" raise ImportError
+        try:
+            spec = importlib.util.spec_from_file_location(f"web_codec_{backend}", web_codec.__file__)
+            codec = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(codec)
+            codecs[backend] = codec
+        finally:
+            for name, module in saved.items():
+                if module is None:
+                    sys.modules.pop(name, None)
+                else:
+                    sys.modules[name] = module
+    return codecs
+
+
+def _asgi_request(method, path, body=None, headers=None):
+    """Coroutine sending one request to asgi_app.app; returns (status, headers, body chunks)"""
+    from asgi_app import app as asgi
+    
+    raw = json.dumps(body).encode() if body is not None else b""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "method": method, "path": path, "query_string": query.encode(),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    }
+    messages = [{"type": "http.request", "body": raw, "more_body": False}]
+    sent = []
+    
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+    
+    async def send(message):
+        sent.append(message)
+    
+    async def call():
+        await asgi(scope, receive, send)
+        start = sent[0]
+        return (start["status"], {k.decode(): v.decode() for k, v in start["headers"]},
+                [m["body"] for m in sent[1:] if m.get("body")])
+    
+    return call()
+
+
+def test_asgi_app():
+    """Test the ASGI variant matches the Flask routes and serves LLM requests concurrently"""
+    print("\n" + "="*70)
+    print("TEST 33: ASGI Web Service")
+    print("="*70)
+    
+    import asyncio
+    import gzip
+    import time
+    from dataclasses import asdict
+    from app import app as flask_app
+    
+    client = flask_app.test_client()
+    profile = asdict(get_all_profiles()["backend"])
+    jobs = [asdict(job) for job in get_all_jobs().values()]
+    
+    def call(method, path, body=None, headers=None):
+        status, response_headers, chunks = asyncio.run(_asgi_request(method, path, body, headers))
+        return status, response_headers, b"".join(chunks)
+    
+    # Same contracts and shared state as the Flask app
+    status, _, body = call("POST", "/api/profiles", profile)
+    assert status == 201
+    profile_id = json.loads(body)["profile_id"]
+    assert client.get(f"/api/profiles/{profile_id}").get_json()["profile"] == profile
+    
+    single = {"profile_id": profile_id, "job": jobs[0]}
+    status, headers, body = call("POST", "/api/analyze", single)
+    flask_response = client.post("/api/analyze", json=single)
+    assert status == 200 and body == flask_response.data and headers["etag"] == flask_response.headers["ETag"]
+    assert call("POST", "/api/analyze", single, {"If-None-Match": headers["etag"]})[0] == 304
+    
+    batch = {"profile_id": profile_id, "jobs": jobs, "limit": 3}
+    status, _, body = call("POST", "/api/analyze/batch", batch)
+    assert status == 200 and json.loads(body) == client.post("/api/analyze/batch", json=batch).get_json()
+    status, headers, body = call("POST", "/api/analyze/batch", dict(batch, limit=None), {"Accept-Encoding": "gzip"})
+    assert headers["content-encoding"] == "gzip" and headers["vary"] == "Accept-Encoding"
+    assert json.loads(gzip.decompress(body)) == client.post("/api/analyze/batch", json=dict(batch, limit=None)).get_json()
+    assert int(headers["content-length"]) == len(body)
+    
+    # Compressed analyses carry a weak ETag that still revalidates to 304 with no body
+    status, headers, body = call("POST", "/api/analyze", single, {"Accept-Encoding": "gzip"})
+    assert headers["content-encoding"] == "gzip" and headers["etag"].startswith("W/")
+    assert gzip.decompress(body) == flask_response.data
+    status, headers, body = call("POST", "/api/analyze", single,
+                                 {"Accept-Encoding": "gzip", "If-None-Match": headers["etag"]})
+    assert status == 304 and body == b"" and "content-encoding" not in headers
+    
+    # HEAD answers like GET without a body
+    get_status, get_headers, get_body = call("GET", f"/api/profiles/{profile_id}")
+    status, headers, body = call("HEAD", f"/api/profiles/{profile_id}")
+    assert status == get_status == 200 and body == b"" and headers == get_headers
+    assert int(headers["content-length"]) == len(get_body)
+    
+    assert call("GET", "/api/profiles/unknown")[0] == 404
+    for method, path in (("DELETE", "/api/metrics"), ("GET", "/api/analyze"), ("POST", "/api/metrics")):
+        status, _, body = call(method, path)
+        assert status == client.open(path, method=method).status_code == 405
+        assert json.loads(body) == {"error": "Method not allowed"}
+    assert call("GET", "/api/nowhere")[0] == 404
+    status, _, body = call("POST", "/api/analyze", {"profile": dict(profile, skills="Python"), "job": jobs[0]})
+    assert status == 400 and json.loads(body)["error"] == "profile.skills must be a list"
+    for interview in ({}, {"skills": "Python"}):
+        status, _, body = call("POST", "/api/interview", interview)
+        flask_response = client.post("/api/interview", json=interview)
+        assert status == flask_response.status_code == 400 and json.loads(body) == flask_response.get_json()
+    for path, bad in (("/api/analyze", {"llm": "background", "latency_budget": "5"}),
+                      ("/api/analyze/stream", {"latency_budget": -1}), ("/api/analyze/stream", {"latency_budget": True}),
+                      ("/api/analyze/stream", {"include_llm": "no"})):
+        status, _, body = call("POST", path, dict(single, **bad))
+        flask_response = client.post(path, json=dict(single, **bad))
+        assert status == flask_response.status_code == 400 and json.loads(body) == flask_response.get_json()
+    status, _, body = call("POST", "/api/interview", {"skills": ["Python"]})
+    assert status == 200 and json.loads(body) == client.post("/api/interview", json={"skills": ["Python"]}).get_json()
+    
+    # Long-polls are woken by the finishing thread, not by polling
+    from llm_enrichment import BackgroundEnricher
+    enricher = BackgroundEnricher(max_workers=1)
+    slow = enricher.submit(lambda: time.sleep(0.1) or {"llm_enhanced": {}})
+    
+    async def long_poll():
+        started = time.perf_counter()
+        finished = await slow.wait_async(5.0)
+        return finished, time.perf_counter() - started, await enricher.submit(lambda: time.sleep(0.3) or {}).wait_async(0.05)
+    
+    finished, waited, timed_out = asyncio.run(long_poll())
+    assert finished and waited < 0.5 and timed_out is False
+    enricher.shutdown()
+    
+    # LLM requests wait on the event loop, not on workers: 8 streams at 0.2 s each overlap
+    flask_app.config["LLM_ANALYZER"] = LLMEnhancedAnalyzer(
+        FakeLLMProvider(latency=0.2), cache=LLMResponseCache(), in_flight=SingleFlight()
+    )
+    try:
+        async def streams():
+            return await asyncio.gather(*[
+                _asgi_request("POST", "/api/analyze/stream", {"profile": profile, "job": dict(jobs[0], company=f"Company {i}")})
+                for i in range(8)
+            ])
+        
+        start = time.perf_counter()
+        results = asyncio.run(streams())
+        elapsed = time.perf_counter() - start
+        
+        status, _, body = call("POST", "/api/analyze", dict(single, llm="background"))
+        enrichment_id = json.loads(body)["llm_enrichment"]["id"]
+        status, _, body = call("GET", f"/api/enrichment/{enrichment_id}?wait=5")
+        enrichment = json.loads(body)
+    finally:
+        del flask_app.config["LLM_ANALYZER"]
+    
+    for status, headers, chunks in results:
+        text = b"".join(chunks).decode()
+        assert status == 200 and headers["content-type"] == "text/event-stream"
+        assert text.startswith("event: analysis\n") and "event: section" in text and text.rstrip().endswith("data: {}")
+    assert elapsed < 1.0, f"8 concurrent streams took {elapsed:.2f} s"
+    assert enrichment["status"] == "done" and enrichment["llm_enhanced"]["fit_narrative"].startswith("Fake response")
+    
+    print(f"✓ ASGI routes match Flask; 8 concurrent LLM streams finished in {elapsed * 1000:.0f} ms")
+
+
 def run_all_tests():
     """Run all tests"""
     print("\n" + "🧪 " + "="*66 + " 🧪")
@@ -240,6 +1500,31 @@ def run_all_tests():
         test_job_parsing()
         test_rating_system()
         test_application_tracker()
+        test_shared_match_result()
+        test_batch_matching()
+        test_score_matrix()
+        test_skill_index()
+        test_skill_extraction_word_boundaries()
+        test_skill_taxonomy()
+        test_job_feed_resume()
+        test_parallel_top_k()
+        test_llm_response_cache()
+        test_concurrent_llm_enhancement()
+        test_structured_llm_enhancement()
+        test_fake_llm_server()
+        test_llm_resilience()
+        test_shared_llm_provider()
+        test_single_flight_coalescing()
+        test_streaming_analysis_endpoint()
+        test_background_enrichment()
+        test_latency_budget_shedding()
+        test_llm_metrics()
+        test_llm_cassette_replay()
+        test_profile_store_endpoints()
+        test_batch_analysis_endpoint()
+        test_analysis_etag_cache()
+        test_web_codec()
+        test_asgi_app()
         
         print("\n" + "="*70)
         print("✅ ALL TESTS PASSED!")
@@ -0,0 +1,309 @@
+"""
+Web Codec - fast JSON, response compression and schema-based request decoding
+Uses orjson or msgspec when installed and falls back to the standard library
+"""
+
+import dataclasses
+import functools
+import gzip
+import json
+import typing
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar
+
+from flask import Flask, Response, request
+from flask.json.provider import JSONProvider
+
+from linkedin_agent import JobPosting, UserProfile
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+T = TypeVar("T")
+
+# Responses of these types are compressed; event streams must reach clients unbuffered
+COMPRESSIBLE_MIMETYPES = {"application/json", "text/html", "text/plain", "text/css", "application/javascript"}
+
+
+def _default(obj: Any) -> Any:
+    """Serialize the types stdlib json and orjson leave to the caller"""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if ORJSON_AVAILABLE:
+    JSON_BACKEND = "orjson"
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_default)
+
+    loads = orjson.loads
+    _DECODE_ERRORS: Tuple[type, ...] = (orjson.JSONDecodeError,)
+elif MSGSPEC_AVAILABLE:
+    JSON_BACKEND = "msgspec"
+    _encoder = msgspec.json.Encoder(enc_hook=_default)
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return _encoder.encode(obj)
+
+    loads = msgspec.json.decode
+    # msgspec.DecodeError is not a ValueError
+    _DECODE_ERRORS = (msgspec.DecodeError, ValueError)
+else:
+    JSON_BACKEND = "json"
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    loads = json.loads
+    _DECODE_ERRORS = (ValueError,)
+
+
+class FastJSONProvider(JSONProvider):
+    """Flask JSON provider backed by the fastest available encoder"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Skip the bytes -> str -> bytes round trip of the base class
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype="application/json")
+
+
+class APIError(Exception):
+    """Client error, reported as {"error": message, **extra} with an HTTP status"""
+
+    def __init__(self, status: int, message: str, **extra: Any):
+        super().__init__(message)
+        self.status = status
+        self.extra = extra
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"error": str(self), **self.extra}
+
+
+class RequestDecodeError(APIError, ValueError):
+    """Request body does not match the expected schema (reported as HTTP 400)"""
+
+    def __init__(self, message: str):
+        super().__init__(400, message)
+
+
+def _list_of(check: Callable[[Any, str], Any]) -> Callable[[Any, str], Any]:
+    def check_list(value: Any, path: str) -> Any:
+        if not isinstance(value, list):
+            raise RequestDecodeError(f"{path} must be a list")
+        for i, item in enumerate(value):
+            try:
+                check(item, path)
+            except RequestDecodeError:
+                # Item paths are only formatted for the error message
+                check(item, f"{path}[{i}]")
+                raise
+        return value
+    return check_list
+
+
+def _check_int(value: Any, path: str) -> int:
+    # JSON has one number type; accept 5.0 but not 5.5 or true
+    if type(value) is int:
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    raise RequestDecodeError(f"{path} must be an integer")
+
+
+def _instance_of(expected: type) -> Callable[[Any, str], Any]:
+    def check(value: Any, path: str) -> Any:
+        if not isinstance(value, expected):
+            raise RequestDecodeError(f"{path} must be of type {expected.__name__}")
+        return value
+    return check
+
+
+def _checker(expected: Any) -> Callable[[Any, str], Any]:
+    """Validator for a simple type annotation (int, str, List[str], ...)"""
+    if typing.get_origin(expected) is list:
+        (item_type,) = typing.get_args(expected)
+        return _list_of(_checker(item_type))
+    if expected is int:
+        return _check_int
+    return _instance_of(expected)
+
+
+@functools.lru_cache(maxsize=None)
+def _schema(cls: type) -> Tuple[Tuple[str, Callable[[Any, str], Any]], ...]:
+    """(field name, validator) pairs for a dataclass, built once per class"""
+    hints = typing.get_type_hints(cls)
+    return tuple((field.name, _checker(hints[field.name])) for field in dataclasses.fields(cls))
+
+
+def decode(cls: Type[T], data: Any, path: str = "body", defaults: Optional[Dict[str, Any]] = None) -> T:
+    """
+    Build a dataclass from a decoded JSON object, checking field types
+
+    Args:
+        cls: Dataclass to build (e.g. UserProfile)
+        data: Decoded JSON object
+        path: Location in the request, for error messages
+        defaults: Values for fields the object may omit
+
+    Raises:
+        RequestDecodeError: On a missing field or a value of the wrong type
+    """
+    if not isinstance(data, dict):
+        raise RequestDecodeError(f"{path} must be an object")
+    values = {}
+    for name, check in _schema(cls):
+        if name in data:
+            values[name] = check(data[name], f"{path}.{name}")
+        elif defaults and name in defaults:
+            values[name] = defaults[name]
+        else:
+            raise RequestDecodeError(f"{path}.{name} is required")
+    return cls(**values)
+
+
+def decode_body(body: bytes) -> Dict[str, Any]:
+    """Decode a raw request body that must hold a JSON object"""
+    try:
+        data = loads(body) if body else None
+    except _DECODE_ERRORS:
+        data = None
+    if not isinstance(data, dict):
+        raise RequestDecodeError("Request body must be a JSON object")
+    return data
+
+
+def json_body() -> Dict[str, Any]:
+    """The current Flask request's JSON object body"""
+    return decode_body(request.get_data(cache=True))
+
+
+def decode_profile(data: Any, path: str = "profile") -> UserProfile:
+    return decode(UserProfile, data, path, defaults={"previous_roles": [], "certifications": []})
+
+
+def decode_job(data: Any, path: str = "job") -> JobPosting:
+    return decode(JobPosting, data, path, defaults={"preferred_skills": []})
+
+
+def decode_jobs(data: Any, path: str = "jobs") -> List[JobPosting]:
+    if not isinstance(data, list):
+        raise RequestDecodeError(f"{path} must be a list")
+    return [decode_job(job, f"{path}[{i}]") for i, job in enumerate(data)]
+
+
+@dataclasses.dataclass
+class InterviewRequest:
+    """Body of /api/interview"""
+    skills: List[str]
+
+
+def decode_interview(data: Any, path: str = "body") -> InterviewRequest:
+    return decode(InterviewRequest, data, path)
+
+
+@dataclasses.dataclass
+class LLMOptions:
+    """LLM settings an analysis request may carry"""
+    include_llm: bool = True
+    latency_budget: Optional[float] = None
+
+
+def decode_llm_options(data: Dict[str, Any], path: str = "body") -> LLMOptions:
+    """Check a request's optional "include_llm" flag and "latency_budget" seconds"""
+    options = LLMOptions()
+    if "include_llm" in data:
+        if not isinstance(data["include_llm"], bool):
+            raise RequestDecodeError(f"{path}.include_llm must be a boolean")
+        options.include_llm = data["include_llm"]
+    budget = data.get("latency_budget")
+    if budget is not None:
+        if type(budget) not in (int, float) or not budget >= 0:
+            raise RequestDecodeError(f"{path}.latency_budget must be a non-negative number")
+        options.latency_budget = float(budget)
+    return options
+
+
+def negotiate_encoding(accept_encoding) -> Optional[str]:
+    """Preferred encoding a parsed Accept-Encoding allows: br if available, then gzip"""
+    for encoding in (("br", "gzip") if BROTLI_AVAILABLE else ("gzip",)):
+        if accept_encoding[encoding]:
+            return encoding
+    return None
+
+
+def compress_body(body: bytes, encoding: str, level: int = 6) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=min(level, 11))
+    return gzip.compress(body, compresslevel=min(level, 9), mtime=0)
+
+
+def compress_response(response: Response, min_size: int = 1024, level: int = 6) -> Response:
+    """
+    Compress a buffered response body if the client accepts it
+
+    Bodies under min_size bytes, streamed responses (e.g. Server-Sent
+    Events) and non-text types are sent as they are. A compressed body's
+    ETag becomes weak, as it no longer names the identity bytes.
+    """
+    response.vary.add("Accept-Encoding")
+    if (response.status_code != 200 or response.is_streamed or response.direct_passthrough
+            or "Content-Encoding" in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    encoding = negotiate_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+
+    response.set_data(compress_body(body, encoding, level))
+    response.headers["Content-Encoding"] = encoding
+
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def install(app: Flask, min_size: int = 1024, level: int = 6):
+    """Serve app's JSON with FastJSONProvider and compress its larger responses"""
+    app.json = FastJSONProvider(app)
+    app.config.setdefault("COMPRESS_MIN_SIZE", min_size)
+    app.config.setdefault("COMPRESS_LEVEL", level)
+
+    @app.after_request
+    def _compress(response: Response) -> Response:
+        return compress_response(response, app.config["COMPRESS_MIN_SIZE"], app.config["COMPRESS_LEVEL"])
+
+    @app.errorhandler(APIError)
+    def _api_error(error: APIError):
+        return error.to_dict(), error.status